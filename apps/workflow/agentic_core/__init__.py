@@ -1,6 +1,6 @@
 """Core abstractions & utilities shared by all agentic workflows."""
 
-__all__ = ["orchestrator"]
+__all__ = ["browser_pool", "hedging", "llm_cache", "metrics", "orchestrator", "rate_limit"]
 
 # Note: This library is part of the monorepo source; we don't need runtime
 # version discovery. Maintain versions via git / tags instead. 
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Long-lived Playwright browser shared by all tool calls in a process.
+
+Launching Chromium per tool call costs hundreds of milliseconds and a lot of
+memory. ``get_browser_pool()`` returns a process-wide pool that starts one
+browser lazily and leases isolated ``BrowserContext`` objects, capped at
+``BROWSER_MAX_CONTEXTS`` concurrent contexts:
+
+    async with get_browser_pool().lease() as context:
+        page = await context.new_page()
+        ...
+
+Call ``close_browser_pool()`` on shutdown.
+
+With ``BROWSER_CDP_URL`` set (see ``agentic_core.browser_server``) the pool
+connects to a host-level Chromium instead of launching its own; contexts are
+still capped per process, and a lost connection is re-established (with
+backoff) on the next lease.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from agentic_core.metrics import registry
+
+if TYPE_CHECKING:  # playwright is imported when the first browser starts
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", "8"))
+CONNECT_ATTEMPTS = 5
+
+
+class BrowserPool:
+    """One Chromium instance handing out a bounded number of contexts."""
+
+    def __init__(
+        self,
+        max_contexts: int = DEFAULT_MAX_CONTEXTS,
+        headless: bool = True,
+        endpoint: Optional[str] = None,
+    ):
+        self.max_contexts = max_contexts
+        self.headless = headless
+        # CDP endpoint of a shared browser server; None launches a local browser
+        self.endpoint = endpoint if endpoint is not None else os.getenv("BROWSER_CDP_URL") or None
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._start_lock = asyncio.Lock()
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._in_use = registry.gauge("browser_contexts_in_use")
+
+    async def _ensure_browser(self) -> Browser:
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        async with self._start_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+
+                    self._playwright = await async_playwright().start()
+                if self.endpoint:
+                    self._browser = await self._connect()
+                else:
+                    self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                    registry.counter("browser_launches_total").inc()
+                    logger.info("browser_launched", extra={"max_contexts": self.max_contexts})
+        return self._browser
+
+    async def _connect(self) -> Browser:
+        """Attach to the shared browser server, retrying while it (re)starts."""
+        assert self._playwright is not None and self.endpoint
+        delay = 0.5
+        attempt = 1
+        while True:
+            try:
+                browser = await self._playwright.chromium.connect_over_cdp(self.endpoint)
+                break
+            except Exception as exc:  # noqa: BLE001 – server may be restarting
+                if attempt >= CONNECT_ATTEMPTS:
+                    raise
+                logger.warning("browser_connect_failed", extra={"endpoint": self.endpoint, "error": str(exc)})
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 8.0)
+                attempt += 1
+        registry.counter("browser_connects_total").inc()
+        logger.info("browser_connected", extra={"endpoint": self.endpoint, "max_contexts": self.max_contexts})
+        return browser
+
+    async def acquire_context(self) -> BrowserContext:
+        """Lease a fresh context; pair with ``release_context``."""
+        await self._slots.acquire()
+        try:
+            browser = await self._ensure_browser()
+            context = await browser.new_context()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._in_use.inc()
+        return context
+
+    async def release_context(self, context: BrowserContext) -> None:
+        try:
+            await context.close()
+        except Exception:  # noqa: BLE001 – browser may already be gone
+            logger.debug("context_close_failed", exc_info=True)
+        finally:
+            self._in_use.dec()
+            self._slots.release()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserContext]:
+        context = await self.acquire_context()
+        try:
+            yield context
+        finally:
+            await self.release_context(context)
+
+    async def close(self) -> None:
+        # For a shared server this only closes our contexts and disconnects
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_pool: Optional[BrowserPool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool bound to the running event loop."""
+    global _pool, _pool_loop
+
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        # A pool created under another (finished) loop cannot be reused
+        _pool, _pool_loop = BrowserPool(), loop
+    return _pool
+
+
+async def close_browser_pool() -> None:
+    global _pool, _pool_loop
+
+    if _pool is not None:
+        await _pool.close()
+    _pool, _pool_loop = None, None
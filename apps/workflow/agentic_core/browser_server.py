@@ -0,0 +1,86 @@
+"""Host-level Chromium shared by every worker process on the machine.
+
+Run it standalone or let the supervisor manage it (``--browser-server-port``):
+
+    uv run python -m agentic_core.browser_server --port 9222
+
+Workers set ``BROWSER_CDP_URL=http://127.0.0.1:9222``; their ``BrowserPool``
+then connects over the Chrome DevTools Protocol instead of launching a
+browser, and leases its own contexts (still capped per process by
+``BROWSER_MAX_CONTEXTS``). Browser memory on the host therefore grows with
+the number of open pages, not with the number of worker processes.
+
+If Chromium crashes the server relaunches it on the same port; connected
+pools notice the disconnect and reconnect on their next lease.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from agentic_core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9222
+RESTART_DELAY = 1.0
+
+
+def cdp_url(port: int, host: str = "127.0.0.1") -> str:
+    return f"http://{host}:{port}"
+
+
+async def serve(
+    port: int = DEFAULT_PORT,
+    host: str = "127.0.0.1",
+    headless: bool = True,
+    stop_signals: tuple[signal.Signals, ...] = (signal.SIGTERM, signal.SIGINT),
+) -> None:
+    """Keep one Chromium with a CDP endpoint on ``host:port`` until a stop signal."""
+    from playwright.async_api import async_playwright
+
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in stop_signals:
+        loop.add_signal_handler(sig, stopping.set)
+
+    args = [f"--remote-debugging-port={port}"]
+    if host != "127.0.0.1":
+        args.append(f"--remote-debugging-address={host}")
+
+    async with async_playwright() as playwright:
+        while not stopping.is_set():
+            browser = await playwright.chromium.launch(headless=headless, args=args)
+            disconnected = asyncio.Event()
+            browser.on("disconnected", lambda _: disconnected.set())
+            registry.counter("browser_server_launches_total").inc()
+            print(f"[BROWSER] serving Chromium on {cdp_url(port, host)}")
+
+            stop_wait = asyncio.ensure_future(stopping.wait())
+            crash_wait = asyncio.ensure_future(disconnected.wait())
+            await asyncio.wait({stop_wait, crash_wait}, return_when=asyncio.FIRST_COMPLETED)
+            stop_wait.cancel()
+            crash_wait.cancel()
+
+            if stopping.is_set():
+                await browser.close()
+                break
+            logger.warning("browser_server_crashed", extra={"port": port})
+            await asyncio.sleep(RESTART_DELAY)
+    print("[BROWSER] browser server stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared Chromium for worker processes")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args()
+    asyncio.run(serve(args.port, args.host, headless=not args.headed))
+
+
+if __name__ == "__main__":
+    main()
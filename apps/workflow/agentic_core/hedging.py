@@ -0,0 +1,91 @@
+"""Hedged requests for tail-latency control.
+
+``hedged()`` starts a primary attempt and, if it has not finished after
+``delay`` seconds, races a backup attempt. The first successful result wins
+and the loser is cancelled. ``hedge_delay()`` derives that delay from the
+p95 of a latency histogram in ``agentic_core.metrics`` so only the slowest
+~5% of calls pay for a second attempt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from agentic_core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "1") == "1"
+HEDGE_MIN_SAMPLES = 20
+
+
+def hedge_delay(metric: str, default: float, *, min_delay: float = 0.5, **labels: Any) -> float:
+    """p95 of ``<metric>_seconds`` for ``labels`` (or ``default`` until warmed up)."""
+    hist = registry.histogram(f"{metric}_seconds", **labels)
+    if hist.count < HEDGE_MIN_SAMPLES:
+        return default
+    p95 = hist.percentile(0.95)
+    return max(min_delay, p95) if p95 is not None else default
+
+
+async def hedged(
+    primary: Callable[[], Awaitable[T]],
+    backup: Callable[[], Awaitable[T]],
+    *,
+    delay: float,
+    discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    name: str = "hedge",
+) -> T:
+    """Return the first successful result of ``primary`` / delayed ``backup``.
+
+    ``discard`` is awaited with any loser that still produced a result (e.g. a
+    page that finished loading just as it was cancelled) so resources are not
+    leaked. If both attempts fail, the primary's exception is raised.
+    """
+    first = asyncio.ensure_future(primary())
+    if not HEDGING_ENABLED:
+        return await first
+
+    attempts = [first]
+    winner: Optional["asyncio.Future[T]"] = None
+    try:
+        await asyncio.wait({first}, timeout=delay)
+        if first.done() and first.exception() is None:
+            winner = first
+            return first.result()
+
+        registry.counter("hedge_started_total", hedge=name).inc()
+        attempts.append(asyncio.ensure_future(backup()))
+        while True:
+            winner = _first_success(attempts)
+            if winner is not None:
+                break
+            pending = [t for t in attempts if not t.done()]
+            if not pending:
+                raise first.exception()  # type: ignore[misc]
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if winner is not first:
+            registry.counter("hedge_won_total", hedge=name).inc()
+        return winner.result()
+    finally:
+        losers = [t for t in attempts if t is not winner]
+        for task in losers:
+            task.cancel()
+        for result in await asyncio.gather(*losers, return_exceptions=True):
+            if discard is not None and not isinstance(result, BaseException):
+                try:
+                    await discard(result)
+                except Exception:  # noqa: BLE001 – best-effort cleanup
+                    logger.exception("hedge_discard_failed", extra={"hedge": name})
+
+
+def _first_success(attempts: list["asyncio.Future[T]"]) -> Optional["asyncio.Future[T]"]:
+    for task in attempts:
+        if task.done() and not task.cancelled() and task.exception() is None:
+            return task
+    return None
@@ -0,0 +1,202 @@
+"""Record/replay cache for ``Runner.run`` final outputs.
+
+Responses are stored in a local content-addressed directory keyed by a hash
+of (agent name, instructions hash, model, model settings, output type, tool
+names, prompt). Modes:
+
+* ``record`` – always call the model and (over)write the recording;
+* ``replay`` – serve recordings only; a miss raises ``LLMCacheMiss`` unless
+  ``strict=False``, in which case the wrapped ``Runner.run`` is called (this is
+  how ``--offline`` falls back to the deterministic mock);
+* ``cache``  – serve recordings younger than ``ttl`` seconds, otherwise call
+  the model and record the answer;
+* ``off``    – do nothing.
+
+Install once at start-up, *after* any other ``Runner.run`` wrappers (e.g. the
+rate limiter) so cache hits skip them:
+
+    install_llm_cache("cache", cache_dir=Path(".llm_cache"), ttl=86400)
+
+Env-vars: ``LLM_CACHE_MODE``, ``LLM_CACHE_DIR``, ``LLM_CACHE_TTL``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from agents import Runner
+
+from agentic_core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "record", "replay", "cache")
+DEFAULT_CACHE_DIR = Path(".llm_cache")
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in strict replay mode when no recording exists for a call."""
+
+
+class CachedRunResult:  # Minimal shim of agents.run.RunResult
+    def __init__(self, final_output: Any):
+        self.final_output = final_output
+        self.cached = True
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _settings_material(settings: Any) -> Any:
+    if settings is None:
+        return None
+    if dataclasses.is_dataclass(settings) and not isinstance(settings, type):
+        # Unset fields are left out so SDK upgrades adding settings keep the keys
+        return {k: v for k, v in dataclasses.asdict(settings).items() if v is not None}
+    return str(settings)
+
+
+def _output_type_material(output_type: Any) -> Any:
+    if output_type is None:
+        return None
+    schema = getattr(output_type, "model_json_schema", None)
+    name = f"{getattr(output_type, '__module__', '')}.{getattr(output_type, '__qualname__', repr(output_type))}"
+    # The schema, so a changed model does not replay outputs of the old shape
+    return {"name": name, "schema": schema() if callable(schema) else None}
+
+
+def cache_key(agent: Any, prompt: Any) -> str:
+    """Content address for a ``Runner.run(agent, prompt)`` call."""
+    instructions = getattr(agent, "instructions", None)
+    if callable(instructions):
+        # Dynamic instructions – best we can do is identify the callable
+        instructions = f"callable:{getattr(instructions, '__qualname__', repr(instructions))}"
+    material = {
+        "agent": getattr(agent, "name", None),
+        "instructions": _hash(str(instructions or "")),
+        "model": str(getattr(agent, "model", None)),
+        "model_settings": _settings_material(getattr(agent, "model_settings", None)),
+        "output_type": _output_type_material(getattr(agent, "output_type", None)),
+        "tools": sorted(str(getattr(t, "name", t)) for t in getattr(agent, "tools", []) or []),
+        "prompt": prompt,
+    }
+    return _hash(json.dumps(material, sort_keys=True, default=str))
+
+
+class LLMCache:
+    """Content-addressed store of final outputs on the local filesystem."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, ttl: Optional[float] = None):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str, agent: Any = None) -> Optional[CachedRunResult]:
+        path = self._path(key)
+        try:
+            entry: Dict[str, Any] = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            return None
+        return CachedRunResult(_decode(entry, agent))
+
+    def put(self, key: str, agent: Any, final_output: Any) -> None:
+        encoded = _encode(final_output)
+        if encoded is None:
+            logger.debug("llm_cache_unserialisable", extra={"agent": getattr(agent, "name", None)})
+            return
+        entry = {"created_at": time.time(), "agent": getattr(agent, "name", None), **encoded}
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False))
+        os.replace(tmp, path)
+
+
+def _encode(final_output: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(final_output, str):
+        return {"kind": "text", "value": final_output}
+    if hasattr(final_output, "model_dump"):
+        return {"kind": "model", "value": final_output.model_dump(mode="json")}
+    try:
+        json.dumps(final_output)
+    except (TypeError, ValueError):
+        return None
+    return {"kind": "json", "value": final_output}
+
+
+def _decode(entry: Dict[str, Any], agent: Any) -> Any:
+    value = entry["value"]
+    if entry["kind"] == "model":
+        output_type = getattr(agent, "output_type", None)
+        if hasattr(output_type, "model_validate"):
+            return output_type.model_validate(value)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Runner.run integration
+# ---------------------------------------------------------------------------
+
+
+def install_llm_cache(
+    mode: str,
+    *,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    ttl: Optional[float] = None,
+    strict: bool = True,
+) -> Optional[LLMCache]:
+    """Wrap ``Runner.run`` with the record/replay cache."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown LLM cache mode: {mode}")
+    if mode == "off":
+        return None
+    if getattr(Runner.run, "_llm_cache", False):
+        # e.g. apply_offline_patches() already installed strict=False replay
+        logger.warning("llm_cache_already_installed", extra={"mode": mode})
+        return None
+
+    cache = LLMCache(cache_dir, ttl=ttl if mode == "cache" else None)
+    original_run = Runner.run
+
+    async def cached_run(agent: Any, prompt: Any, *args: Any, **kwargs: Any) -> Any:
+        key = cache_key(agent, prompt)
+        if mode in ("replay", "cache"):
+            hit = cache.get(key, agent)
+            if hit is not None:
+                registry.counter("llm_cache_hits_total", mode=mode).inc()
+                return hit
+            registry.counter("llm_cache_misses_total", mode=mode).inc()
+            if mode == "replay" and strict:
+                raise LLMCacheMiss(f"No recording for agent={getattr(agent, 'name', None)!r} key={key}")
+
+        result = await original_run(agent, prompt, *args, **kwargs)
+        if mode in ("record", "cache"):
+            cache.put(key, agent, result.final_output)
+        return result
+
+    cached_run._llm_cache = True  # type: ignore[attr-defined]
+    Runner.run = staticmethod(cached_run)  # type: ignore[assignment]
+    return cache
+
+
+def install_llm_cache_from_env(**overrides: Any) -> Optional[LLMCache]:
+    ttl = os.getenv("LLM_CACHE_TTL")
+    options: Dict[str, Any] = {
+        "cache_dir": Path(os.getenv("LLM_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+        "ttl": float(ttl) if ttl else None,
+        **overrides,
+    }
+    mode = options.pop("mode", os.getenv("LLM_CACHE_MODE", "off"))
+    return install_llm_cache(mode, **options)
@@ -1,31 +1,286 @@
-"""Opinionated JSON logging setup used across workflows."""
+"""Opinionated JSON logging setup used across workflows.
 
+``configure_logging()`` keeps logging off the event loop: a log call only
+resolves its message (and traceback, if any), snapshots its extras and puts
+the record on a bounded in-memory queue; a
+background thread serialises records to JSON lines (``orjson`` when
+installed) and writes them in batches. When the queue is full new records are
+dropped and counted (``log_records_dropped_total``) instead of blocking the
+caller.
+
+Every ``extra`` field is passed through, e.g.::
+
+    logger.warning("step_timed_out", extra={"run_id": run_id, "step": name, "duration": 3.2})
+    # {"ts": 1720000000.1, "level": "warning", "message": "step_timed_out",
+    #  "name": "agentic_core.orchestrator", "run_id": "…", "step": "…", "duration": 3.2}
+
+Noisy loggers can be sampled and rate limited (``LOG_SAMPLING``):
+comma-separated ``logger:rate[:per_second]`` entries, where ``rate`` is the
+share of records kept and ``per_second`` caps the kept records per second
+(``db_workflow:0.1,agentic_core.browser_pool:1:20``). A rule covers the
+logger and its children; errors are never sampled.
+
+Env-vars: ``LOG_LEVEL`` (default ``INFO``), ``LOG_SAMPLING``,
+``LOG_QUEUE_SIZE`` (default 10000).
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+from agentic_core.metrics import registry
+
+DEFAULT_QUEUE_SIZE = 10000
+WRITE_BATCH = 512
+
+try:  # optional, several times faster than json
+    import orjson
+
+    def _dumps(payload: Dict[str, Any]) -> str:
+        return orjson.dumps(payload, default=str).decode()
+
+except ImportError:  # pragma: no cover – depends on the environment
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+    _dumps = _encoder.encode
+
+# Attributes every LogRecord has – anything else came in via ``extra``
+_RESERVED = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
 
 
 class _JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
         payload: dict[str, Any] = {
+            "ts": round(record.created, 6),
             "level": record.levelname.lower(),
             "message": record.getMessage(),
             "name": record.name,
         }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        if hasattr(record, "run_id"):
-            payload["run_id"] = getattr(record, "run_id")
-        if hasattr(record, "step"):
-            payload["step"] = getattr(record, "step")
-        return json.dumps(payload, ensure_ascii=False)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return _dumps(payload)
+
+
+# ---------------------------------------------------------------------------
+# Sampling / rate limiting
+# ---------------------------------------------------------------------------
+
+
+class _Rule:
+    """Keep ``rate`` of the records, at most ``per_second`` per second."""
+
+    def __init__(self, rate: float, per_second: Optional[float] = None):
+        self.rate = rate
+        self.per_second = per_second
+        self._tokens = per_second or 0.0
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.rate < 1.0 and random.random() >= self.rate:
+            return False
+        if self.per_second is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.per_second, self._tokens + (now - self._refilled) * self.per_second)
+            self._refilled = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+def parse_sampling(spec: str) -> Dict[str, Tuple[float, Optional[float]]]:
+    """Parse ``logger:rate[:per_second]`` entries."""
+    rules: Dict[str, Tuple[float, Optional[float]]] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rest = entry.partition(":")
+        rate, _, per_second = rest.partition(":")
+        rules[name] = (float(rate or 1.0), float(per_second) if per_second else None)
+    return rules
+
+
+class SamplingFilter(logging.Filter):
+    """Per-logger sampling and rate limiting; records at ERROR and above always pass."""
+
+    def __init__(self, rules: Dict[str, Tuple[float, Optional[float]]]):
+        super().__init__()
+        self._rules = {name: _Rule(rate, per_second) for name, (rate, per_second) in rules.items()}
+        self._resolved: Dict[str, Optional[_Rule]] = {}
+
+    def _rule_for(self, name: str) -> Optional[_Rule]:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        rule, candidate = None, name
+        while candidate:
+            if candidate in self._rules:
+                rule = self._rules[candidate]
+                break
+            candidate = candidate.rpartition(".")[0]
+        self._resolved[name] = rule
+        return rule
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        rule = self._rule_for(record.name)
+        if rule is None or rule.allow():
+            return True
+        registry.counter("log_records_sampled_out_total", logger=record.name).inc()
+        return False
+
 
+# ---------------------------------------------------------------------------
+# Queue handler and writer thread
+# ---------------------------------------------------------------------------
+
+
+_SCALARS = (str, int, float, bool, type(None))
+_exception_formatter = logging.Formatter()
+
+
+def _snapshot(value: Any) -> Any:
+    """Copy of a non-scalar ``extra`` value as it is now; ``str()`` if it can't be copied."""
+    if isinstance(value, (dict, list, tuple, set, frozenset)):
+        try:
+            return copy.deepcopy(value)
+        except Exception:  # noqa: BLE001 – fall back to what _dumps would write
+            return str(value)
+    return str(value)
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue without formatting; drop (and count) when the queue is full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Like QueueHandler.prepare, snapshot everything the caller may still
+        # mutate (args, the traceback's frames, extras) but leave the JSON
+        # formatting to the writer thread. Copy so other handlers see the
+        # record unchanged.
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+        # Don't keep the traceback (and every frame's locals) alive in the queue
+        record.exc_info = None
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not isinstance(value, _SCALARS):
+                record.__dict__[key] = _snapshot(value)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            registry.counter("log_records_dropped_total").inc()
+
+
+class _LogWriter(threading.Thread):
+    """Daemon thread draining the queue and writing JSON lines in batches."""
+
+    def __init__(self, records: "queue.Queue[Any]", stream: TextIO, formatter: logging.Formatter):
+        super().__init__(name="log-writer", daemon=True)
+        self.records = records
+        self.stream = stream
+        self.format: Callable[[logging.LogRecord], str] = formatter.format
+        self._stopping = object()
+
+    def run(self) -> None:
+        while True:
+            batch: List[Any] = [self.records.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            done = False
+            for record in batch:
+                if record is self._stopping:
+                    done = True
+                    continue
+                try:
+                    lines.append(self.format(record))
+                except Exception:  # noqa: BLE001 – one bad record must not kill logging
+                    lines.append(_dumps({"level": "error", "message": "log_format_failed", "name": record.name}))
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass  # closed / broken stdout – nothing left to report to
+            if done:
+                return
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far, then end the thread."""
+        if not self.is_alive():
+            return
+        self.records.put(self._stopping)  # blocking – shutdown must not lose it
+        self.join(timeout)
+
+
+_writer: Optional[_LogWriter] = None
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread (also runs at exit)."""
+    global _writer
+
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def configure_logging(
+    level: Optional[int] = None,
+    *,
+    stream: Optional[TextIO] = None,
+    sampling: Optional[str] = None,
+    queue_size: Optional[int] = None,
+) -> None:
+    shutdown_logging()
+    global _writer
+
+    if level is None:
+        level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    records: "queue.Queue[Any]" = queue.Queue(queue_size or int(os.getenv("LOG_QUEUE_SIZE", str(DEFAULT_QUEUE_SIZE))))
+    handler = _NonBlockingQueueHandler(records)
+    rules = parse_sampling(sampling if sampling is not None else os.getenv("LOG_SAMPLING", ""))
+    if rules:
+        handler.addFilter(SamplingFilter(rules))
+
+    _writer = _LogWriter(records, stream or sys.stdout, _JsonFormatter())
+    _writer.start()
 
-def configure_logging(level: int = logging.INFO) -> None:
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(_JsonFormatter())
     root = logging.getLogger()
     root.setLevel(level)
     root.handlers.clear()
-    root.addHandler(handler) 
\ No newline at end of file
+    root.addHandler(handler)
+
+
+atexit.register(shutdown_logging)
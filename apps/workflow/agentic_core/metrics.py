@@ -0,0 +1,376 @@
+"""In-process metrics registry shared by workflows, tools and workers.
+
+Counters, gauges and latency histograms are kept in a process-wide
+``registry``. They can be scraped over HTTP (Prometheus text or JSON) and
+written to a periodic snapshot file. ``timed()`` is the usual entry point: it
+records call count, error count, in-flight gauge and latency for a block.
+
+Enable from the environment with ``start_metrics_from_env()``:
+
+    METRICS_PORT=9464                     # serve /metrics and /metrics.json
+    METRICS_SNAPSHOT_PATH=/tmp/metrics.json
+    METRICS_SNAPSHOT_INTERVAL=15          # seconds
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agentic_core.spans import span
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Exponential bucket bounds (seconds) from 1ms to ~10 minutes. Every histogram
+# uses the same bounds so snapshots from several processes can be merged.
+BUCKET_BOUNDS: List[float] = [0.001 * (1.25**i) for i in range(60)]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """Monotonic counter."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down (e.g. in-flight work)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with percentile estimates."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(BUCKET_BOUNDS, value)
+        with self._lock:
+            self.buckets[idx] += 1
+            self.count += 1
+            self.sum += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0–1); ``None`` when empty."""
+        with self._lock:
+            return _bucket_percentile(self.buckets, self.count, q)
+
+
+def _bucket_percentile(buckets: List[int], count: int, q: float) -> Optional[float]:
+    if count == 0:
+        return None
+    rank = q * count
+    seen = 0
+    for idx, n in enumerate(buckets):
+        if n and seen + n >= rank:
+            lower = BUCKET_BOUNDS[idx - 1] if idx > 0 else 0.0
+            upper = BUCKET_BOUNDS[idx] if idx < len(BUCKET_BOUNDS) else BUCKET_BOUNDS[-1]
+            # Linear interpolation inside the bucket
+            return lower + (upper - lower) * ((rank - seen) / n)
+        seen += n
+    return BUCKET_BOUNDS[-1]
+
+
+class MetricsRegistry:
+    """Thread-safe store of named, labelled metrics."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], Counter] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], Gauge] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+
+    # ------------------------------------------------------------------
+    # Metric accessors – created on first use
+    # ------------------------------------------------------------------
+
+    def counter(self, name: str, **labels: Any) -> Counter:
+        return self._get(self._counters, Counter, name, labels)
+
+    def gauge(self, name: str, **labels: Any) -> Gauge:
+        return self._get(self._gauges, Gauge, name, labels)
+
+    def histogram(self, name: str, **labels: Any) -> Histogram:
+        return self._get(self._histograms, Histogram, name, labels)
+
+    def _get(self, store: Dict, cls: type, name: str, labels: Dict[str, Any]) -> Any:
+        key = (name, _label_key(labels))
+        metric = store.get(key)
+        if metric is None:
+            with self._lock:
+                metric = store.setdefault(key, cls())
+        return metric
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable view of every metric."""
+        with self._lock:
+            counters = list(self._counters.items())
+            gauges = list(self._gauges.items())
+            histograms = list(self._histograms.items())
+
+        snap: Dict[str, Any] = {
+            "generated_at": time.time(),
+            "pid": os.getpid(),
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": c.value}
+                for (name, labels), c in counters
+            ],
+            "gauges": [
+                {"name": name, "labels": dict(labels), "value": g.value}
+                for (name, labels), g in gauges
+            ],
+            "histograms": [],
+        }
+        for (name, labels), h in histograms:
+            with h._lock:
+                buckets = list(h.buckets)
+                count, total = h.count, h.sum
+            snap["histograms"].append(_histogram_entry(name, dict(labels), buckets, count, total))
+        return snap
+
+    def render_prometheus(self) -> str:
+        return render_prometheus(self.snapshot())
+
+
+def _histogram_entry(
+    name: str, labels: Dict[str, str], buckets: List[int], count: int, total: float
+) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "labels": labels,
+        "count": count,
+        "sum": total,
+        "buckets": buckets,
+        "p50": _bucket_percentile(buckets, count, 0.50),
+        "p95": _bucket_percentile(buckets, count, 0.95),
+        "p99": _bucket_percentile(buckets, count, 0.99),
+    }
+
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine snapshots from several processes into one (sums everything)."""
+    counters: Dict[Tuple[str, LabelKey], float] = {}
+    gauges: Dict[Tuple[str, LabelKey], float] = {}
+    hists: Dict[Tuple[str, LabelKey], Dict[str, Any]] = {}
+
+    for snap in snapshots:
+        for c in snap.get("counters", []):
+            key = (c["name"], _label_key(c["labels"]))
+            counters[key] = counters.get(key, 0.0) + c["value"]
+        for g in snap.get("gauges", []):
+            key = (g["name"], _label_key(g["labels"]))
+            gauges[key] = gauges.get(key, 0.0) + g["value"]
+        for h in snap.get("histograms", []):
+            key = (h["name"], _label_key(h["labels"]))
+            acc = hists.setdefault(key, {"buckets": [0] * len(h["buckets"]), "count": 0, "sum": 0.0})
+            acc["buckets"] = [a + b for a, b in zip(acc["buckets"], h["buckets"])]
+            acc["count"] += h["count"]
+            acc["sum"] += h["sum"]
+
+    return {
+        "generated_at": time.time(),
+        "pid": os.getpid(),
+        "counters": [{"name": n, "labels": dict(lbl), "value": v} for (n, lbl), v in counters.items()],
+        "gauges": [{"name": n, "labels": dict(lbl), "value": v} for (n, lbl), v in gauges.items()],
+        "histograms": [
+            _histogram_entry(n, dict(lbl), acc["buckets"], acc["count"], acc["sum"])
+            for (n, lbl), acc in hists.items()
+        ],
+    }
+
+
+def _fmt_labels(labels: Dict[str, str], extra: Optional[Dict[str, str]] = None) -> str:
+    merged = {**labels, **(extra or {})}
+    if not merged:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in sorted(merged.items()))
+    return "{" + body + "}"
+
+
+def render_prometheus(snap: Dict[str, Any]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for c in snap["counters"]:
+        lines.append(f"{c['name']}{_fmt_labels(c['labels'])} {c['value']}")
+    for g in snap["gauges"]:
+        lines.append(f"{g['name']}{_fmt_labels(g['labels'])} {g['value']}")
+    for h in snap["histograms"]:
+        cumulative = 0
+        for bound, n in zip(BUCKET_BOUNDS + [float("inf")], h["buckets"]):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else f"{bound:.6g}"
+            lines.append(f"{h['name']}_bucket{_fmt_labels(h['labels'], {'le': le})} {cumulative}")
+        lines.append(f"{h['name']}_count{_fmt_labels(h['labels'])} {h['count']}")
+        lines.append(f"{h['name']}_sum{_fmt_labels(h['labels'])} {h['sum']}")
+    return "\n".join(lines) + "\n"
+
+
+# Process-wide default registry
+registry = MetricsRegistry()
+
+
+@contextmanager
+def timed(name: str, **labels: Any) -> Iterator[None]:
+    """Record ``<name>_total``, ``_errors_total``, ``_in_flight`` and ``_seconds``.
+
+    Works inside coroutines too – it only measures wall-clock time around the
+    ``with`` block. The block is also recorded as a span (``spans``) named
+    ``<name>:<label values>`` when span tracing is enabled.
+    """
+    in_flight = registry.gauge(f"{name}_in_flight", **labels)
+    in_flight.inc()
+    start = time.perf_counter()
+    label = ",".join(str(v) for v in labels.values())
+    try:
+        with span(f"{name}:{label}" if label else name, cat=name, **labels):
+            yield
+    except BaseException:
+        registry.counter(f"{name}_errors_total", **labels).inc()
+        raise
+    finally:
+        registry.histogram(f"{name}_seconds", **labels).observe(time.perf_counter() - start)
+        registry.counter(f"{name}_total", **labels).inc()
+        in_flight.dec()
+
+
+# ---------------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------------
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    snapshot_source: Callable[[], Dict[str, Any]] = staticmethod(registry.snapshot)
+
+    def do_GET(self) -> None:  # noqa: N802 – http.server naming
+        if self.path.startswith("/metrics.json"):
+            body = json.dumps(self.snapshot_source()).encode()
+            ctype = "application/json"
+        elif self.path.startswith("/metrics"):
+            body = render_prometheus(self.snapshot_source()).encode()
+            ctype = "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return  # keep scrapes out of the JSON logs
+
+
+def start_metrics_server(
+    port: int,
+    host: str = "127.0.0.1",
+    metrics_registry: MetricsRegistry = registry,
+    snapshot_source: Optional[Callable[[], Dict[str, Any]]] = None,
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` (Prometheus) and ``/metrics.json`` from a daemon thread.
+
+    ``snapshot_source`` overrides where the data comes from, e.g. a merge of
+    child-process snapshot files in the supervisor.
+    """
+    source = snapshot_source or metrics_registry.snapshot
+    handler = type("MetricsHandler", (_MetricsHandler,), {"snapshot_source": staticmethod(source)})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("metrics_server_started", extra={"port": port})
+    return server
+
+
+def write_snapshot(path: Path, metrics_registry: MetricsRegistry = registry) -> None:
+    """Atomically write the registry snapshot as JSON."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(metrics_registry.snapshot()))
+    os.replace(tmp, path)
+
+
+class SnapshotWriter(threading.Thread):
+    """Daemon thread that periodically writes the registry to ``path``."""
+
+    def __init__(self, path: Path, interval: float = 15.0, metrics_registry: MetricsRegistry = registry):
+        super().__init__(name="metrics-snapshot", daemon=True)
+        self.path = Path(path)
+        self.interval = interval
+        self.metrics_registry = metrics_registry
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        try:
+            write_snapshot(self.path, self.metrics_registry)
+        except OSError as exc:
+            logger.warning("metrics_snapshot_failed", extra={"error": str(exc)})
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.flush()
+
+
+def start_metrics_from_env() -> Optional[SnapshotWriter]:
+    """Start the scrape endpoint / snapshot writer configured via env-vars."""
+    port = os.getenv("METRICS_PORT")
+    if port:
+        start_metrics_server(int(port), host=os.getenv("METRICS_HOST", "127.0.0.1"))
+
+    snapshot_path = os.getenv("METRICS_SNAPSHOT_PATH")
+    if not snapshot_path:
+        return None
+    writer = SnapshotWriter(
+        Path(snapshot_path), interval=float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "15"))
+    )
+    writer.start()
+    return writer
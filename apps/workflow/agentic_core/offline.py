@@ -2,6 +2,10 @@
 
 Set the env-var ``AGENTIC_OFFLINE=1`` or pass ``--offline`` to the CLI runner
 and call ``apply_offline_patches()`` before invoking Agents SDK.
+
+Offline runs replay recordings from the LLM cache (see ``llm_cache``) and fall
+back to a deterministic mock – seeded from the prompt – for unrecorded calls.
+Record real answers once with ``LLM_CACHE_MODE=record``.
 """
 
 from __future__ import annotations
@@ -9,29 +13,33 @@ from __future__ import annotations
 import asyncio
 import os
 import random
-from typing import Any
+from pathlib import Path
+from typing import Any, Optional
 
 from agents import Runner
 
+from agentic_core.llm_cache import DEFAULT_CACHE_DIR, install_llm_cache
+
 
 class _MockRunResult:  # Minimal shim of agents.run.RunResult
     def __init__(self, final_output: Any):
         self.final_output = final_output
 
 
-def _gen_mock_urls(n: int = 5) -> str:
+def _gen_mock_urls(rng: random.Random, n: int = 5) -> str:
     base_domains = ["example", "acme", "foobar", "loremipsum", "mocksite"]
-    random.shuffle(base_domains)
+    rng.shuffle(base_domains)
     lines = [f"https://{d}.com" for d in base_domains[:n]]
     return "\n".join(lines)
 
 
 async def _mock_run(agent, prompt: str, *args, **kwargs):  # type: ignore[override]
     """Very naive stub that inspects prompt to decide what to return."""
+    rng = random.Random(prompt)  # same prompt → same answer
     prompt_lower = prompt.lower()
     if "analyse" in prompt_lower or "analyze" in prompt_lower:
         mock_json = {
-            "overall_score": round(random.uniform(0.4, 0.8), 2),
+            "overall_score": round(rng.uniform(0.4, 0.8), 2),
             "mobile_score": 0.7,
             "performance_score": 0.6,
         }
@@ -39,15 +47,20 @@ async def _mock_run(agent, prompt: str, *args, **kwargs):  # type: ignore[overri
     if "extract contact" in prompt_lower:
         return _MockRunResult('{"emails": ["info@example.com"], "phones": ["+123456789"]}')
     # default: prospect search
-    return _MockRunResult(_gen_mock_urls())
+    return _MockRunResult(_gen_mock_urls(rng))
+
 
+_applied = False
 
-def apply_offline_patches() -> None:
+
+def apply_offline_patches(cache_dir: Optional[Path] = None) -> None:
     """Monkey-patch Runner.run to avoid real network calls."""
+    global _applied
 
     # Only patch once.
-    if getattr(Runner.run, "_is_patched", False):
+    if _applied:
         return
+    _applied = True
 
     async def patched_run(*args, **kwargs):  # type: ignore[override]
         return await _mock_run(*args, **kwargs)
@@ -55,6 +68,13 @@ def apply_offline_patches() -> None:
     patched_run._is_patched = True  # type: ignore[attr-defined]
     Runner.run = patched_run  # type: ignore[assignment]
 
+    # Recorded answers win over the mock
+    install_llm_cache(
+        "replay",
+        cache_dir=cache_dir or Path(os.getenv("LLM_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+        strict=False,
+    )
+
 
 # Convenience to auto-apply based on env-var at import-time
 if os.getenv("AGENTIC_OFFLINE") == "1":
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import time
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional
 
+from agentic_core.metrics import timed
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
@@ -16,21 +19,73 @@ class WorkflowStepError(RuntimeError):
     """Raised when a workflow step fails."""
 
 
+class StepTimeoutError(WorkflowStepError):
+    """Raised when a step exceeds its own or the run's deadline budget."""
+
+
+def step_budget(name: str, step_timeouts: Optional[Dict[str, float]], remaining: Optional[float]) -> Optional[float]:
+    """``min(step limit, remaining run budget)``; ``None`` when neither is set.
+
+    ``step_timeouts`` maps step names (or ``"default"``) to seconds.
+    """
+    timeout = (step_timeouts or {}).get(name, (step_timeouts or {}).get("default"))
+    if timeout is None:
+        return remaining
+    if remaining is None:
+        return timeout
+    return min(timeout, remaining)
+
+
+async def within_budget(name: str, aw: Awaitable[Any], budget: Optional[float]) -> Any:
+    """Await ``aw`` for at most ``budget`` seconds (``None`` = unbounded).
+
+    Raises ``StepTimeoutError`` only when this budget ran out; a
+    ``TimeoutError`` raised inside ``aw`` (an HTTP or browser timeout) is an
+    ordinary failure and propagates unchanged.
+    """
+    if budget is not None and budget <= 0:
+        if inspect.iscoroutine(aw):
+            aw.close()  # never started – avoid "never awaited" warnings
+        raise StepTimeoutError(name)
+    deadline = asyncio.timeout(budget)
+    try:
+        async with deadline:
+            return await aw
+    except TimeoutError as exc:
+        if deadline.expired():
+            raise StepTimeoutError(name) from exc
+        raise
+
+
 class BaseWorkflow(ABC):
     """A minimal async workflow base-class.
 
     Sub-classes should implement ``async run()`` and call ``await self.step(...)``
     for each logical phase so we get automatic timing, tracing, and error
     propagation.
+
+    Deadline budgets are optional: ``run_timeout`` caps the whole run and
+    ``step_timeouts`` maps step names (or ``"default"``) to per-step limits.
+    Each step gets ``min(step limit, remaining run budget)``.
     """
 
     # Name is used for queue routing & registry lookup
     name: str = "base"
 
-    def __init__(self, run_id: str, *, trace: Optional[Callable[[Dict[str, Any]], None]] = None, **context: Any):
+    def __init__(
+        self,
+        run_id: str,
+        *,
+        trace: Optional[Callable[[Dict[str, Any]], None]] = None,
+        run_timeout: Optional[float] = None,
+        step_timeouts: Optional[Dict[str, float]] = None,
+        **context: Any,
+    ):
         self.run_id = run_id
         self.ctx: Dict[str, Any] = context
         self._trace = trace or (lambda payload: None)
+        self.step_timeouts: Dict[str, float] = dict(step_timeouts or {})
+        self._deadline = time.monotonic() + run_timeout if run_timeout else None
 
     # ---------------------------------------------------------------------
     # Public API – subclasses must override ``run``
@@ -44,12 +99,40 @@ class BaseWorkflow(ABC):
     # Helper for consistent step logging / tracing
     # ------------------------------------------------------------------
 
-    async def step(self, name: str, coro: Awaitable[Any]) -> Any:  # noqa: D401
+    def remaining_budget(self) -> Optional[float]:
+        """Seconds left in the run budget (``None`` when unbounded)."""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    @property
+    def deadline_expired(self) -> bool:
+        remaining = self.remaining_budget()
+        return remaining is not None and remaining <= 0
+
+    def _step_timeout(self, name: str, timeout: Optional[float]) -> Optional[float]:
+        limits = {name: timeout} if timeout is not None else self.step_timeouts
+        return step_budget(name, limits, self.remaining_budget())
+
+    async def step(self, name: str, coro: Awaitable[Any], *, timeout: Optional[float] = None) -> Any:  # noqa: D401
+        budget = self._step_timeout(name, timeout)
+        if budget is not None and budget <= 0:
+            if inspect.iscoroutine(coro):
+                coro.close()  # never started – avoid "never awaited" warnings
+            self._publish_status(name, "timed_out", duration=0.0)
+            raise StepTimeoutError(name)
+
         start = time.perf_counter()
         self._publish_status(name, "running")
 
         try:
-            result = await coro
+            with timed("workflow_step", workflow=self.name, step=name):
+                result = await within_budget(name, coro, budget)
+        except StepTimeoutError:
+            duration = time.perf_counter() - start
+            logger.warning("step_timed_out", extra={"run_id": self.run_id, "step": name, "duration": duration})
+            self._publish_status(name, "timed_out", duration=duration)
+            raise
         except Exception as exc:  # noqa: BLE001 – propagate after logging
             duration = time.perf_counter() - start
             logger.exception("step_failed", extra={"run_id": self.run_id, "step": name, "duration": duration})
@@ -74,5 +157,9 @@ class BaseWorkflow(ABC):
             "state": state,
             **payload,
         }
-        # Hook for DB updates / websocket push – injected by queue runner
-        self._trace(message) 
\ No newline at end of file
+        # Hook for DB updates / websocket push – injected by queue runner.
+        # A failing tracer never fails the step.
+        try:
+            self._trace(message)
+        except Exception:  # noqa: BLE001
+            logger.exception("trace_failed", extra={"run_id": self.run_id, "step": step}) 
\ No newline at end of file
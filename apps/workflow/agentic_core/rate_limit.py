@@ -0,0 +1,371 @@
+"""Process-wide adaptive rate limiting for ``Runner.run`` (LLM calls).
+
+Two mechanisms work together:
+
+* a **shared budget** of requests/min and tokens/min kept by a pluggable
+  backend – ``InProcessBudget`` for one process, ``FileBudget`` for several
+  worker processes on one host (state in a ``flock``-protected file);
+* an **AIMD concurrency limit** per process: +1/limit per fast success,
+  halved on a 429 (at most once per cooldown window so a burst of in-flight
+  429s counts as one congestion signal), trimmed when latency exceeds target.
+
+A 429 also pauses the shared budget for ``Retry-After`` seconds so every
+process backs off together instead of retrying into the same wall.
+
+The limiter is re-entrant: a ``Runner.run`` made from inside a limited call
+(an agent tool that runs another agent) reuses its caller's slot, takes only
+the shared budget and does not feed AIMD; its time is excluded from the
+caller's latency.
+
+Call ``install_rate_limiter()`` once at start-up (worker / CLI runner).
+Configuration comes from env-vars: ``LLM_MAX_CONCURRENCY``, ``LLM_RPM``,
+``LLM_TPM``, ``LLM_LATENCY_TARGET`` and ``LLM_RATE_LIMIT_FILE``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
+
+from agents import Runner
+
+from agentic_core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Rough prompt-size heuristic; corrected after the call when usage is known
+CHARS_PER_TOKEN = 4
+DEFAULT_OUTPUT_TOKENS = 512
+
+
+# ---------------------------------------------------------------------------
+# Shared request/token budgets
+# ---------------------------------------------------------------------------
+
+
+class BudgetBackend(Protocol):
+    """Storage for the shared request/token buckets.
+
+    Backends that may block (file locks, I/O) set ``blocking``; the limiter
+    then calls them from a worker thread instead of the event loop.
+    """
+
+    blocking: bool
+
+    def reserve(self, requests: int, tokens: int) -> float:
+        """Take from the buckets; return 0 on success or seconds to wait."""
+
+    def adjust(self, tokens: int) -> None:
+        """Return (positive) or charge (negative) tokens after the fact."""
+
+    def pause(self, seconds: float) -> None:
+        """Block all reservations for ``seconds`` (provider said 429)."""
+
+
+def _refill(state: Dict[str, float], rpm: float, tpm: float, now: float) -> None:
+    elapsed = max(0.0, now - state["updated"])
+    state["requests"] = min(rpm, state["requests"] + elapsed * rpm / 60.0)
+    state["tokens"] = min(tpm, state["tokens"] + elapsed * tpm / 60.0)
+    state["updated"] = now
+
+
+def _take(state: Dict[str, float], rpm: float, tpm: float, requests: int, tokens: int) -> float:
+    now = time.time()
+    if state.get("paused_until", 0.0) > now:
+        return state["paused_until"] - now
+    _refill(state, rpm, tpm, now)
+    # Never ask for more than a full bucket or the call could wait forever
+    tokens = min(tokens, int(tpm))
+    missing_req = requests - state["requests"]
+    missing_tok = tokens - state["tokens"]
+    if missing_req <= 0 and missing_tok <= 0:
+        state["requests"] -= requests
+        state["tokens"] -= tokens
+        return 0.0
+    return max(missing_req * 60.0 / rpm, missing_tok * 60.0 / tpm, 0.01)
+
+
+class InProcessBudget:
+    """Token buckets shared by every coroutine/thread in this process."""
+
+    blocking = False
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._lock = threading.Lock()
+        self._state = {"requests": rpm, "tokens": tpm, "updated": time.time(), "paused_until": 0.0}
+
+    def reserve(self, requests: int, tokens: int) -> float:
+        with self._lock:
+            return _take(self._state, self.rpm, self.tpm, requests, tokens)
+
+    def adjust(self, tokens: int) -> None:
+        with self._lock:
+            self._state["tokens"] = min(self.tpm, self._state["tokens"] + tokens)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._state["paused_until"] = max(self._state["paused_until"], time.time() + seconds)
+
+
+class FileBudget:
+    """Token buckets in a small JSON file shared by processes on one host."""
+
+    # flock waits for other processes – keep it off the event loop
+    blocking = True
+
+    def __init__(self, path: Path, rpm: float, tpm: float):
+        self.path = Path(path)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+    def _update(self, fn: Any) -> Any:
+        with open(self.path, "r+") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                raw = fh.read()
+                state = json.loads(raw) if raw else {
+                    "requests": self.rpm,
+                    "tokens": self.tpm,
+                    "updated": time.time(),
+                    "paused_until": 0.0,
+                }
+                result = fn(state)
+                fh.seek(0)
+                fh.truncate()
+                fh.write(json.dumps(state))
+                return result
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def reserve(self, requests: int, tokens: int) -> float:
+        return self._update(lambda s: _take(s, self.rpm, self.tpm, requests, tokens))
+
+    def adjust(self, tokens: int) -> None:
+        def _apply(state: Dict[str, float]) -> None:
+            state["tokens"] = min(self.tpm, state["tokens"] + tokens)
+
+        self._update(_apply)
+
+    def pause(self, seconds: float) -> None:
+        def _apply(state: Dict[str, float]) -> None:
+            state["paused_until"] = max(state.get("paused_until", 0.0), time.time() + seconds)
+
+        self._update(_apply)
+
+
+# ---------------------------------------------------------------------------
+# AIMD concurrency limiter
+# ---------------------------------------------------------------------------
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that converges on the provider's ceiling."""
+
+    def __init__(
+        self,
+        budget: BudgetBackend,
+        *,
+        initial_concurrency: float = 4.0,
+        max_concurrency: float = 64.0,
+        min_concurrency: float = 1.0,
+        latency_target: float = 30.0,
+        cooldown: float = 5.0,
+    ):
+        self.budget = budget
+        self.limit = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+        self._gauge = registry.gauge("llm_limiter_concurrency")
+        self._gauge.set(self.limit)
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    @asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and budget, release on exit."""
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        try:
+            await self.reserve(tokens)
+            yield
+        finally:
+            async with cond:
+                self._in_flight -= 1
+                cond.notify_all()
+
+    async def reserve(self, tokens: int) -> None:
+        """Wait until the shared budget has one request and ``tokens`` to spare."""
+        while (delay := await self._budget_call(self.budget.reserve, 1, tokens)) > 0:
+            registry.counter("llm_limiter_waits_total").inc()
+            await asyncio.sleep(delay)
+
+    async def _budget_call(self, fn: Any, *args: Any) -> Any:
+        if self.budget.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def adjust(self, tokens: int) -> None:
+        """Return (positive) or charge (negative) tokens to the shared budget."""
+        await self._budget_call(self.budget.adjust, tokens)
+
+    # -- feedback ---------------------------------------------------------
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.latency_target:
+            self._decrease(0.9)
+            return
+        self._set_limit(self.limit + 1.0 / self.limit)
+
+    async def on_rate_limited(self, retry_after: Optional[float]) -> None:
+        registry.counter("llm_rate_limited_total").inc()
+        self._decrease(0.5)
+        await self._budget_call(self.budget.pause, retry_after if retry_after is not None else 1.0)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return  # one congestion event per window
+        self._last_decrease = now
+        self._set_limit(self.limit * factor)
+
+    def _set_limit(self, value: float) -> None:
+        grew = int(value) > int(self.limit)
+        self.limit = max(self.min_concurrency, min(self.max_concurrency, value))
+        self._gauge.set(self.limit)
+        if grew and self._cond is not None:
+            asyncio.ensure_future(self._wake())
+
+    async def _wake(self) -> None:
+        cond = self._condition()
+        async with cond:
+            cond.notify_all()
+
+
+def _is_rate_limit_error(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _estimate_tokens(agent: Any, prompt: Any) -> int:
+    instructions = getattr(agent, "instructions", "")
+    text = f"{instructions if isinstance(instructions, str) else ''}{prompt}"
+    return len(text) // CHARS_PER_TOKEN + DEFAULT_OUTPUT_TOKENS
+
+
+def _actual_tokens(result: Any) -> Optional[int]:
+    usage = getattr(getattr(result, "context_wrapper", None), "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+# ---------------------------------------------------------------------------
+# Runner.run integration
+# ---------------------------------------------------------------------------
+
+_limiter: Optional[AdaptiveLimiter] = None
+# Seconds spent in nested calls of the enclosing limited call; ``None`` outside one
+_nested_seconds: ContextVar[Optional[List[float]]] = ContextVar("llm_nested_seconds", default=None)
+
+
+def limiter_from_env() -> AdaptiveLimiter:
+    rpm = float(os.getenv("LLM_RPM", "500"))
+    tpm = float(os.getenv("LLM_TPM", "200000"))
+    shared_file = os.getenv("LLM_RATE_LIMIT_FILE")
+    budget: BudgetBackend = FileBudget(Path(shared_file), rpm, tpm) if shared_file else InProcessBudget(rpm, tpm)
+    return AdaptiveLimiter(
+        budget,
+        max_concurrency=float(os.getenv("LLM_MAX_CONCURRENCY", "64")),
+        latency_target=float(os.getenv("LLM_LATENCY_TARGET", "30")),
+    )
+
+
+def get_limiter() -> Optional[AdaptiveLimiter]:
+    return _limiter
+
+
+def install_rate_limiter(limiter: Optional[AdaptiveLimiter] = None, max_retries: int = 3) -> AdaptiveLimiter:
+    """Wrap ``Runner.run`` so every LLM call goes through ``limiter``."""
+    global _limiter
+
+    if getattr(Runner.run, "_rate_limited", False):
+        assert _limiter is not None
+        return _limiter
+
+    _limiter = limiter or limiter_from_env()
+    original_run = Runner.run
+
+    async def limited_run(agent: Any, prompt: Any, *args: Any, **kwargs: Any) -> Any:
+        assert _limiter is not None
+        estimate = _estimate_tokens(agent, prompt)
+        enclosing = _nested_seconds.get()
+        if enclosing is not None:
+            # A tool of a limited call: waiting for a second slot would
+            # deadlock once the limit is 1, so only the budget applies
+            start = time.monotonic()
+            try:
+                await _limiter.reserve(estimate)
+                result = await original_run(agent, prompt, *args, **kwargs)
+            finally:
+                enclosing.append(time.monotonic() - start)
+            await _settle_tokens(estimate, result)
+            return result
+
+        for attempt in range(max_retries + 1):
+            nested: List[float] = []
+            token = _nested_seconds.set(nested)
+            try:
+                async with _limiter.slot(estimate):
+                    start = time.monotonic()
+                    try:
+                        result = await original_run(agent, prompt, *args, **kwargs)
+                    except Exception as exc:
+                        if not _is_rate_limit_error(exc) or attempt == max_retries:
+                            raise
+                        await _limiter.on_rate_limited(_retry_after(exc))
+                        continue
+            finally:
+                _nested_seconds.reset(token)
+            # Only this call's own model time says anything about the provider
+            _limiter.on_success(time.monotonic() - start - sum(nested))
+            await _settle_tokens(estimate, result)
+            return result
+        raise AssertionError("unreachable")
+
+    async def _settle_tokens(estimate: int, result: Any) -> None:
+        assert _limiter is not None
+        actual = _actual_tokens(result)
+        if actual is not None:
+            await _limiter.adjust(estimate - actual)
+
+    limited_run._rate_limited = True  # type: ignore[attr-defined]
+    Runner.run = staticmethod(limited_run)  # type: ignore[assignment]
+    return _limiter
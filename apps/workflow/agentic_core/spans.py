@@ -0,0 +1,194 @@
+"""Hierarchical span tracing exported as Chrome trace-event JSON.
+
+Spans nest run → step → item → tool → navigation / evaluate / DB call. The
+current span lives in a ``ContextVar``, so tasks created inside a span
+(``asyncio.gather``, hedged attempts, …) attach their spans to it:
+
+    with span("item", cat="item", url=url):
+        await asyncio.gather(analyze_website(url), fetch_contact_info(url))
+
+Every ``metrics.timed()`` block is a span too (page loads, DB writes, LLM
+calls, workflow steps, worker jobs), so most of the tree comes for free.
+
+Recording is off unless enabled – ``span()`` is then a no-op. Enable it from
+the environment with ``start_spans_from_env()``:
+
+    TRACE_SPANS_PATH=/tmp/spans-{pid}.json   # written on shutdown / exit
+    TRACE_SPANS_MAX=100000                   # spans kept per process
+
+The file loads in ``chrome://tracing``, Perfetto (ui.perfetto.dev) or
+speedscope as a flame graph. Each asyncio task gets its own track, so
+concurrent items show side by side; ``span_id``/``parent_id`` in each event's
+args keep the logical hierarchy across tracks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_MAX_SPANS = 100000
+
+
+class Span:
+    """One timed operation; ``end`` is set when it finishes."""
+
+    __slots__ = ("name", "cat", "span_id", "parent_id", "trace_id", "start", "end", "attrs", "track")
+
+    def __init__(self, name: str, cat: str, parent: Optional["Span"], attrs: Dict[str, Any], track: int):
+        self.name = name
+        self.cat = cat
+        self.span_id = next(_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else self.span_id
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attrs = attrs
+        self.track = track
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes known only once the span is running."""
+        self.attrs.update(attrs)
+
+
+_ids = itertools.count(1)
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class SpanRecorder:
+    """Keeps finished spans (up to ``max_spans``) and writes them out."""
+
+    def __init__(self, max_spans: int = DEFAULT_MAX_SPANS):
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.origin = time.perf_counter()
+        # Keyed by the task / thread itself: an entry goes away with its task
+        # and a recycled id() can never land on an old track
+        self._task_tracks: "weakref.WeakKeyDictionary[asyncio.Task[Any], int]" = weakref.WeakKeyDictionary()
+        self._thread_tracks = threading.local()
+        self._track_ids = itertools.count(1)
+        self._track_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def track(self) -> int:
+        """Small integer per asyncio task (or thread outside a loop)."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            track = getattr(self._thread_tracks, "track", None)
+            if track is None:
+                track = self._thread_tracks.track = self._new_track(threading.current_thread().name)
+            return track
+        track = self._task_tracks.get(task)
+        if track is None:
+            track = self._task_tracks[task] = self._new_track(task.get_name())
+        return track
+
+    def _new_track(self, name: str) -> int:
+        with self._lock:
+            track = next(self._track_ids)
+            self._track_names[track] = name
+        return track
+
+    def record(self, span: Span) -> None:
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return
+        self.spans.append(span)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._track_names.items()
+        ]
+        for s in self.spans:
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": s.cat,
+                    "ph": "X",
+                    "ts": round((s.start - self.origin) * 1e6, 1),
+                    "dur": round(((s.end or s.start) - s.start) * 1e6, 1),
+                    "pid": pid,
+                    "tid": s.track,
+                    "args": {"span_id": s.span_id, "parent_id": s.parent_id, "trace_id": s.trace_id, **s.attrs},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_spans": self.dropped}}
+
+    def write(self, path: Path) -> None:
+        """Atomically write the Chrome trace JSON to ``path``."""
+        path = Path(str(path).format(pid=os.getpid()))
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.chrome_trace(), default=str))
+        os.replace(tmp, path)
+
+
+_recorder: Optional[SpanRecorder] = None
+_export_path: Optional[Path] = None
+
+
+@contextmanager
+def span(name: str, cat: str = "app", **attrs: Any) -> Iterator[Optional[Span]]:
+    """Record ``name`` as a child of the current span (no-op while disabled)."""
+    recorder = _recorder
+    if recorder is None:
+        yield None
+        return
+    s = Span(name, cat, current_span.get(), attrs, recorder.track())
+    token = current_span.set(s)
+    try:
+        yield s
+    except BaseException as exc:
+        s.attrs["error"] = type(exc).__name__
+        raise
+    finally:
+        s.end = time.perf_counter()
+        current_span.reset(token)
+        recorder.record(s)
+
+
+# ---------------------------------------------------------------------------
+# Enabling / export
+# ---------------------------------------------------------------------------
+
+
+def enable_spans(path: Optional[Path] = None, max_spans: int = DEFAULT_MAX_SPANS) -> SpanRecorder:
+    """Start recording; with ``path`` the trace is written by ``write_spans()``/at exit."""
+    global _recorder, _export_path
+
+    _recorder = SpanRecorder(max_spans)
+    _export_path = Path(path) if path else None
+    return _recorder
+
+
+def write_spans() -> Optional[Path]:
+    """Write the recorded spans to the configured path (if any)."""
+    if _recorder is None or _export_path is None:
+        return None
+    _recorder.write(_export_path)
+    return _export_path
+
+
+def start_spans_from_env() -> Optional[SpanRecorder]:
+    path = os.getenv("TRACE_SPANS_PATH")
+    if not path:
+        return None
+    return enable_spans(Path(path), int(os.getenv("TRACE_SPANS_MAX", str(DEFAULT_MAX_SPANS))))
+
+
+atexit.register(write_spans)
@@ -0,0 +1,215 @@
+"""Write-behind buffer that persists workflow results while the run continues.
+
+Producers ``await buffer.add(row)``; a background task hands rows to the async
+``flush`` callable every ``max_rows`` rows or ``max_delay`` seconds after the
+oldest unflushed row, whichever comes first:
+
+    async with WriteBehindBuffer(write_rows, max_rows=10, max_delay=0.5) as buffer:
+        for result in results:
+            await buffer.add(result)
+    # leaving the block flushes everything still buffered
+
+Memory is bounded: once ``max_pending`` rows are buffered or being written,
+``add`` waits until a flush makes room (backpressure when the DB lags). A
+failed flush keeps its rows and is retried; after ``max_retries`` consecutive
+failures the buffer turns failed and ``add``/``aclose`` raise the last error.
+
+Env-vars for the defaults: ``WRITE_BEHIND_MAX_ROWS``,
+``WRITE_BEHIND_MAX_DELAY_MS``, ``WRITE_BEHIND_MAX_PENDING``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Generic, List, Optional, TypeVar
+
+from agentic_core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ROWS = int(os.getenv("WRITE_BEHIND_MAX_ROWS", "10"))
+DEFAULT_MAX_DELAY = int(os.getenv("WRITE_BEHIND_MAX_DELAY_MS", "500")) / 1000
+DEFAULT_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "200"))
+
+
+class WriteBehindBuffer(Generic[T]):
+    """Bounded, batched, asynchronous writer for result rows."""
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[None]],
+        *,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_retries: int = 3,
+        name: str = "write_behind",
+    ) -> None:
+        if max_pending < max_rows:
+            raise ValueError("max_pending must be at least max_rows")
+        self._flush = flush
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.name = name
+
+        self._rows: List[T] = []
+        self._writing = 0  # rows handed to an in-progress flush
+        self._oldest: Optional[float] = None
+        self._failures = 0
+        self._error: Optional[BaseException] = None
+        self._cond: Optional[asyncio.Condition] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # Serialises the background writer and explicit ``flush()`` calls
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._pending_gauge = registry.gauge("write_behind_pending", buffer=name)
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows) + self._writing
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    async def add(self, row: T) -> None:
+        """Buffer ``row``; waits while ``max_pending`` rows are outstanding."""
+        if self._closed:
+            raise RuntimeError(f"{self.name} buffer is closed")
+        self._ensure_started()
+        assert self._cond is not None and self._wakeup is not None
+        async with self._cond:
+            if self.pending >= self.max_pending:
+                registry.counter("write_behind_backpressure_total", buffer=self.name).inc()
+            await self._cond.wait_for(lambda: self._error is not None or self.pending < self.max_pending)
+            if self._error is not None:
+                raise self._error
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows.append(row)
+            self._pending_gauge.inc()
+        if len(self._rows) == 1 or len(self._rows) >= self.max_rows:
+            # Start the age timer / flush a full batch now
+            self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Background flushing
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._task is not None:
+            return
+        self._cond = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=self.name)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while not self._closed:
+            if not self._rows or self._error is not None:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            if len(self._rows) < self.max_rows:
+                assert self._oldest is not None
+                remaining = self._oldest + self.max_delay - time.monotonic()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    if len(self._rows) < self.max_rows and time.monotonic() < self._oldest + self.max_delay:
+                        continue
+            if not await self._flush_batch():
+                # Back off before retrying the same rows
+                await asyncio.sleep(min(5.0, 0.1 * 2**self._failures))
+
+    async def _flush_batch(self) -> bool:
+        """Write up to ``max_rows`` rows; ``False`` if the write failed."""
+        assert self._flush_lock is not None
+        async with self._flush_lock:
+            return await self._write_batch()
+
+    async def _write_batch(self) -> bool:
+        """``_flush_batch`` body; the caller holds ``_flush_lock``."""
+        assert self._cond is not None
+        if not self._rows:
+            # A concurrent flush() wrote them while we waited for the lock
+            return True
+        batch, self._rows = self._rows[: self.max_rows], self._rows[self.max_rows :]
+        self._oldest = time.monotonic() if self._rows else None
+        self._writing += len(batch)
+        try:
+            await self._flush(batch)
+        except Exception as exc:  # noqa: BLE001 – keep the rows, retry later
+            self._failures += 1
+            registry.counter("write_behind_flush_failures_total", buffer=self.name).inc()
+            logger.warning(
+                "write_behind_flush_failed",
+                extra={"buffer": self.name, "rows": len(batch), "attempt": self._failures, "error": str(exc)},
+            )
+            self._rows[:0] = batch
+            self._oldest = self._oldest or time.monotonic()
+            if self._failures >= self.max_retries:
+                self._error = exc
+            ok = False
+        else:
+            self._failures = 0
+            self._pending_gauge.dec(len(batch))
+            registry.histogram("write_behind_flush_rows", buffer=self.name).observe(len(batch))
+            ok = True
+        finally:
+            self._writing -= len(batch)
+        async with self._cond:
+            self._cond.notify_all()
+        return ok
+
+    async def flush(self) -> None:
+        """Write everything buffered now; raises if the buffer has failed.
+
+        Waits for a background write already in progress, so on return every
+        row added before the call has been handed to ``flush`` and written.
+        """
+        if self._task is None:
+            return
+        assert self._flush_lock is not None
+        async with self._flush_lock:
+            while self._rows and self._error is None:
+                await self._write_batch()
+        if self._error is not None:
+            raise self._error
+
+    async def aclose(self) -> None:
+        """Stop the background task and flush whatever is left (final flush)."""
+        self._closed = True
+        if self._task is None:
+            return
+        assert self._wakeup is not None
+        self._wakeup.set()
+        await self._task
+        # One more attempt for a failed buffer – the DB may be back
+        self._error, self._failures = None, max(0, self.max_retries - 1)
+        await self.flush()
+
+    async def __aenter__(self) -> "WriteBehindBuffer[T]":
+        self._ensure_started()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            await self.aclose()
+            return
+        try:
+            await self.aclose()
+        except Exception:  # noqa: BLE001 – don't mask the original error
+            logger.exception("write_behind_final_flush_failed", extra={"buffer": self.name, "rows": self.pending})
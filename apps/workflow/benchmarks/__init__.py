@@ -0,0 +1,15 @@
+"""Benchmarks and performance budgets for the workflow app (run from apps/workflow)."""
+
+from __future__ import annotations
+
+import math
+from typing import List
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
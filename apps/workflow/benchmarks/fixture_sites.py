@@ -0,0 +1,179 @@
+"""Local HTTP server with a generated corpus of synthetic prospect sites.
+
+    uv run python -m benchmarks.fixture_sites --sites 200 --port 8765
+
+Every site ``i`` lives under ``/site/<i>/`` with an index page, a contact page
+and ``scripts`` external scripts. Pages are rendered on request from a seeded
+RNG, so the corpus is deterministic and costs no memory. Knobs:
+
+* ``size_kb``         – approximate HTML size of the index page;
+* ``latency_ms``      – server-side delay per response (±50% jitter);
+* ``scripts``         – ``<script src>`` tags per page;
+* ``forms``           – forms per page;
+* ``contact_density`` – share of sites exposing emails/phones/social links.
+
+Used by ``benchmarks.throughput``; the browser tools never leave the host.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from typing import List, Tuple
+
+from aiohttp import web
+
+_WORDS = (
+    "local family owned service quality trusted experts since welcome call today "
+    "free estimate licensed insured community best award winning friendly team"
+).split()
+_SOCIAL = ("facebook.com", "instagram.com", "linkedin.com", "twitter.com")
+
+
+class FixtureCorpus:
+    """Deterministic description of ``sites`` synthetic websites."""
+
+    def __init__(
+        self,
+        sites: int = 50,
+        *,
+        seed: int = 0,
+        size_kb: int = 40,
+        latency_ms: float = 20.0,
+        scripts: int = 5,
+        forms: int = 1,
+        contact_density: float = 0.7,
+    ) -> None:
+        self.sites = sites
+        self.seed = seed
+        self.size_kb = size_kb
+        self.latency_ms = latency_ms
+        self.scripts = scripts
+        self.forms = forms
+        self.contact_density = contact_density
+
+    def urls(self, base_url: str) -> List[str]:
+        return [f"{base_url}/site/{i}/" for i in range(self.sites)]
+
+    def _rng(self, site: int, page: str) -> random.Random:
+        return random.Random(f"{self.seed}:{site}:{page}")
+
+    def has_contacts(self, site: int) -> bool:
+        return self._rng(site, "contacts").random() < self.contact_density
+
+    def _contacts_html(self, site: int) -> str:
+        if not self.has_contacts(site):
+            return ""
+        rng = self._rng(site, "contact-details")
+        phone = f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+        social = "".join(
+            f'<a href="https://{net}/fixture{site}">{net}</a>' for net in rng.sample(_SOCIAL, k=rng.randint(1, 3))
+        )
+        return f"<p>Email: info@fixture{site}.test · Phone: {phone}</p><p>{social}</p>"
+
+    def render(self, site: int, page: str) -> str:
+        rng = self._rng(site, page)
+        title = f"Fixture Business {site}"
+        scripts = "".join(f'<script src="/site/{site}/static/app{j}.js"></script>' for j in range(self.scripts))
+        forms = "".join(
+            f'<form action="/site/{site}/submit" method="post"><input name="email{k}" type="email">'
+            f'<button type="submit">Send</button></form>'
+            for k in range(self.forms)
+        )
+        body: List[str] = []
+        size = 0
+        target = self.size_kb * 1024 if page == "index" else 4096
+        while size < target:
+            paragraph = "<p>" + " ".join(rng.choice(_WORDS) for _ in range(60)) + "</p>"
+            body.append(paragraph)
+            size += len(paragraph)
+        return (
+            "<!DOCTYPE html><html lang=\"en\"><head>"
+            f"<meta charset=\"utf-8\"><title>{title}</title>"
+            '<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f'<meta name="description" content="{title} – synthetic benchmark site">'
+            f"{scripts}</head><body>"
+            f'<nav><a href="/site/{site}/">Home</a> <a href="/site/{site}/contact">Contact us</a></nav>'
+            f"<h1>{title}</h1>{''.join(body)}{forms}{self._contacts_html(site)}"
+            "</body></html>"
+        )
+
+    def script(self, site: int, index: int) -> str:
+        return f"window.fixture{index} = {{site: {site}, ready: true}};"
+
+
+def build_app(corpus: FixtureCorpus) -> web.Application:
+    async def _delay(site: int, page: str) -> None:
+        if corpus.latency_ms > 0:
+            jitter = corpus._rng(site, f"latency:{page}").uniform(0.5, 1.5)
+            await asyncio.sleep(corpus.latency_ms * jitter / 1000)
+
+    def _site(request: web.Request) -> int:
+        site = int(request.match_info["site"])
+        if not 0 <= site < corpus.sites:
+            raise web.HTTPNotFound()
+        return site
+
+    async def index(request: web.Request) -> web.Response:
+        site = _site(request)
+        await _delay(site, "index")
+        return web.Response(text=corpus.render(site, "index"), content_type="text/html")
+
+    async def contact(request: web.Request) -> web.Response:
+        site = _site(request)
+        await _delay(site, "contact")
+        return web.Response(text=corpus.render(site, "contact"), content_type="text/html")
+
+    async def script(request: web.Request) -> web.Response:
+        site = _site(request)
+        index_ = int(request.match_info["index"])
+        await _delay(site, f"script{index_}")
+        return web.Response(text=corpus.script(site, index_), content_type="application/javascript")
+
+    app = web.Application()
+    app.router.add_get("/site/{site:\\d+}/", index)
+    app.router.add_get("/site/{site:\\d+}/contact", contact)
+    app.router.add_get("/site/{site:\\d+}/static/app{index:\\d+}.js", script)
+    return app
+
+
+async def start_fixture_server(
+    corpus: FixtureCorpus, host: str = "127.0.0.1", port: int = 0
+) -> Tuple[web.AppRunner, str]:
+    """Start serving ``corpus``; returns the runner (``await runner.cleanup()``) and base URL."""
+    runner = web.AppRunner(build_app(corpus), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    sockets = site._server.sockets if site._server else []  # type: ignore[union-attr]
+    bound_port = sockets[0].getsockname()[1] if sockets else port
+    return runner, f"http://{host}:{bound_port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic prospect sites")
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size-kb", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--scripts", type=int, default=5)
+    parser.add_argument("--forms", type=int, default=1)
+    parser.add_argument("--contact-density", type=float, default=0.7)
+    args = parser.parse_args()
+    corpus = FixtureCorpus(
+        args.sites,
+        seed=args.seed,
+        size_kb=args.size_kb,
+        latency_ms=args.latency_ms,
+        scripts=args.scripts,
+        forms=args.forms,
+        contact_density=args.contact_density,
+    )
+    print(f"Serving {args.sites} fixture sites on http://127.0.0.1:{args.port}/site/<n>/")
+    web.run_app(build_app(corpus), host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
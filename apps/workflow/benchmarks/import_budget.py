@@ -0,0 +1,102 @@
+"""Import-time budget for the CLI and worker entry points.
+
+    uv run python -m benchmarks.import_budget
+    uv run python -m benchmarks.import_budget --runs 5 --scale 2
+
+Every target is imported in a fresh interpreter (best of ``--runs``). The
+check fails (exit code 1) when a target exceeds its budget or eagerly imports
+a heavy dependency that should only load on first use (Playwright, bs4,
+aiohttp, asyncpg). No credentials are needed – nothing may connect at import
+time. ``tests/test_import_budget.py`` runs the same check under pytest.
+
+The worker cannot start without the Agents SDK, whose own import time depends
+on the installed ``openai-agents``/``openai`` versions; it is imported first
+(``PRELOAD``) and neither its time nor what it loads counts against the worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+LAZY_MODULES = ("playwright", "bs4", "aiohttp", "asyncpg")
+
+# target module -> budget in seconds
+BUDGETS: Dict[str, float] = {
+    "workflows": 0.15,
+    "supabase_io": 0.25,
+    "runner": 0.35,
+    "worker": 0.8,
+}
+
+# Imported before the target and excluded from its time and lazy-module check
+PRELOAD: Dict[str, Tuple[str, ...]] = {
+    "worker": ("agents",),
+}
+
+_PROBE = """
+import importlib, json, sys, time
+for name in {preload!r}:
+    importlib.import_module(name)
+before = set(sys.modules)
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {lazy!r} if m in sys.modules and m not in before]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def measure(target: str, runs: int) -> Tuple[float, List[str]]:
+    """Best-of-``runs`` import time of ``target`` and the lazy modules it loaded."""
+    preload = PRELOAD.get(target, ())
+    env = {k: v for k, v in os.environ.items() if k not in ("SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY", "DATABASE_URL")}
+    best = float("inf")
+    loaded: List[str] = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(target=target, lazy=LAZY_MODULES, preload=preload)],
+            cwd=APP_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        best = min(best, result["seconds"])
+        loaded = result["loaded"]
+    return best, loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check import-time budgets")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply all budgets (slow CI machines)")
+    parser.add_argument("targets", nargs="*", default=list(BUDGETS))
+    args = parser.parse_args()
+
+    failed = False
+    for target in args.targets:
+        budget = BUDGETS.get(target, 1.0) * args.scale
+        try:
+            seconds, loaded = measure(target, args.runs)
+        except subprocess.CalledProcessError as exc:
+            print(f"✗ {target:<12} import failed:\n{exc.stderr}")
+            failed = True
+            continue
+        ok = seconds <= budget and not loaded
+        failed |= not ok
+        extra = f"  eager: {', '.join(loaded)}" if loaded else ""
+        print(f"{'✓' if ok else '✗'} {target:<12} {seconds * 1000:7.1f} ms  (budget {budget * 1000:.0f} ms){extra}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""In-process stand-in for pgmq and the workflow tables.
+
+Implements the database surface ``supabase_io`` exposes to the worker – the
+queue calls (read, set_vt, delete, defer, dead-letter) and the run/prospect
+persistence helpers – on plain dicts, so ``JobConsumer``/``ProspectWorker``
+can be driven without Postgres:
+
+    store = InMemoryPgmq(db_latency=0.002)
+    with store.installed():
+        run_id = store.create_run("local_business")
+        store.send("worker_jobs", {"run_id": run_id, "audience_name": "local_business"})
+        ...
+
+Semantics follow the SQL functions in ``supabase/migrations``: visibility
+timeouts and read counts per message, idempotent ``fan_out_run``, fan-in in
+``settle_sub_job``, already settled batches ignored by
+``persist_prospect_batch``, and dead-lettering that fails the run (or settles
+an ``analyze`` sub-job as failed). Every call is counted in ``calls`` and
+costs ``db_latency`` seconds, first deliveries record their queue wait, and
+redeliveries are counted for the load report. ``benchmarks.sql_checks`` runs
+the real functions against a database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+# supabase_io names replaced while installed (db_workflow imports some directly)
+SURFACE = (
+    "_read_jobs",
+    "_set_vt",
+    "_ack_job",
+    "_dead_letter",
+    "_defer_job",
+    "create_workflow_run",
+    "start_workflow_run",
+    "complete_workflow_run",
+    "fail_workflow_run",
+    "insert_prospects",
+    "insert_prospect_results",
+    "fan_out_run",
+    "settle_sub_job",
+    "persist_prospect_batch",
+)
+
+
+class InMemoryPgmq:
+    """Queues plus the run/prospect tables, with call counts and latency."""
+
+    def __init__(self, db_latency: float = 0.0, on_send: Optional[Any] = None) -> None:
+        self.db_latency = db_latency
+        # Called after every send (e.g. ``InMemoryWakeup.notify``)
+        self.on_send = on_send
+        self.queues: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.runs: Dict[str, Dict[str, Any]] = {}
+        self.prospects: Dict[tuple, str] = {}
+        self.analyses = 0
+        self.contacts = 0
+        self.calls: Counter[str] = Counter()
+        self.reads = 0
+        self.redeliveries = 0
+        self.queue_waits: List[float] = []
+        self._ids = itertools.count(1)
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    def send(self, queue: str, message: Dict[str, Any], delay: float = 0.0) -> int:
+        msg_id = next(self._ids)
+        now = time.monotonic()
+        self.queues.setdefault(queue, {})[msg_id] = {
+            "msg_id": msg_id,
+            "read_ct": 0,
+            "enqueued_at": datetime.now(timezone.utc),
+            "enqueued_mono": now,
+            "vt": now + delay,
+            "message": message,
+        }
+        if self.on_send is not None:
+            self.on_send()
+        return msg_id
+
+    def depth(self, queue: str) -> int:
+        return len(self.queues.get(queue, {}))
+
+    async def _roundtrip(self, op: str) -> None:
+        self.calls[op] += 1
+        if self.db_latency > 0:
+            await asyncio.sleep(self.db_latency)
+
+    async def _read_jobs(self, limit: int, visibility_timeout: int, queue_name: str = "worker_jobs") -> list[Dict[str, Any]]:
+        await self._roundtrip("read")
+        now = time.monotonic()
+        jobs = []
+        for msg in self.queues.get(queue_name, {}).values():
+            if len(jobs) >= limit:
+                break
+            if msg["vt"] > now:
+                continue
+            msg["read_ct"] += 1
+            msg["vt"] = now + visibility_timeout
+            self.reads += 1
+            if msg["read_ct"] > 1:
+                self.redeliveries += 1
+            elif not msg.get("deferred"):
+                self.queue_waits.append(now - msg["enqueued_mono"])
+            jobs.append({k: msg[k] for k in ("msg_id", "read_ct", "enqueued_at", "message")})
+        return jobs
+
+    async def _set_vt(self, msg_id: int, visibility_timeout: int, queue_name: str = "worker_jobs") -> None:
+        await self._roundtrip("set_vt")
+        msg = self.queues.get(queue_name, {}).get(msg_id)
+        if msg is not None:
+            msg["vt"] = time.monotonic() + visibility_timeout
+
+    async def _ack_job(self, msg_id: int, queue_name: str = "worker_jobs") -> None:
+        await self._roundtrip("delete")
+        self.queues.get(queue_name, {}).pop(msg_id, None)
+
+    async def _defer_job(self, msg_id: int, delay: float, queue_name: str = "worker_jobs") -> None:
+        await self._roundtrip("defer_job")
+        msg = self.queues.get(queue_name, {}).get(msg_id)
+        if msg is not None:
+            msg["vt"] = time.monotonic() + delay
+            msg["read_ct"] = max(0, msg["read_ct"] - 1)
+            msg["deferred"] = True
+
+    async def _dead_letter(
+        self, msg_id: int, payload: Dict[str, Any], error: str, read_ct: int, queue_name: str = "worker_jobs"
+    ) -> None:
+        await self._roundtrip("dead_letter_job")
+        if self.queues.get(queue_name, {}).pop(msg_id, None) is None:
+            return
+        self.send(f"{queue_name}_dlq", {**payload, "_error": error, "_read_ct": read_ct})
+        run_id = payload.get("run_id")
+        if payload.get("kind") == "analyze" and run_id in self.runs:
+            self._settle(run_id, int(payload["batch_index"]), True)
+        elif run_id in self.runs:
+            self.runs[run_id]["status"] = "failed"
+
+    # ------------------------------------------------------------------
+    # Runs, prospects, fan-out / fan-in
+    # ------------------------------------------------------------------
+
+    def create_run(self, audience_name: str, location: Optional[str] = None) -> str:
+        run_id = str(uuid.uuid4())
+        self.runs[run_id] = {"audience": audience_name, "location": location, "status": "running", "sub_jobs": {}}
+        return run_id
+
+    def finished_runs(self) -> int:
+        return sum(1 for run in self.runs.values() if run["status"] in ("completed", "failed"))
+
+    async def create_workflow_run(
+        self, audience_name: str, location: str | None = None, *, audience_id: str | None = None
+    ) -> str:
+        await self._roundtrip("create_workflow_run")
+        return self.create_run(audience_name, location)
+
+    async def _status(self, run_id: str, status: str) -> None:
+        await self._roundtrip("update_workflow_run")
+        if run_id in self.runs:
+            self.runs[run_id]["status"] = status
+
+    async def start_workflow_run(self, run_id: str) -> None:
+        await self._status(run_id, "running")
+
+    async def complete_workflow_run(self, run_id: str) -> None:
+        await self._status(run_id, "completed")
+
+    async def fail_workflow_run(self, run_id: str) -> None:
+        await self._status(run_id, "failed")
+
+    def _prospect_ids(self, run_id: str, urls: List[str]) -> Dict[str, str]:
+        return {url: self.prospects.setdefault((run_id, url), str(uuid.uuid4())) for url in dict.fromkeys(urls)}
+
+    async def insert_prospects(self, run_id: str, urls: list[str]) -> Dict[str, str]:
+        await self._roundtrip("insert_prospects")
+        return self._prospect_ids(run_id, urls)
+
+    async def insert_prospect_results(
+        self, prospect_ids: list[Optional[str]], analyses: list[Dict[str, Any]], contacts: list[Dict[str, Any]]
+    ) -> None:
+        await self._roundtrip("insert_prospect_results")
+        written = sum(1 for pid in prospect_ids if pid)
+        self.analyses += written
+        self.contacts += written
+
+    async def fan_out_run(
+        self,
+        run_id: str,
+        batches: list[list[str]],
+        source_query: str | None = None,
+        queue_name: str = "worker_jobs",
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        await self._roundtrip("fan_out_run")
+        run = self.runs[run_id]
+        if run["sub_jobs"]:
+            return 0
+        for index, urls in enumerate(batches):
+            run["sub_jobs"][index] = "pending"
+            self.send(
+                queue_name,
+                {
+                    **(fields or {}),
+                    "kind": "analyze",
+                    "run_id": run_id,
+                    "batch_index": index,
+                    "urls": urls,
+                    "source_query": source_query,
+                },
+            )
+        return len(batches)
+
+    def _settle(self, run_id: str, batch_index: int, failed: bool) -> str:
+        run = self.runs[run_id]
+        if run["sub_jobs"].get(batch_index) == "pending":
+            run["sub_jobs"][batch_index] = "failed" if failed else "done"
+            states = run["sub_jobs"].values()
+            if "pending" not in states:
+                run["status"] = "failed" if all(s == "failed" for s in states) else "completed"
+        return run["status"]
+
+    async def settle_sub_job(self, run_id: str, batch_index: int, failed: bool) -> str:
+        await self._roundtrip("settle_sub_job")
+        return self._settle(run_id, batch_index, failed)
+
+    async def persist_prospect_batch(
+        self, run_id: str, rows: list[Dict[str, Any]], batch_index: int | None = None, failed: bool = False
+    ) -> Dict[str, Any]:
+        await self._roundtrip("persist_prospect_batch")
+        run = self.runs[run_id]
+        if batch_index is not None and run["sub_jobs"].get(batch_index) not in (None, "pending"):
+            # Redelivered batch – already written and settled
+            return {"status": run["status"], "prospect_ids": {}}
+        ids = self._prospect_ids(run_id, [row["url"] for row in rows])
+        self.analyses += sum(1 for row in rows if row.get("analysis"))
+        self.contacts += sum(len(row.get("contacts") or []) for row in rows)
+        status = self._settle(run_id, batch_index, failed) if batch_index is not None else run["status"]
+        return {"status": status, "prospect_ids": ids}
+
+    # ------------------------------------------------------------------
+    # Installation
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def installed(self) -> Iterator["InMemoryPgmq"]:
+        """Route the ``supabase_io`` surface (and ``db_workflow``'s imports) here."""
+        import db_workflow
+        import supabase_io
+
+        saved = []
+        for module in (supabase_io, db_workflow):
+            for name in SURFACE:
+                if hasattr(module, name):
+                    saved.append((module, name, getattr(module, name)))
+                    setattr(module, name, getattr(self, name))
+        try:
+            yield self
+        finally:
+            for module, name, original in saved:
+                setattr(module, name, original)
@@ -0,0 +1,257 @@
+"""Worker load test against in-memory pgmq with simulated LLM and browser latency.
+
+    uv run python -m benchmarks.load_test --jobs 2000 --workers 2 --concurrency 16
+    uv run python -m benchmarks.load_test --jobs 500 --llm-error-rate 0.1 --batch-size 5
+
+Enqueues ``--jobs`` run messages into ``benchmarks.inmemory_pgmq`` and drives
+``--workers`` ``ProspectWorker`` consumers on one event loop until every run
+has completed or failed. Nothing leaves the process:
+
+* ``Runner.run`` is replaced by a stub that sleeps for a log-normal latency
+  (median ``--llm-ms``, spread ``--llm-sigma``) and fails at
+  ``--llm-error-rate``; it answers search prompts with synthetic URLs;
+* the analysis and contact tools used by ``db_workflow`` get the same
+  treatment (``--browser-ms``, ``--browser-error-rate``);
+* every database call costs ``--db-ms``.
+
+The report shows runs and prospects per minute, queue wait percentiles
+(first delivery), the redelivery rate, dead-lettered messages and the number
+of database calls per operation and per run – enough to check concurrency,
+lane and batching changes offline before they meet Supabase and OpenAI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import logging
+import math
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks import percentile
+from benchmarks.inmemory_pgmq import InMemoryPgmq
+
+
+class SimulatedError(RuntimeError):
+    """Injected failure of a simulated LLM or browser call."""
+
+
+class SimulatedLatency:
+    """Log-normal latency around ``median`` seconds plus an error rate."""
+
+    def __init__(self, median: float, sigma: float = 0.5, error_rate: float = 0.0, seed: int = 0) -> None:
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    async def __call__(self, what: str) -> None:
+        self.calls += 1
+        if self.median > 0:
+            await asyncio.sleep(self._rng.lognormvariate(math.log(self.median), self.sigma))
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise SimulatedError(f"simulated {what} failure")
+
+
+class _RunResult:  # Minimal shim of agents.run.RunResult
+    def __init__(self, final_output: Any):
+        self.final_output = final_output
+
+
+def _urls_for(prompt: str, count: int) -> str:
+    digest = hashlib.sha1(prompt.encode()).hexdigest()[:10]
+    return "\n".join(f"https://site-{digest}-{i}.example.com" for i in range(count))
+
+
+@contextlib.contextmanager
+def simulated_services(llm: SimulatedLatency, browser: SimulatedLatency, urls_per_query: int = 5):
+    """Patch ``Runner.run`` and the browser tools used by ``db_workflow``."""
+    from agents import Runner
+
+    import db_workflow
+    from workflows.website_prospector.tools.analyze_site import AnalysisResult
+    from workflows.website_prospector.tools.contact import ContactInfo
+    from workflows.website_prospector.types import SiteAnalysis
+
+    async def run(agent: Any, prompt: str, *args: Any, **kwargs: Any) -> _RunResult:
+        await llm("llm")
+        return _RunResult(_urls_for(prompt, urls_per_query))
+
+    async def analyze_website(prospect_url: str) -> AnalysisResult:
+        await browser("analysis")
+        score = random.Random(prospect_url).uniform(0.3, 0.9)
+        analysis = SiteAnalysis(
+            url=prospect_url,
+            outdated_score=score,
+            mobile_score=score,
+            performance_score=score,
+            seo_score=score,
+            security_score=score,
+            overall_score=score,
+        )
+        return AnalysisResult(analysis=analysis, improvement_suggestions=[])
+
+    async def fetch_contact_info(prospect_url: str) -> ContactInfo:
+        await browser("contacts")
+        return ContactInfo(emails=[f"info@{prospect_url.split('//')[-1].split('/')[0]}"])
+
+    saved = (Runner.run, db_workflow.analyze_website, db_workflow.fetch_contact_info)
+    Runner.run = run  # type: ignore[assignment]
+    db_workflow.analyze_website = analyze_website
+    db_workflow.fetch_contact_info = fetch_contact_info
+    try:
+        yield
+    finally:
+        Runner.run, db_workflow.analyze_website, db_workflow.fetch_contact_info = saved  # type: ignore[assignment]
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    from queue_lanes import parse_lanes
+    from queue_wakeup import InMemoryWakeup
+    from worker import ProspectWorker
+
+    wakeup = InMemoryWakeup()
+    store = InMemoryPgmq(db_latency=args.db_ms / 1000, on_send=wakeup.notify)
+    llm = SimulatedLatency(args.llm_ms / 1000, args.llm_sigma, args.llm_error_rate, seed=args.seed)
+    browser = SimulatedLatency(args.browser_ms / 1000, args.browser_sigma, args.browser_error_rate, seed=args.seed + 1)
+    lanes = parse_lanes(args.lanes)
+
+    with store.installed(), simulated_services(llm, browser, args.urls_per_query):
+        for i in range(args.jobs):
+            run_id = store.create_run(args.audience, "Load Town")
+            store.send(
+                lanes[i % len(lanes)].queue,
+                {
+                    "run_id": run_id,
+                    "audience_name": args.audience,
+                    "location": "Load Town",
+                    "max_prospects": args.max_prospects,
+                    "tenant_id": f"tenant-{i % args.tenants}",
+                },
+            )
+
+        workers = [
+            ProspectWorker(
+                sleep=0.05,
+                max_idle_sleep=0.5,
+                max_in_flight=args.concurrency,
+                visibility_timeout=args.visibility_timeout,
+                wakeup=wakeup,
+                max_attempts=args.max_attempts,
+                retry_base_delay=args.retry_base_delay,
+                lanes=lanes,
+                fair_share_limit=args.fair_share_limit,
+            )
+            for _ in range(args.workers)
+        ]
+
+        start = time.perf_counter()
+        output = io.StringIO() if not args.verbose else None
+        if output is not None:
+            # Injected failures would otherwise log one warning each
+            logging.getLogger("db_workflow").setLevel(logging.ERROR)
+        with contextlib.redirect_stdout(output) if output is not None else contextlib.nullcontext():
+            tasks = [asyncio.create_task(w.run_forever()) for w in workers]
+            deadline = start + args.timeout
+            # Consumers also exit on SIGTERM/SIGINT – report what finished so far
+            while (
+                store.finished_runs() < args.jobs
+                and time.perf_counter() < deadline
+                and not all(t.done() for t in tasks)
+            ):
+                await asyncio.sleep(0.1)
+            elapsed = time.perf_counter() - start
+            for w in workers:
+                w.stop()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    runs = store.runs.values()
+    completed = sum(1 for run in runs if run["status"] == "completed")
+    failed = sum(1 for run in runs if run["status"] == "failed")
+    dead_lettered = sum(store.depth(f"{lane.queue}_dlq") for lane in lanes)
+    return {
+        "jobs": args.jobs,
+        "seconds": round(elapsed, 2),
+        "completed": completed,
+        "failed": failed,
+        "unfinished": args.jobs - completed - failed,
+        "runs_per_minute": round((completed + failed) / elapsed * 60, 1) if elapsed else 0.0,
+        "prospects_per_minute": round(len(store.prospects) / elapsed * 60, 1) if elapsed else 0.0,
+        "queue_wait_p50": round(percentile(store.queue_waits, 50), 3),
+        "queue_wait_p95": round(percentile(store.queue_waits, 95), 3),
+        "queue_wait_p99": round(percentile(store.queue_waits, 99), 3),
+        "reads": store.reads,
+        "redelivery_rate": round(store.redeliveries / store.reads, 4) if store.reads else 0.0,
+        "dead_lettered": dead_lettered,
+        "llm_calls": llm.calls,
+        "llm_errors": llm.errors,
+        "browser_calls": browser.calls,
+        "browser_errors": browser.errors,
+        "db_calls": dict(sorted(store.calls.items())),
+        "db_calls_per_run": round(sum(store.calls.values()) / args.jobs, 1) if args.jobs else 0.0,
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['completed']} completed, {report['failed']} failed, {report['unfinished']} unfinished "
+        f"of {report['jobs']} runs in {report['seconds']} s"
+    )
+    print(f"throughput   {report['runs_per_minute']:8.1f} runs/min  {report['prospects_per_minute']:8.1f} prospects/min")
+    print(
+        f"queue wait   p50 {report['queue_wait_p50']:.3f} s  p95 {report['queue_wait_p95']:.3f} s  "
+        f"p99 {report['queue_wait_p99']:.3f} s"
+    )
+    print(f"redelivery   {report['redelivery_rate'] * 100:.2f}% of {report['reads']} reads, {report['dead_lettered']} dead-lettered")
+    print(
+        f"simulated    llm {report['llm_calls']} calls ({report['llm_errors']} errors), "
+        f"browser {report['browser_calls']} calls ({report['browser_errors']} errors)"
+    )
+    print(f"db calls     {report['db_calls_per_run']} per run")
+    for op, count in report["db_calls"].items():
+        print(f"  {op:<24} {count}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline load test for the prospect worker")
+    parser.add_argument("--jobs", type=int, default=1000, help="Run messages to enqueue")
+    parser.add_argument("--workers", type=int, default=1, help="Consumers on the event loop")
+    parser.add_argument("--concurrency", type=int, default=4, help="max_in_flight per consumer")
+    parser.add_argument("--lanes", default="default:1", help="Lane spec, as WORKER_LANES")
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--fair-share-limit", type=int, default=None)
+    parser.add_argument("--audience", default="local_business")
+    parser.add_argument("--max-prospects", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=1, help="FANOUT_BATCH_SIZE")
+    parser.add_argument("--urls-per-query", type=int, default=5)
+    parser.add_argument("--visibility-timeout", type=int, default=30)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--retry-base-delay", type=float, default=1.0)
+    parser.add_argument("--llm-ms", type=float, default=800.0)
+    parser.add_argument("--llm-sigma", type=float, default=0.5)
+    parser.add_argument("--llm-error-rate", type=float, default=0.02)
+    parser.add_argument("--browser-ms", type=float, default=1500.0)
+    parser.add_argument("--browser-sigma", type=float, default=0.6)
+    parser.add_argument("--browser-error-rate", type=float, default=0.05)
+    parser.add_argument("--db-ms", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Give up after this many seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Show the workers' output")
+    args = parser.parse_args(argv)
+
+    # Read by db_workflow at import time
+    os.environ["FANOUT_BATCH_SIZE"] = str(args.batch_size)
+    _print_report(asyncio.run(run_load(args)))
+
+
+if __name__ == "__main__":
+    main()
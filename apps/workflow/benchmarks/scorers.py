@@ -0,0 +1,303 @@
+"""Micro-benchmarks for the pure-Python scorers run on every analysed page.
+
+    uv run python -m benchmarks.scorers
+    uv run python -m benchmarks.scorers --save scorers.json
+    uv run python -m benchmarks.scorers --baseline benchmarks/scorers_baseline.json
+    uv run python -m benchmarks.scorers --write-corpus   # regenerate benchmarks/corpus
+
+Runs ``SiteAnalyzer._analyze_seo``, ``_analyze_outdatedness`` and
+``_identify_technical_issues`` (the browser probe answers "no broken
+images"), the contact regexes and ``parse_contact_info`` over the checked-in
+corpus (``benchmarks/corpus/*.html.gz``, ~5 KB to ~750 KB of HTML), plus the
+BeautifulSoup parse they all start from. For every scorer and page it reports
+the median time of ``--repeat`` calls and the memory allocated by one call
+(``tracemalloc`` peak).
+
+Each scorer runs once per installed BeautifulSoup tree builder
+(``html.parser``, ``lxml``, ``html5lib``) and its output must be identical
+across them – a parser or scanner swap that changes a score fails the check.
+With ``--baseline`` the outputs must also match the saved run, and a scorer
+fails when its median time grew by more than ``--max-regression``. Exit code
+1 on any mismatch or regression.
+
+``benchmarks/scorers_baseline.json`` is the committed reference run. Its
+outputs hold on any machine; its times come from one developer machine, so
+re-save it (``--save``) before relying on the time check elsewhere.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+BASE_URL = "https://corpus.example.com/"
+
+# page name -> content sections (roughly 2.3 KB of HTML each)
+CORPUS_SIZES: Dict[str, int] = {"small": 4, "medium": 40, "large": 200, "xlarge": 900}
+PARSERS = ("html.parser", "lxml", "html5lib")
+# Parser output legitimately differs (implied tags); only its cost is compared
+_NOT_CROSS_CHECKED = {"parse"}
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+_WORDS = (
+    "family owned plumbing heating repair service quality local trusted since welcome emergency "
+    "licensed insured estimate call today award winning friendly professional community project"
+).split()
+
+
+def generate_page(name: str, sections: int, seed: int = 0) -> str:
+    """A small-business page mixing modern and dated markup, deterministic per ``name``."""
+    rng = random.Random(f"{seed}:{name}")
+
+    def words(n: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+    head = [
+        f"<title>{words(4).title()}</title>",
+        f'<meta name="description" content="{words(20)}">',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        '<meta name="generator" content="Microsoft FrontPage 4.0">' if name == "medium" else "",
+        '<script src="http://cdn.example.net/jquery-1.4.2.min.js"></script>',
+        '<script src="https://cdn.example.net/app.js"></script>',
+        '<script type="application/ld+json">{"@type": "LocalBusiness"}</script>' if name != "small" else "",
+        '<link rel="stylesheet" href="/css/site.css">',
+    ]
+    nav = "".join(f'<a href="/page-{i}">{words(2)}</a>' for i in range(12))
+    body: List[str] = [f"<header><nav>{nav}</nav><h1>{words(5)}</h1></header>"]
+    for i in range(sections):
+        kind = i % 4
+        parts = [f"<h2>{words(4)}</h2>"]
+        if kind == 0:
+            parts.append(f'<p style="color:#333;font-size:13px">{words(70)}</p>')
+            parts.append(f'<img src="/img/{i}.jpg" alt="{words(3)}"><img src="http://img.example.net/{i}.gif">')
+        elif kind == 1:
+            rows = "".join(
+                f'<tr><td style="padding:4px">{words(6)}</td><td><font face="Arial">{words(5)}</font></td></tr>'
+                for _ in range(6)
+            )
+            parts.append(f'<table width="100%" border="0"><tbody>{rows}</tbody></table>')
+        elif kind == 2:
+            parts.append(f"<h3>{words(3)}</h3><p>{words(90)}</p><center>{words(8)}</center>")
+            parts.append(f'<div itemscope itemtype="https://schema.org/Service"><span>{words(10)}</span></div>')
+        else:
+            parts.append(
+                f'<p>Call us at ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)} '
+                f"or email team{i}@corpus.example.com – {words(40)}</p>"
+            )
+            parts.append(
+                '<form action="/contact" method="post"><input name="email" type="email">'
+                '<textarea name="message"></textarea><button>Send</button></form>'
+            )
+        body.append(f'<section id="s{i}">{"".join(parts)}</section>')
+    body.append(
+        '<footer><a href="/contact-us">Contact</a> '
+        '<a href="https://facebook.com/corpusplumbing">Facebook</a> '
+        '<a href="https://instagram.com/corpusplumbing">Instagram</a> '
+        "<p>info@corpus.example.com · +1 415 555 0100</p>"
+        "<p>Copyright © 2012 Corpus Plumbing</p></footer>"
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        + "".join(head)
+        + "</head><body>"
+        + "\n".join(body)
+        + "</body></html>\n"
+    )
+
+
+def write_corpus() -> None:
+    CORPUS_DIR.mkdir(exist_ok=True)
+    for name, sections in CORPUS_SIZES.items():
+        html = generate_page(name, sections)
+        path = CORPUS_DIR / f"{name}.html.gz"
+        # mtime=0 keeps the files byte-identical across regenerations
+        path.write_bytes(gzip.compress(html.encode(), mtime=0))
+        print(f"{path.name:<16} {len(html) / 1024:8.1f} KB")
+
+
+def load_corpus() -> Dict[str, str]:
+    pages = {}
+    for name in CORPUS_SIZES:
+        path = CORPUS_DIR / f"{name}.html.gz"
+        pages[name] = gzip.decompress(path.read_bytes()).decode()
+    return pages
+
+
+# ---------------------------------------------------------------------------
+# Scorers
+# ---------------------------------------------------------------------------
+
+
+class _NoBrowserPage:
+    """Stands in for the Playwright page the technical-issues check probes."""
+
+    async def evaluate(self, script: str) -> int:
+        return 0
+
+
+def _run_sync(coro: Any) -> Any:
+    # The coroutine never suspends (see _NoBrowserPage) – skip the event loop
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("scorer awaited real I/O")
+
+
+def available_parsers() -> List[str]:
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    found = []
+    for parser in PARSERS:
+        try:
+            BeautifulSoup("<p></p>", parser)
+        except FeatureNotFound:
+            continue
+        found.append(parser)
+    return found
+
+
+def scorers() -> Dict[str, Callable[[str, Any], Any]]:
+    """Scorer name -> ``fn(html, soup)``; ``soup`` is pre-parsed by the caller."""
+    from bs4 import BeautifulSoup
+
+    from workflows.website_prospector.tools.contact import EMAIL_PATTERN, PHONE_PATTERN, parse_contact_info
+    from workflows.website_prospector.tools.site_analyzer import SiteAnalyzer
+
+    analyzer = SiteAnalyzer.__new__(SiteAnalyzer)  # no screenshot dir needed
+    page = _NoBrowserPage()
+
+    def contact_regex(html: str, soup: Any) -> Any:
+        emails = sorted(set(EMAIL_PATTERN.findall(html)))
+        phones = sorted(set(PHONE_PATTERN.findall(html)))
+        return [emails, [list(p) for p in phones]]
+
+    def contact_parse(html: str, soup: Any) -> Any:
+        info = parse_contact_info(html, BASE_URL)
+        # emails/phones come from a set – compare them order-independently
+        return {**info.model_dump(), "emails": sorted(info.emails), "phones": sorted(info.phones)}
+
+    return {
+        "parse": lambda html, soup: len(BeautifulSoup(html, soup.builder.NAME).find_all(True)),
+        "seo": lambda html, soup: analyzer._analyze_seo(soup),
+        "outdatedness": lambda html, soup: analyzer._analyze_outdatedness(soup, html),
+        "technical_issues": lambda html, soup: _run_sync(analyzer._identify_technical_issues(page, soup)),
+        "contact_regex": contact_regex,
+        "contact_parse": contact_parse,
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Tuple[Any, float, int]:
+    """Output, median seconds over ``repeat`` calls and peak bytes allocated by one call."""
+    times = []
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return output, statistics.median(times), peak
+
+
+def run(repeat: int, only: List[str]) -> Dict[str, Any]:
+    from bs4 import BeautifulSoup
+
+    pages = load_corpus()
+    parsers = available_parsers()
+    results: Dict[str, Any] = {"parsers": parsers, "scorers": {}}
+    mismatches: List[str] = []
+
+    for scorer, fn in scorers().items():
+        if only and scorer not in only:
+            continue
+        per_page: Dict[str, Any] = {}
+        for name, html in pages.items():
+            outputs: Dict[str, Any] = {}
+            for parser in parsers:
+                soup = BeautifulSoup(html, parser)
+                output, seconds, peak = measure(lambda: fn(html, soup), repeat)
+                outputs[parser] = output
+                if parser == parsers[0]:
+                    per_page[name] = {
+                        "kb": round(len(html) / 1024, 1),
+                        "median_ms": round(seconds * 1000, 3),
+                        "peak_kb": round(peak / 1024, 1),
+                        "output": output,
+                    }
+                per_page[name][f"{parser}_ms"] = round(seconds * 1000, 3)
+            reference = outputs[parsers[0]]
+            for parser, output in outputs.items():
+                if scorer not in _NOT_CROSS_CHECKED and output != reference:
+                    mismatches.append(f"{scorer}/{name}: {parser} gives {output!r}, {parsers[0]} {reference!r}")
+            row = per_page[name]
+            print(
+                f"{scorer:<17} {name:<7} {row['kb']:8.1f} KB  {row['median_ms']:9.2f} ms  "
+                f"{row['peak_kb']:9.1f} KB alloc"
+                + "".join(f"  {p} {row[f'{p}_ms']:.2f} ms" for p in parsers[1:])
+            )
+        results["scorers"][scorer] = per_page
+    results["mismatches"] = mismatches
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Output changes and time regressions of ``current`` against ``baseline``."""
+    found: List[str] = []
+    for scorer, pages in baseline.get("scorers", {}).items():
+        for name, base in pages.items():
+            now = current["scorers"].get(scorer, {}).get(name)
+            if now is None:
+                continue
+            if json.loads(json.dumps(now["output"])) != base["output"]:
+                found.append(f"{scorer}/{name}: output changed to {now['output']!r} (was {base['output']!r})")
+            if base["median_ms"] and now["median_ms"] > base["median_ms"] * (1 + max_regression):
+                found.append(f"{scorer}/{name}: {now['median_ms']:.2f} ms vs baseline {base['median_ms']:.2f} ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the page scorers on the saved corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per scorer and page")
+    parser.add_argument("--scorers", default="", help="Comma-separated subset (default: all)")
+    parser.add_argument("--save", type=Path, default=None, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against saved results")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument("--write-corpus", action="store_true", help="Regenerate benchmarks/corpus and exit")
+    args = parser.parse_args()
+
+    if args.write_corpus:
+        write_corpus()
+        return
+
+    only = [s.strip() for s in args.scorers.split(",") if s.strip()]
+    results = run(args.repeat, only)
+    problems = [f"parsers disagree – {m}" for m in results["mismatches"]]
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+    if args.baseline:
+        problems += compare(results, json.loads(args.baseline.read_text()), args.max_regression)
+    for line in problems:
+        print(f"✗ {line}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""End-to-end throughput benchmark against the local fixture-site corpus.
+
+    uv run python -m benchmarks.throughput --sites 100 --concurrency 8
+    uv run python -m benchmarks.throughput --save baseline.json
+    uv run python -m benchmarks.throughput --baseline baseline.json --max-regression 0.15
+
+Starts ``benchmarks.fixture_sites`` on a random local port and drives every
+stage over the same corpus with ``--concurrency`` prospects in flight:
+
+* ``analyzer`` – ``analyze_website`` (``SiteAnalyzer`` with default weights);
+* ``contacts`` – ``fetch_contact_info`` (the body of ``extract_contact_info``);
+* ``workflow`` – ``db_workflow._collect_prospect``, i.e. the analyze job's
+  per-prospect unit (analysis and contacts together) without the DB write.
+
+LLM calls are patched offline and no request leaves the host. The report
+lists prospects per minute, p50/p95/p99 latency and errors per stage, and the
+peak RSS of this process plus its children (the browser). With
+``--baseline`` the run fails (exit code 1) when throughput drops or p95
+latency rises by more than ``--max-regression`` against the saved results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks import percentile
+from benchmarks.fixture_sites import FixtureCorpus, start_fixture_server
+from supervisor import tree_rss_mb
+
+STAGES = ("analyzer", "contacts", "workflow")
+RSS_SAMPLE_INTERVAL = 0.2
+
+
+def _stage_call(stage: str) -> Callable[[str], Awaitable[Any]]:
+    if stage == "analyzer":
+        from workflows.website_prospector.tools.analyze_site import analyze_website
+
+        return analyze_website
+    if stage == "contacts":
+        from workflows.website_prospector.tools.contact import fetch_contact_info
+
+        return fetch_contact_info
+    if stage == "workflow":
+        from db_workflow import _collect_prospect
+
+        async def _workflow(url: str) -> Any:
+            row, ok = await _collect_prospect(url, "fixture benchmark")
+            if not ok:
+                raise RuntimeError("analysis failed")
+            return row
+
+        return _workflow
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+async def run_stage(stage: str, urls: List[str], concurrency: int) -> Dict[str, Any]:
+    call = _stage_call(stage)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def _one(url: str) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(url)
+            except Exception:  # noqa: BLE001 – counted, the benchmark goes on
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_one(url) for url in urls))
+    elapsed = time.perf_counter() - start
+    return {
+        "prospects": len(urls),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "per_minute": round(len(latencies) / elapsed * 60, 2) if elapsed else 0.0,
+        "p50": round(percentile(latencies, 50), 4),
+        "p95": round(percentile(latencies, 95), 4),
+        "p99": round(percentile(latencies, 99), 4),
+    }
+
+
+async def _sample_rss(peak: Dict[str, float], stop: asyncio.Event) -> None:
+    pid = os.getpid()
+    while not stop.is_set():
+        peak["mb"] = max(peak["mb"], tree_rss_mb(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=RSS_SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_benchmark(corpus: FixtureCorpus, stages: List[str], concurrency: int) -> Dict[str, Any]:
+    from agentic_core.browser_pool import close_browser_pool
+    from agentic_core.offline import apply_offline_patches
+
+    apply_offline_patches()
+    runner, base_url = await start_fixture_server(corpus)
+    peak = {"mb": 0.0}
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(peak, stop))
+    results: Dict[str, Any] = {}
+    try:
+        urls = corpus.urls(base_url)
+        for stage in stages:
+            results[stage] = await run_stage(stage, urls, concurrency)
+            print(
+                f"{stage:<10} {results[stage]['per_minute']:8.1f}/min  "
+                f"p50 {results[stage]['p50'] * 1000:7.0f} ms  p95 {results[stage]['p95'] * 1000:7.0f} ms  "
+                f"p99 {results[stage]['p99'] * 1000:7.0f} ms  errors {results[stage]['errors']}"
+            )
+    finally:
+        stop.set()
+        await sampler
+        await close_browser_pool()
+        await runner.cleanup()
+    return {
+        "corpus": vars(corpus),
+        "concurrency": concurrency,
+        "peak_rss_mb": round(peak["mb"], 1),
+        "stages": results,
+    }
+
+
+def regressions(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Stages whose throughput fell or p95 rose by more than ``max_regression``."""
+    found: List[str] = []
+    for stage, base in baseline.get("stages", {}).items():
+        now = current["stages"].get(stage)
+        if now is None:
+            continue
+        if base["per_minute"] and now["per_minute"] < base["per_minute"] * (1 - max_regression):
+            found.append(f"{stage}: {now['per_minute']:.1f}/min vs baseline {base['per_minute']:.1f}/min")
+        if base["p95"] and now["p95"] > base["p95"] * (1 + max_regression):
+            found.append(f"{stage}: p95 {now['p95'] * 1000:.0f} ms vs baseline {base['p95'] * 1000:.0f} ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prospects-per-minute benchmark on fixture sites")
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size-kb", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--scripts", type=int, default=5)
+    parser.add_argument("--forms", type=int, default=1)
+    parser.add_argument("--contact-density", type=float, default=0.7)
+    parser.add_argument("--save", type=Path, default=None, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against saved results")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stage(s): {', '.join(unknown)}")
+
+    corpus = FixtureCorpus(
+        args.sites,
+        seed=args.seed,
+        size_kb=args.size_kb,
+        latency_ms=args.latency_ms,
+        scripts=args.scripts,
+        forms=args.forms,
+        contact_density=args.contact_density,
+    )
+    results = asyncio.run(run_benchmark(corpus, stages, args.concurrency))
+    print(f"peak RSS   {results['peak_rss_mb']:8.1f} MB")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+    if args.baseline:
+        found = regressions(results, json.loads(args.baseline.read_text()), args.max_regression)
+        for line in found:
+            print(f"✗ regression – {line}")
+        sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
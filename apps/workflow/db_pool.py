@@ -0,0 +1,222 @@
+"""Process-wide asyncpg connection pool for the workflow worker.
+
+All database I/O (``supabase_io`` helpers and the pgmq queue calls) goes
+through one pool per event loop, so inserts and updates never block the loop
+and overlap with browser work:
+
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(...)
+
+Configuration (env):
+
+* ``DATABASE_URL``            – direct Postgres DSN (required);
+* ``DB_POOL_MIN_SIZE``        – connections kept open (default 1);
+* ``DB_POOL_MAX_SIZE``        – upper bound per process (default 10);
+* ``DB_STATEMENT_TIMEOUT_MS`` – server-side ``statement_timeout`` (default 15000);
+* ``DB_STATEMENT_CACHE_SIZE`` – prepared statement cache; set ``0`` behind a
+  transaction-mode pooler (Supavisor on port 6543).
+
+``json``/``jsonb`` values are encoded and decoded with the ``json`` module.
+
+``LISTEN`` needs a session of its own (and a direct connection – the
+transaction-mode pooler drops notifications), so it cannot borrow a pooled
+connection. ``get_notify_listener()`` returns the one ``NotifyListener`` of
+the process: a single dedicated connection that LISTENs on every subscribed
+channel and dispatches each notification to that channel's handlers:
+
+    listener = await get_notify_listener()
+    await listener.listen("worker_jobs", lambda payload: wake.set())
+
+Call ``close_db_pool()`` on shutdown; it closes the listener as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+
+if TYPE_CHECKING:  # asyncpg is imported when the first pool is created
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+
+async def _init_connection(conn: Any) -> None:
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def create_db_pool(
+    dsn: Optional[str] = None,
+    *,
+    min_size: int = DB_POOL_MIN_SIZE,
+    max_size: int = DB_POOL_MAX_SIZE,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+    statement_cache_size: int = DB_STATEMENT_CACHE_SIZE,
+) -> asyncpg.Pool:
+    import asyncpg
+
+    dsn = dsn or os.getenv("DATABASE_URL")
+    if not dsn:
+        raise RuntimeError("DATABASE_URL not configured in environment variables")
+    pool = await asyncpg.create_pool(
+        dsn,
+        min_size=min_size,
+        max_size=max_size,
+        statement_cache_size=statement_cache_size,
+        # Client-side guard a little above the server-side timeout
+        command_timeout=statement_timeout_ms / 1000 + 5,
+        server_settings={"statement_timeout": str(statement_timeout_ms)},
+        init=_init_connection,
+    )
+    logger.info("db_pool_started", extra={"min_size": min_size, "max_size": max_size})
+    return pool
+
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+async def get_db_pool() -> asyncpg.Pool:
+    """Process-wide pool bound to the running event loop (created lazily)."""
+    global _pool, _pool_loop, _pool_lock
+
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool_loop is loop:
+        return _pool
+    if _pool_lock is None or _pool_loop is not loop:
+        # A pool (or lock) created under another loop cannot be reused
+        _pool, _pool_loop, _pool_lock = None, loop, asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await create_db_pool()
+    return _pool
+
+
+async def close_db_pool() -> None:
+    global _pool, _pool_loop, _pool_lock, _listener, _listener_loop
+
+    if _listener is not None:
+        await _listener.close()
+    _listener, _listener_loop = None, None
+    if _pool is not None:
+        await _pool.close()
+    _pool, _pool_loop, _pool_lock = None, None, None
+
+
+# ---------------------------------------------------------------------------
+# LISTEN/NOTIFY
+# ---------------------------------------------------------------------------
+
+NotifyHandler = Callable[[str], None]
+
+
+class NotifyListener:
+    """One dedicated ``LISTEN`` connection shared by every channel subscriber.
+
+    Handlers get the notification payload and run on the event loop, so they
+    must not block. If the connection drops, ``connected`` turns false until
+    the next ``connect()`` – subscribers call it when they next need to wait –
+    re-opens it and re-LISTENs on every channel.
+    """
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.dsn = dsn or os.getenv("DATABASE_URL")
+        self._conn: Any = None
+        self._channels: Set[str] = set()  # LISTENed on the current connection
+        self._handlers: Dict[str, List[NotifyHandler]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def listen(self, channel: str, handler: NotifyHandler) -> bool:
+        """Subscribe ``handler`` to ``channel``; ``False`` while the database is unreachable."""
+        self._handlers.setdefault(channel, []).append(handler)
+        return await self.connect()
+
+    async def unlisten(self, channel: str, handler: NotifyHandler) -> None:
+        handlers = self._handlers.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if handlers:
+            return
+        self._handlers.pop(channel, None)
+        async with self._lock:
+            if channel in self._channels and self.connected:
+                try:
+                    await self._conn.remove_listener(channel, self._dispatch)
+                except Exception:  # noqa: BLE001 – connection may already be gone
+                    logger.debug("notify_unlisten_failed", exc_info=True)
+            self._channels.discard(channel)
+
+    async def connect(self) -> bool:
+        """(Re)open the connection and LISTEN on every subscribed channel."""
+        async with self._lock:
+            try:
+                if not self.connected:
+                    import asyncpg
+
+                    if not self.dsn:
+                        raise RuntimeError("DATABASE_URL not configured in environment variables")
+                    self._conn, self._channels = await asyncpg.connect(self.dsn), set()
+                    self._conn.add_termination_listener(self._on_terminated)
+                for channel in self._handlers.keys() - self._channels:
+                    await self._conn.add_listener(channel, self._dispatch)
+                    self._channels.add(channel)
+            except Exception as exc:  # noqa: BLE001 – subscribers fall back to timeouts
+                logger.warning("notify_listen_failed", extra={"error": str(exc)})
+                await self._drop()
+                return False
+        return True
+
+    def _dispatch(self, _conn: Any, _pid: int, channel: str, payload: str) -> None:
+        for handler in list(self._handlers.get(channel, ())):
+            try:
+                handler(payload)
+            except Exception:  # noqa: BLE001 – one bad handler must not starve the rest
+                logger.exception("notify_handler_failed", extra={"channel": channel})
+
+    def _on_terminated(self, conn: Any) -> None:
+        if conn is self._conn:
+            logger.warning("notify_connection_lost", extra={"channels": sorted(self._channels)})
+            self._conn, self._channels = None, set()
+
+    async def _drop(self) -> None:
+        conn, self._conn, self._channels = self._conn, None, set()
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close()
+            except Exception:  # noqa: BLE001 – connection may already be gone
+                logger.debug("notify_connection_close_failed", exc_info=True)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._drop()
+        self._handlers.clear()
+
+
+_listener: Optional[NotifyListener] = None
+_listener_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_notify_listener() -> NotifyListener:
+    """Process-wide listener bound to the running event loop (connected lazily)."""
+    global _listener, _listener_loop
+
+    loop = asyncio.get_running_loop()
+    if _listener is None or _listener_loop is not loop:
+        # A connection opened under another loop cannot be reused
+        _listener, _listener_loop = NotifyListener(), loop
+    return _listener
@@ -3,29 +3,49 @@ straight into Supabase tables.
 
 This bypasses the Agents orchestration and calls the existing tool functions
 programmatically so we have structured data for each step.
+
+A run is split in two job kinds so one slow site cannot hold a whole run:
+
+* ``run``     – search for prospects, then fan out one ``analyze`` sub-job
+  per batch of ``FANOUT_BATCH_SIZE`` URLs (``fan_out_run`` records the
+  sub-jobs and enqueues them in one transaction);
+* ``analyze`` – analyse a batch, then persist all its rows and settle the
+  sub-job in one ``persist_prospect_batch`` round trip. The last batch to
+  settle marks the run completed (fan-in in ``settle_sub_job``).
+
+Deadlines work as in ``BaseWorkflow``: ``step_timeouts`` caps the ``search``,
+``analysis`` and ``contacts`` steps, and ``run_timeout`` becomes an absolute
+``deadline`` carried by every ``analyze`` sub-job. A prospect whose step runs
+out of budget is persisted without that result; batches picked up after the
+deadline settle without analysing anything.
 """
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
+import time
 from datetime import datetime
 from typing import Dict, Any
 
-from website_prospector.config.audience_configs import AUDIENCE_CONFIGS
-from website_prospector.models.types import Prospect
-
-from supabase_io import supabase
-from main import (
-    search_prospects_for_audience,
-    analyze_prospect_website,
-    extract_contact_info,
+from agentic_core.orchestrator import StepTimeoutError, step_budget, within_budget
+from agentic_core.spans import span
+from supabase_io import (
+    PermanentJobError,
+    complete_workflow_run,
+    current_queue,
+    fan_out_run,
+    persist_prospect_batch,
+    start_workflow_run,
 )
+from workflows.website_prospector.config.audience_registry import get_audience
+from workflows.website_prospector.tools.analyze_site import analyze_website
+from workflows.website_prospector.tools.contact import fetch_contact_info
+from workflows.website_prospector.tools.search import search_prospects
 
+logger = logging.getLogger(__name__)
 
-def _insert(table: str, payload: Dict[str, Any]):
-    resp = supabase.table(table).insert(payload).execute()
-    if getattr(resp, "error", None):
-        raise RuntimeError(resp.error)
-    return resp.data[0]
+FANOUT_BATCH_SIZE = int(os.getenv("FANOUT_BATCH_SIZE", "1"))
 
 
 async def run_workflow_to_db(
@@ -34,70 +54,120 @@ async def run_workflow_to_db(
     audience_name: str,
     location: str,
     max_prospects: int = 5,
-):
-    if audience_name not in AUDIENCE_CONFIGS:
-        raise ValueError(f"Unknown audience: {audience_name}")
+    batch_size: int = FANOUT_BATCH_SIZE,
+    tenant_id: str | None = None,
+    run_timeout: float | None = None,
+    step_timeouts: Dict[str, float] | None = None,
+) -> int:
+    """Search and fan out ``analyze`` sub-jobs; returns the number enqueued."""
+    if await get_audience(audience_name) is None:
+        raise PermanentJobError(f"Unknown audience: {audience_name}")
+
+    # Wall clock – the deadline travels to other workers with the sub-jobs
+    deadline = time.time() + run_timeout if run_timeout else None
 
     # Update run status → running
-    supabase.table("workflow_runs").update({"status": "running", "started_at": datetime.utcnow().isoformat()}).eq("id", run_id).execute()
+    await start_workflow_run(run_id)
 
     # 1. Search prospects
-    search_result = await search_prospects_for_audience(audience_name, location)
-
-    for prospect in search_result.prospects[:max_prospects]:
-        # Insert prospect row
-        prospect_row = _insert(
-            "prospects",
-            {
-                "workflow_run_id": run_id,
-                "url": str(prospect.url),
-                "source_query": search_result.search_query,
-                "created_at": datetime.utcnow().isoformat(),
-            },
+    search_result = await within_budget(
+        "search",
+        search_prospects(audience_name, location),
+        step_budget("search", step_timeouts, run_timeout),
+    )
+    # One prospect row per URL and run (unique constraint) – drop duplicate hits
+    urls = list(dict.fromkeys(str(p.url) for p in search_result.prospects))[:max_prospects]
+
+    if not urls:
+        await complete_workflow_run(run_id)
+        return 0
+
+    # 2. Fan out – idempotent, so a redelivered run message enqueues nothing.
+    # Sub-jobs go to the lane the run came from and carry the fair-share key
+    # fields (``queue_lanes.FairShare.key``) so the per-prospect work is capped too.
+    size = max(1, batch_size)
+    batches = [urls[i : i + size] for i in range(0, len(urls), size)]
+    fields: Dict[str, Any] = {"audience_name": audience_name}
+    if tenant_id:
+        fields["tenant_id"] = tenant_id
+    if deadline is not None:
+        fields["deadline"] = deadline
+    return await fan_out_run(run_id, batches, search_result.search_query, current_queue.get(), fields)
+
+
+def _remaining(deadline: float | None) -> float | None:
+    return None if deadline is None else max(0.0, deadline - time.time())
+
+
+def _log_failure(event: str, url: str, exc: BaseException) -> None:
+    if isinstance(exc, StepTimeoutError):
+        logger.warning("step_timed_out", extra={"url": url, "step": str(exc)})
+    else:
+        logger.warning(event, extra={"url": url, "error": str(exc)})
+
+
+async def _collect_prospect(
+    url: str,
+    source_query: str | None,
+    deadline: float | None = None,
+    step_timeouts: Dict[str, float] | None = None,
+) -> tuple[Dict[str, Any], bool]:
+    """Analyse ``url`` and build its ``persist_prospect_batch`` row.
+
+    Returns the row and whether the analysis succeeded. A failed or timed-out
+    contact extraction only loses the contacts.
+    """
+    # Analysis and contact extraction are independent – run them together
+    with span("item", cat="item", url=url):
+        remaining = _remaining(deadline)
+        analysis_result, contact_info = await asyncio.gather(
+            within_budget("analysis", analyze_website(url), step_budget("analysis", step_timeouts, remaining)),
+            within_budget("contacts", fetch_contact_info(url), step_budget("contacts", step_timeouts, remaining)),
+            return_exceptions=True,
         )
-        prospect_id = prospect_row["id"] if isinstance(prospect_row, dict) else prospect_row[0]["id"]
-
-        # 2. Analyze website
-        analysis_result = await analyze_prospect_website(str(prospect.url))
-        _insert(
-            "site_analyses",
-            {
-                "prospect_id": prospect_id,
-                "scores_json": analysis_result.analysis.model_dump(),
-                "tech_issues_json": analysis_result.analysis.technical_issues,
-                "analyzed_at": datetime.utcnow().isoformat(),
-            },
+    row: Dict[str, Any] = {"url": url, "source_query": source_query, "analysis": None, "contacts": []}
+
+    if isinstance(analysis_result, BaseException):
+        _log_failure("analysis_failed", url, analysis_result)
+    else:
+        row["analysis"] = {
+            "scores_json": analysis_result.analysis.model_dump(mode="json"),
+            "tech_issues_json": analysis_result.analysis.technical_issues,
+            "analyzed_at": datetime.utcnow().isoformat(),
+        }
+
+    if isinstance(contact_info, BaseException):
+        _log_failure("contact_extraction_failed", url, contact_info)
+    else:
+        row["contacts"] = (
+            [{"type": "email", "value": v} for v in contact_info.emails]
+            + [{"type": "phone", "value": v} for v in contact_info.phones]
+            + [{"type": "social", "value": v} for v in contact_info.social_links]
         )
 
-        # 3. Extract contacts
-        contact_info = await extract_contact_info(str(prospect.url))
-        for email in contact_info.emails:
-            _insert(
-                "contacts",
-                {
-                    "prospect_id": prospect_id,
-                    "type": "email",
-                    "value": email,
-                },
-            )
-        for phone in contact_info.phones:
-            _insert(
-                "contacts",
-                {
-                    "prospect_id": prospect_id,
-                    "type": "phone",
-                    "value": phone,
-                },
-            )
-        for link in contact_info.social_links:
-            _insert(
-                "contacts",
-                {
-                    "prospect_id": prospect_id,
-                    "type": "social",
-                    "value": link,
-                },
-            )
-
-    # Mark run completed
-    supabase.table("workflow_runs").update({"status": "completed", "finished_at": datetime.utcnow().isoformat()}).eq("id", run_id).execute() 
\ No newline at end of file
+    return row, row["analysis"] is not None
+
+
+async def analyze_batch_to_db(
+    *,
+    run_id: str,
+    batch_index: int,
+    urls: list[str],
+    source_query: str | None = None,
+    deadline: float | None = None,
+    step_timeouts: Dict[str, float] | None = None,
+) -> str:
+    """Analyse one fanned-out batch, persist and settle it; returns the run status.
+
+    All rows of the batch are written and the sub-job settled by a single
+    ``persist_prospect_batch`` call. ``deadline`` is the run's absolute
+    deadline (``time.time()`` seconds) from the sub-job payload.
+    """
+    collected = await asyncio.gather(
+        *(_collect_prospect(url, source_query, deadline, step_timeouts) for url in urls)
+    )
+    rows = [row for row, _ in collected]
+    failed = not any(ok for _, ok in collected)
+
+    result = await persist_prospect_batch(run_id, rows, batch_index, failed)
+    return str(result.get("status"))
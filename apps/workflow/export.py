@@ -0,0 +1,246 @@
+"""Stream run results out of Postgres as CSV, NDJSON or Parquet.
+
+Usage:
+
+    uv run python export.py --run-id <uuid> -o prospects.csv
+    uv run python export.py --audience local_business -o prospects.parquet \\
+        --columns run_id,url,overall_score,emails
+
+One flattened row per prospect: run and audience, the latest site analysis
+(scores, issues) and the prospect's contacts aggregated per type. Rows are
+streamed in constant memory – CSV via ``COPY … TO STDOUT``, NDJSON and
+Parquet via a server-side cursor read in ``--chunk-size`` batches – with the
+statement timeout lifted for the export transaction, so exports of hundreds
+of thousands of prospects neither time out nor load everything into RAM.
+
+Parquet needs the optional ``pyarrow`` package.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+from uuid import UUID
+
+from db_pool import close_db_pool, get_db_pool
+
+FORMATS = ("csv", "ndjson", "parquet")
+COPY_TIMEOUT = 6 * 3600.0
+_SUFFIX_FORMATS = {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson", "parquet": "parquet", "pq": "parquet"}
+
+# Exportable column -> SQL expression over the aliases in _FROM_SQL
+COLUMNS: Dict[str, str] = {
+    "run_id": "r.id",
+    "audience": "a.name",
+    "location": "r.location",
+    "run_status": "r.status",
+    "prospect_id": "p.id",
+    "url": "p.url",
+    "source_query": "p.source_query",
+    "prospect_created_at": "p.created_at",
+    "analyzed_at": "sa.analyzed_at",
+    "overall_score": "(sa.scores_json ->> 'overall_score')::float8",
+    "outdated_score": "(sa.scores_json ->> 'outdated_score')::float8",
+    "mobile_score": "(sa.scores_json ->> 'mobile_score')::float8",
+    "performance_score": "(sa.scores_json ->> 'performance_score')::float8",
+    "seo_score": "(sa.scores_json ->> 'seo_score')::float8",
+    "security_score": "(sa.scores_json ->> 'security_score')::float8",
+    "technical_issues": "sa.tech_issues_json::text",
+    "scores_json": "sa.scores_json::text",
+    "emails": "c.emails",
+    "phones": "c.phones",
+    "social_links": "c.social_links",
+}
+
+# Parquet schema per column (everything else is a string)
+_FLOAT_COLUMNS = {name for name, expr in COLUMNS.items() if expr.endswith("::float8")}
+_TIMESTAMP_COLUMNS = {"prospect_created_at", "analyzed_at"}
+
+_FROM_SQL = """
+from prospects p
+join workflow_runs r on r.id = p.workflow_run_id
+left join audiences a on a.id = r.audience_id
+left join lateral (
+    select s.scores_json, s.tech_issues_json, s.analyzed_at
+      from site_analyses s
+     where s.prospect_id = p.id
+     order by s.analyzed_at desc nulls last
+     limit 1
+) sa on true
+left join lateral (
+    select string_agg(ct.value, '; ') filter (where ct.type = 'email') as emails,
+           string_agg(ct.value, '; ') filter (where ct.type = 'phone') as phones,
+           string_agg(ct.value, '; ') filter (where ct.type = 'social') as social_links
+      from contacts ct
+     where ct.prospect_id = p.id
+) c on true
+"""
+
+
+def build_query(columns: List[str], *, run_id: Optional[str], audience: Optional[str]) -> Tuple[str, List[Any]]:
+    """SQL and arguments for the flattened export of a run or an audience."""
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+    if bool(run_id) == bool(audience):
+        raise ValueError("Pass exactly one of run_id or audience")
+
+    select = ",\n       ".join(f"{COLUMNS[c]} as {c}" for c in columns)
+    where, args = ("p.workflow_run_id = $1", [run_id]) if run_id else ("a.name = $1", [audience])
+    return f"select {select}\n{_FROM_SQL}where {where}\norder by r.created_at, p.created_at, p.id", args
+
+
+def _inline(query: str, args: List[Any]) -> str:
+    # COPY does not take bind parameters – quote the single text argument
+    return query.replace("$1", "'" + str(args[0]).replace("'", "''") + "'")
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+
+async def _export_csv(conn: Any, query: str, args: List[Any], output: Any) -> int:
+    # The pool's command_timeout would otherwise cap the whole COPY
+    status = await conn.copy_from_query(
+        _inline(query, args), output=output, format="csv", header=True, timeout=COPY_TIMEOUT
+    )
+    # status is "COPY <n>"
+    return int(str(status).split()[-1])
+
+
+async def _stream(conn: Any, query: str, args: List[Any], chunk_size: int):
+    cursor = await conn.cursor(query, *args, prefetch=chunk_size)
+    while True:
+        rows = await cursor.fetch(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+async def _export_ndjson(conn: Any, query: str, args: List[Any], out: TextIO, chunk_size: int) -> int:
+    count = 0
+    async for rows in _stream(conn, query, args, chunk_size):
+        out.writelines(
+            json.dumps({k: _jsonable(v) for k, v in row.items()}, ensure_ascii=False) + "\n" for row in rows
+        )
+        count += len(rows)
+    return count
+
+
+async def _export_parquet(conn: Any, query: str, args: List[Any], path: Path, columns: List[str], chunk_size: int) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover – optional dependency
+        raise SystemExit("Parquet export needs pyarrow: uv pip install pyarrow") from exc
+
+    def _type(column: str) -> Any:
+        if column in _FLOAT_COLUMNS:
+            return pa.float64()
+        if column in _TIMESTAMP_COLUMNS:
+            return pa.timestamp("us")
+        return pa.string()
+
+    schema = pa.schema([(c, _type(c)) for c in columns])
+    count = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        async for rows in _stream(conn, query, args, chunk_size):
+            data = {
+                c: [
+                    row[c] if c in _FLOAT_COLUMNS or c in _TIMESTAMP_COLUMNS or row[c] is None else str(row[c])
+                    for row in rows
+                ]
+                for c in columns
+            }
+            writer.write_table(pa.table(data, schema=schema))
+            count += len(rows)
+    return count
+
+
+async def export(
+    *,
+    fmt: str,
+    output: Optional[Path],
+    columns: List[str],
+    run_id: Optional[str] = None,
+    audience: Optional[str] = None,
+    chunk_size: int = 5000,
+) -> int:
+    """Stream the export to ``output`` (stdout when ``None``); returns the row count."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if fmt == "parquet" and output is None:
+        raise ValueError("Parquet export needs an output file")
+    query, args = build_query(columns, run_id=run_id, audience=audience)
+
+    pool = await get_db_pool()
+    async with pool.acquire() as conn, conn.transaction(readonly=True):
+        # Long exports must not hit the pool's statement timeout
+        await conn.execute("set local statement_timeout = 0")
+        if fmt == "parquet":
+            assert output is not None
+            return await _export_parquet(conn, query, args, output, columns, chunk_size)
+        if fmt == "csv":
+            if output is None:
+                return await _export_csv(conn, query, args, sys.stdout.buffer)
+            return await _export_csv(conn, query, args, str(output))
+        if output is None:
+            return await _export_ndjson(conn, query, args, sys.stdout, chunk_size)
+        with output.open("w", encoding="utf-8") as out:
+            return await _export_ndjson(conn, query, args, out, chunk_size)
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description="Export prospect results")
+    scope = parser.add_mutually_exclusive_group(required=True)
+    scope.add_argument("--run-id", help="Export a single workflow run")
+    scope.add_argument("--audience", help="Export every run of an audience")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Defaults to the output file extension")
+    parser.add_argument(
+        "--columns",
+        default=",".join(COLUMNS),
+        help=f"Comma-separated subset of: {', '.join(COLUMNS)}",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows fetched per cursor round trip")
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None:
+        suffix = args.output.suffix.lstrip(".").lower() if args.output else ""
+        fmt = _SUFFIX_FORMATS.get(suffix, "csv")
+    columns = [c.strip() for c in args.columns.split(",") if c.strip()]
+
+    try:
+        count = await export(
+            fmt=fmt,
+            output=args.output,
+            columns=columns,
+            run_id=args.run_id,
+            audience=args.audience,
+            chunk_size=args.chunk_size,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        await close_db_pool()
+    print(f"Exported {count} prospect(s) as {fmt}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,182 @@
+"""Priority lanes and fair-share limits for ``JobConsumer``.
+
+Jobs are spread over several pgmq queues ("lanes"), e.g.::
+
+    worker_jobs_interactive   runs requested from the dashboard
+    worker_jobs               default lane
+    worker_jobs_bulk          backfills
+
+Each read round the consumer splits its free capacity over the lanes by
+weight (smooth weighted round-robin, heaviest lane first). Capacity a lane
+leaves unused rolls over to the next lane, so an idle interactive lane costs
+the backfill nothing. A lane may also be capped (``max_in_flight``) so a
+backfill never occupies every slot and interactive jobs start as soon as they
+are enqueued.
+
+``FairShare`` caps concurrent jobs per key (tenant, else audience) within one
+consumer. ``run`` messages carry ``tenant_id``/``audience_name`` and
+``fan_out_run`` copies them into every ``analyze`` sub-job. A job over the
+cap is not run: it stays in its queue, invisible for a short delay that grows
+with the key's backlog (running plus already deferred jobs), so one large
+tenant cannot monopolise a worker.
+
+Lane spec (``WORKER_LANES``): comma-separated ``name:weight[:max_in_flight]``;
+``default`` maps to ``worker_jobs``, any other name to ``worker_jobs_<name>``.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_QUEUE = "worker_jobs"
+DEFAULT_LANES = "interactive:8,default:3,bulk:1"
+
+
+class Lane:
+    """One pgmq queue with a scheduling weight and optional concurrency cap."""
+
+    def __init__(self, name: str, weight: int = 1, max_in_flight: Optional[int] = None, queue: Optional[str] = None):
+        if weight < 1:
+            raise ValueError(f"Lane {name!r} needs a positive weight")
+        self.name = name
+        self.weight = weight
+        self.max_in_flight = max_in_flight
+        self.queue = queue or (BASE_QUEUE if name == "default" else f"{BASE_QUEUE}_{name}")
+
+    def __repr__(self) -> str:  # pragma: no cover – debugging aid
+        return f"Lane({self.name!r}, weight={self.weight}, max_in_flight={self.max_in_flight}, queue={self.queue!r})"
+
+
+def parse_lanes(spec: str) -> List[Lane]:
+    """Parse ``name:weight[:max_in_flight]`` entries, heaviest lane first."""
+    lanes: List[Lane] = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rest = entry.partition(":")
+        weight, _, cap = rest.partition(":")
+        lanes.append(Lane(name, int(weight or 1), int(cap) if cap else None))
+    if not lanes:
+        raise ValueError("At least one lane is required")
+    return sorted(lanes, key=lambda lane: lane.weight, reverse=True)
+
+
+def lanes_from_env() -> List[Lane]:
+    return parse_lanes(os.getenv("WORKER_LANES", DEFAULT_LANES))
+
+
+def plan_reads(
+    lanes: List[Lane], free: int, in_flight: Dict[str, int], credit: Optional[Dict[str, int]] = None
+) -> Dict[str, int]:
+    """Split ``free`` slots over ``lanes`` by weight, respecting lane caps.
+
+    Smooth weighted round-robin: each slot goes to the eligible lane with the
+    highest accumulated credit, so with weights 8/3/1 and 4 free slots the
+    split is 3/1/0. Pass the same ``credit`` dict on every call: most rounds
+    only have one free slot, and without carried-over credit the heaviest
+    lane would win every one of them (strict priority instead of 8:3:1).
+    """
+    plan = {lane.name: 0 for lane in lanes}
+    if credit is None:
+        credit = {}
+    for _ in range(free):
+        eligible = [
+            lane
+            for lane in lanes
+            if lane.max_in_flight is None or in_flight.get(lane.name, 0) + plan[lane.name] < lane.max_in_flight
+        ]
+        if not eligible:
+            break
+        total = sum(lane.weight for lane in eligible)
+        for lane in eligible:
+            credit[lane.name] = credit.get(lane.name, 0) + lane.weight
+        chosen = max(eligible, key=lambda lane: credit[lane.name])
+        credit[chosen.name] -= total
+        plan[chosen.name] += 1
+    return plan
+
+
+def lane_headroom(lane: Lane, in_flight: Dict[str, int], wanted: int) -> int:
+    """How many of ``wanted`` extra jobs ``lane`` may still take."""
+    if lane.max_in_flight is None:
+        return wanted
+    return max(0, min(wanted, lane.max_in_flight - in_flight.get(lane.name, 0)))
+
+
+class FairShare:
+    """Per-key concurrency cap (``None`` disables it).
+
+    Over-cap messages seen by this consumer queue up per key: each gets a
+    ticket on its first deferral and keeps it when it comes back, so
+    ``defer_delay`` hides it for about as long as the jobs ahead of it take.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self._running: Counter[str] = Counter()
+        # Next ticket to hand out per key
+        self._tickets: Counter[str] = Counter()
+        # msg_id -> (key, ticket, due) of messages deferred here
+        self._deferred: Dict[int, Tuple[str, int, float]] = {}
+        # Moving average of job duration per key
+        self._durations: Dict[str, float] = {}
+
+    @staticmethod
+    def key(payload: Dict[str, Any]) -> Optional[str]:
+        tenant = payload.get("tenant_id")
+        if tenant:
+            return f"tenant:{tenant}"
+        audience = payload.get("audience_name")
+        return f"audience:{audience}" if audience else None
+
+    def try_acquire(self, key: Optional[str]) -> bool:
+        if key is None or self.limit is None:
+            return True
+        if self._running[key] >= self.limit:
+            return False
+        self._running[key] += 1
+        return True
+
+    def release(self, key: Optional[str], duration: Optional[float] = None) -> None:
+        if key is None or self.limit is None:
+            return
+        self._running[key] -= 1
+        if self._running[key] <= 0:
+            del self._running[key]
+        if duration is not None:
+            previous = self._durations.get(key)
+            self._durations[key] = duration if previous is None else previous + 0.2 * (duration - previous)
+
+    def defer_delay(self, key: str, msg_id: int, base: float, maximum: float) -> float:
+        """Seconds to hide over-cap ``msg_id`` – about when its turn comes.
+
+        Every running job of ``key`` and every deferred one ahead of this
+        message costs one job duration (moving average, ``base`` until known)
+        per ``limit`` slots.
+        """
+        now = time.monotonic()
+        entry = self._deferred.get(msg_id)
+        if entry is None or entry[0] != key:
+            if len(self._deferred) > 1024:
+                # Drop messages another consumer has picked up since
+                self._deferred = {m: e for m, e in self._deferred.items() if e[2] + maximum > now}
+            ticket = self._tickets[key]
+            self._tickets[key] = ticket + 1
+        else:
+            ticket = entry[1]
+        ahead = sum(1 for k, t, due in self._deferred.values() if k == key and t < ticket and due + maximum > now)
+        per_job = self._durations.get(key, base)
+        delay = min(maximum, per_job * (self._running[key] + ahead) / (self.limit or 1))
+        self._deferred[msg_id] = (key, ticket, now + delay)
+        return delay
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next message deferred here becomes visible again."""
+        now = time.monotonic()
+        pending = [due - now for _, _, due in self._deferred.values() if due > now]
+        return min(pending) if pending else None
+
+    def forget(self, msg_id: int) -> None:
+        """``msg_id`` is running or gone – drop its ticket."""
+        self._deferred.pop(msg_id, None)
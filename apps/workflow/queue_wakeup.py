@@ -0,0 +1,140 @@
+"""Wake-up transports that tell an idle ``JobConsumer`` new jobs were enqueued.
+
+Instead of polling ``worker_jobs`` every couple of seconds, an idle consumer
+waits on a transport with an exponentially growing timeout:
+
+* ``PostgresNotifyWakeup`` – ``LISTEN worker_jobs`` on the process-wide
+  notify connection (``db_pool.get_notify_listener``, ``DATABASE_URL``); an
+  insert trigger on the queue table sends a ``NOTIFY`` so pickup latency is
+  near zero and idle workers issue almost no queries. The wait doubles as a
+  long-poll: it returns as soon as a notification arrives or the timeout
+  expires.
+* ``PollingWakeup`` – fallback when no direct connection is configured; the
+  consumer's idle backoff alone spaces out the reads.
+* ``InMemoryWakeup`` – local stand-in, ``notify()`` it from the producer side.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Optional, Protocol
+
+from agentic_core.metrics import registry
+from db_pool import NotifyListener, get_notify_listener
+
+DEFAULT_CHANNEL = "worker_jobs"
+
+
+class WakeupTransport(Protocol):
+    async def start(self) -> None:
+        """Open connections / subscriptions."""
+
+    async def wait(self, timeout: float) -> bool:
+        """Block until woken (``True``) or ``timeout`` elapses (``False``)."""
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class IdleBackoff:
+    """Exponential idle delay, reset whenever work shows up."""
+
+    def __init__(self, initial: float = 0.5, maximum: float = 30.0, factor: float = 2.0):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self._current = initial
+
+    def next(self) -> float:
+        delay = self._current
+        self._current = min(self.maximum, self._current * self.factor)
+        return delay
+
+    def reset(self) -> None:
+        self._current = self.initial
+
+
+class PollingWakeup:
+    """No push channel – just sleep for the requested timeout."""
+
+    async def start(self) -> None:
+        return None
+
+    async def wait(self, timeout: float) -> bool:
+        await asyncio.sleep(timeout)
+        return False
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryWakeup:
+    """In-process transport for local runs and load tests."""
+
+    def __init__(self) -> None:
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        self._event.set()
+
+    async def start(self) -> None:
+        return None
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+    async def close(self) -> None:
+        return None
+
+
+class PostgresNotifyWakeup:
+    """``LISTEN``/``NOTIFY`` over the shared ``db_pool`` notify connection.
+
+    The worker's other listeners (e.g. the audience registry) use the same
+    connection, so a worker holds one listening session however many channels
+    it follows. If the connection drops, waits degrade to plain timeouts and
+    the listener reconnects on the next ``wait``.
+    """
+
+    def __init__(self, channel: str = DEFAULT_CHANNEL, listener: Optional[NotifyListener] = None):
+        self.channel = channel
+        self._listener = listener
+        self._event = asyncio.Event()
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = await get_notify_listener()
+        await self._listener.listen(self.channel, self._on_notify)
+
+    def _on_notify(self, _payload: str) -> None:
+        registry.counter("queue_wakeups_total", transport="notify").inc()
+        self._event.set()
+
+    async def wait(self, timeout: float) -> bool:
+        if self._listener is None:
+            await self.start()
+        elif not self._listener.connected:
+            await self._listener.connect()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            await self._listener.unlisten(self.channel, self._on_notify)
+
+
+def wakeup_from_env() -> WakeupTransport:
+    """``PostgresNotifyWakeup`` when ``DATABASE_URL`` is set, else polling."""
+    if os.getenv("DATABASE_URL"):
+        return PostgresNotifyWakeup(channel=os.getenv("QUEUE_NOTIFY_CHANNEL", DEFAULT_CHANNEL))
+    return PollingWakeup()
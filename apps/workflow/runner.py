@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import logging
+import os
 import uuid
 import sys
 from pathlib import Path
@@ -17,10 +19,16 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from agentic_core.browser_pool import close_browser_pool
 from agentic_core.logging import configure_logging
+from agentic_core.metrics import start_metrics_from_env
 from agentic_core.orchestrator import BaseWorkflow
+from agentic_core.spans import span, start_spans_from_env, write_spans
+from db_pool import close_db_pool
 from workflows import get_workflow_class
 
+logger = logging.getLogger(__name__)
+
 
 async def _main() -> None:
     parser = argparse.ArgumentParser(description="Run an Agentic workflow")
@@ -29,21 +37,65 @@ async def _main() -> None:
     parser.add_argument("--location", default="San Francisco")
     parser.add_argument("--max", type=int, default=5, dest="max_prospects")
     parser.add_argument("--offline", action="store_true", help="Run without hitting external LLM APIs")
+    parser.add_argument(
+        "--llm-cache",
+        choices=["off", "record", "replay", "cache"],
+        default=None,
+        help="Record/replay LLM responses (see agentic_core.llm_cache; default: LLM_CACHE_MODE or off)",
+    )
+    parser.add_argument("--run-timeout", type=float, default=None, help="Deadline budget for the whole run (seconds)")
+    parser.add_argument("--step-timeout", type=float, default=None, help="Default deadline per step (seconds)")
     args = parser.parse_args()
+    if args.offline and args.llm_cache in ("record", "cache"):
+        # Offline runs never call the model, so there is nothing to record
+        parser.error(f"--llm-cache {args.llm_cache} cannot be combined with --offline (it replays recordings)")
+    llm_cache_mode = args.llm_cache or os.getenv("LLM_CACHE_MODE", "off")
+
+    configure_logging()
+    if args.offline:
+        if llm_cache_mode in ("record", "cache"):
+            logger.warning("llm_cache_mode_ignored_offline", extra={"mode": llm_cache_mode})
+        # apply_offline_patches() installs the replay cache itself
+        llm_cache_mode = "off"
 
     if args.offline:
         from agentic_core.offline import apply_offline_patches
 
         apply_offline_patches()
+    else:
+        from agentic_core.rate_limit import install_rate_limiter
 
-    configure_logging()
+        install_rate_limiter()
+
+    # Outermost wrapper so cache hits skip the rate limiter
+    from agentic_core.llm_cache import install_llm_cache_from_env
+
+    install_llm_cache_from_env(mode=llm_cache_mode)
+
+    snapshot_writer = start_metrics_from_env()
+    start_spans_from_env()
 
     run_id = str(uuid.uuid4())
 
     WorkflowCls = get_workflow_class(args.workflow)
-    wf: BaseWorkflow = WorkflowCls(run_id=run_id, audience_name=args.audience, location=args.location, max_prospects=args.max_prospects)
+    wf: BaseWorkflow = WorkflowCls(
+        run_id=run_id,
+        audience_name=args.audience,
+        location=args.location,
+        max_prospects=args.max_prospects,
+        run_timeout=args.run_timeout,
+        step_timeouts={"default": args.step_timeout} if args.step_timeout else None,
+    )
 
-    result = await wf.run()
+    try:
+        with span("run", cat="run", run_id=run_id, workflow=args.workflow):
+            result = await wf.run()
+    finally:
+        await close_browser_pool()
+        await close_db_pool()
+        if snapshot_writer is not None:
+            snapshot_writer.stop()
+        write_spans()
     print("\n=== WORKFLOW SUMMARY ===")
     print(result)
 
@@ -2,149 +2,556 @@
 
 This module centralises all direct calls to Supabase/Postgres so the rest of the
 workflow code remains decoupled from the underlying database client.
+
+Every helper is a coroutine running on the pooled asyncpg connection from
+``db_pool`` (``DATABASE_URL``), so database I/O never blocks the event loop and
+overlaps with crawling.
 """
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
-import os
+import logging
+import signal
 import time
-from typing import Any, Dict, Optional
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from agentic_core.metrics import registry, timed
+from db_pool import get_db_pool
+from queue_lanes import FairShare, Lane, lane_headroom, plan_reads
+from queue_wakeup import IdleBackoff, WakeupTransport, wakeup_from_env
 
-from supabase import create_client, Client  # type: ignore
+logger = logging.getLogger(__name__)
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+QUEUE_NAME = "worker_jobs"
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    raise RuntimeError("Supabase credentials not configured in environment variables")
+# Queue of the job being handled in the current task – sub-jobs stay in its lane
+current_queue: ContextVar[str] = ContextVar("current_queue", default=QUEUE_NAME)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
-QUEUE_NAME = "worker_jobs"
+class PermanentJobError(ValueError):
+    """A job that can never succeed (bad payload, unknown audience, …).
+
+    Raising it from ``handle_job`` dead-letters the message immediately instead
+    of spending further attempts on it.
+    """
 
 
-def _dequeue_job(visibility_timeout: int = 300) -> Optional[Dict[str, Any]]:
-    """Pop a single job off the pgmq queue.
+async def _read_jobs(limit: int, visibility_timeout: int, queue_name: str = QUEUE_NAME) -> list[Dict[str, Any]]:
+    """Read up to ``limit`` messages in one round trip.
 
-    Returns the job payload dict if a message exists; otherwise None.
+    Messages stay in the queue, invisible for ``visibility_timeout`` seconds,
+    until they are acked (deleted) or their visibility is extended.
     """
-    # pgmq.read takes queue_name, vt, limit
-    response = supabase.schema("pgmq_public").rpc(
-        "pop",
-        {
-            "queue_name": QUEUE_NAME,
-            "vt": visibility_timeout,
-        },
-    ).execute()
-    data = response.data if hasattr(response, "data") else response
-    if data and len(data) > 0:
-        return data[0]
-    return None
-
-
-def _ack_job(msg_id: int) -> None:
+    pool = await get_db_pool()
+    rows = await pool.fetch(
+        "select msg_id, read_ct, enqueued_at, message from pgmq.read($1, $2, $3)",
+        queue_name,
+        visibility_timeout,
+        limit,
+    )
+    return [dict(row) for row in rows]
+
+
+async def _set_vt(msg_id: int, visibility_timeout: int, queue_name: str = QUEUE_NAME) -> None:
+    """Push a message's visibility ``visibility_timeout`` seconds into the future."""
+    pool = await get_db_pool()
+    await pool.execute("select from pgmq.set_vt($1, $2, $3)", queue_name, msg_id, visibility_timeout)
+
+
+async def _ack_job(msg_id: int, queue_name: str = QUEUE_NAME) -> None:
     """Delete a message from the queue after successful processing."""
-    supabase.schema("pgmq_public").rpc(
-        "delete",
-        {
-            "queue_name": QUEUE_NAME,
-            "msg_id": msg_id,
-        },
-    ).execute()
+    pool = await get_db_pool()
+    await pool.execute("select pgmq.delete($1::text, $2::bigint)", queue_name, msg_id)
+
+
+async def _dead_letter(
+    msg_id: int, payload: Dict[str, Any], error: str, read_ct: int, queue_name: str = QUEUE_NAME
+) -> None:
+    """Move a message to ``<queue>_dlq`` and fail its run (one transaction)."""
+    pool = await get_db_pool()
+    with timed("db_write", table=f"{queue_name}_dlq"):
+        await pool.execute(
+            "select public.dead_letter_job($1, $2::jsonb, $3, $4, $5)",
+            msg_id,
+            payload,
+            error,
+            read_ct,
+            queue_name,
+        )
+
+
+async def _defer_job(msg_id: int, delay: float, queue_name: str = QUEUE_NAME) -> None:
+    """Hide a message for ``delay`` seconds and refund its read (not an attempt)."""
+    pool = await get_db_pool()
+    await pool.execute("select public.defer_job($1, $2, $3)", queue_name, msg_id, delay)
+
+
+def _queue_wait_seconds(job: Dict[str, Any]) -> Optional[float]:
+    enqueued_at = job.get("enqueued_at")
+    if not enqueued_at:
+        return None
+    try:
+        enqueued = enqueued_at if isinstance(enqueued_at, datetime) else datetime.fromisoformat(str(enqueued_at))
+    except ValueError:
+        return None
+    if enqueued.tzinfo is None:
+        enqueued = enqueued.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - enqueued).total_seconds())
 
 
 class JobConsumer:
-    """A simple synchronous job consumer loop."""
+    """Asyncio job consumer running up to ``max_in_flight`` jobs concurrently.
+
+    One event loop lives for the whole process, so warm resources (browser
+    pool, HTTP clients) survive across jobs. SIGTERM/SIGINT stop pulling new
+    messages and drain in-flight jobs; a second signal cancels them.
+
+    Messages are read in batches sized to the free capacity, split over the
+    priority ``lanes`` by weight (see ``queue_lanes``). While a job runs, a
+    heartbeat extends its visibility every ``visibility_timeout / 3`` seconds
+    so long runs are never redelivered to another worker; a crashed worker's
+    messages reappear after at most ``visibility_timeout`` seconds. With
+    ``fair_share_limit`` set, jobs of a tenant/audience already running that
+    many jobs here stay invisible until roughly their turn: the key's running
+    and already deferred jobs times its average job duration
+    (``fair_share_delay`` until measured), over ``fair_share_limit``, capped
+    at ``fair_share_max_delay``. A deferral does not count as an attempt.
+
+    When the queue is empty the consumer waits on a ``wakeup`` transport
+    (LISTEN/NOTIFY by default when ``DATABASE_URL`` is set) with an idle
+    timeout that backs off exponentially from ``sleep`` to ``max_idle_sleep``.
+
+    A failed job is redelivered after ``retry_base_delay * 2**(attempt-1)``
+    seconds (capped at ``retry_max_delay``). Once pgmq's read count reaches
+    ``max_attempts`` – or immediately on ``PermanentJobError`` – the message is
+    moved to the dead-letter queue with its error and its run is marked failed.
+    Messages read more than ``max_attempts`` times without ever reporting back
+    (e.g. they crash the worker process) are dead-lettered before running.
+    """
 
-    def __init__(self, sleep: float = 2.0):
+    def __init__(
+        self,
+        sleep: float = 2.0,
+        max_in_flight: int = 4,
+        visibility_timeout: int = 60,
+        wakeup: Optional[WakeupTransport] = None,
+        max_idle_sleep: float = 30.0,
+        stop_event: Optional[Any] = None,
+        max_attempts: int = 5,
+        retry_base_delay: float = 5.0,
+        retry_max_delay: float = 600.0,
+        lanes: Optional[List[Lane]] = None,
+        fair_share_limit: Optional[int] = None,
+        fair_share_delay: float = 0.5,
+        fair_share_max_delay: float = 30.0,
+    ):
         self.sleep = sleep
-
-    def run_forever(self) -> None:
+        self.max_in_flight = max_in_flight
+        self.visibility_timeout = visibility_timeout
+        self.wakeup = wakeup or wakeup_from_env()
+        self.max_idle_sleep = max_idle_sleep
+        # Cross-process stop flag (e.g. multiprocessing.Event from the supervisor)
+        self.stop_event = stop_event
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.lanes = lanes or [Lane("default", queue=QUEUE_NAME)]
+        self.fair_share = FairShare(fair_share_limit)
+        self.fair_share_delay = fair_share_delay
+        self.fair_share_max_delay = fair_share_max_delay
+        self._in_flight_by_lane: Dict[str, int] = {lane.name: 0 for lane in self.lanes}
+        # Smooth weighted round-robin state, kept across read rounds
+        self._lane_credit: Dict[str, int] = {}
+        self._stopping: Optional[asyncio.Event] = None
+        self._capacity: Optional[asyncio.Event] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def run_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._capacity = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        in_flight = registry.gauge("worker_jobs_in_flight")
+        backoff = IdleBackoff(self.sleep, self.max_idle_sleep)
+        await self.wakeup.start()
+        watcher = asyncio.create_task(self._watch_stop_event()) if self.stop_event is not None else None
+
+        def _done(lane: Lane, t: asyncio.Task) -> None:
+            self._tasks.discard(t)
+            self._in_flight_by_lane[lane.name] -= 1
+            in_flight.dec()
+            assert self._capacity is not None
+            self._capacity.set()
+
+        try:
+            while not self._stopping.is_set():
+                free = self.max_in_flight - len(self._tasks)
+                plan = plan_reads(self.lanes, free, self._in_flight_by_lane, self._lane_credit) if free > 0 else {}
+                if not any(plan.values()):
+                    # Only pull work we (and the lane caps) have capacity for
+                    self._capacity.clear()
+                    await self._capacity.wait()
+                    continue
+
+                with timed("queue_read"):
+                    batches = await self._read_lanes(plan)
+                total = sum(len(jobs) for _, jobs in batches)
+                registry.histogram("queue_read_batch_size").observe(total)
+                if not total:
+                    # No NOTIFY when a deferred message turns visible – wake for it
+                    timeout = backoff.next()
+                    due = self.fair_share.next_due()
+                    if due is not None:
+                        timeout = min(timeout, max(due, 0.05))
+                    if await self._idle(timeout):
+                        backoff.reset()
+                    continue
+                backoff.reset()
+
+                for lane, jobs in batches:
+                    for job in jobs:
+                        in_flight.inc()
+                        self._in_flight_by_lane[lane.name] += 1
+                        task = asyncio.create_task(self._process(job, lane))
+                        self._tasks.add(task)
+                        task.add_done_callback(lambda t, lane=lane: _done(lane, t))
+        finally:
+            if self._tasks:
+                logger.info("worker_draining", extra={"in_flight": len(self._tasks)})
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(sig)
+            if watcher is not None:
+                watcher.cancel()
+            await self.wakeup.close()
+            await self.on_shutdown()
+
+    async def _read_lanes(self, plan: Dict[str, int]) -> List[Tuple[Lane, list[Dict[str, Any]]]]:
+        """Read each lane's share, heaviest first; unused share rolls over."""
+        batches: List[Tuple[Lane, list[Dict[str, Any]]]] = []
+        carry = 0
+        for lane in self.lanes:
+            wanted = plan.get(lane.name, 0) + carry
+            ask = lane_headroom(lane, self._in_flight_by_lane, wanted)
+            jobs = await _read_jobs(ask, self.visibility_timeout, lane.queue) if ask else []
+            carry = wanted - len(jobs)
+            if jobs:
+                batches.append((lane, jobs))
+        return batches
+
+    def stop(self) -> None:
+        """Stop pulling new jobs; a second call cancels in-flight jobs."""
+        if self._stopping is None:
+            return
+        if self._stopping.is_set():
+            for task in self._tasks:
+                task.cancel()
+            return
+        self._stopping.set()
+        if self._capacity is not None:
+            self._capacity.set()
+
+    async def _watch_stop_event(self) -> None:
+        while not self.stop_event.is_set():
+            await asyncio.sleep(0.5)
+        self.stop()
+
+    async def _idle(self, seconds: float) -> bool:
+        """Wait for a wake-up, stop request or timeout; ``True`` if woken."""
+        assert self._stopping is not None
+        stopped = asyncio.ensure_future(self._stopping.wait())
+        woken = asyncio.ensure_future(self.wakeup.wait(seconds))
+        done, pending = await asyncio.wait({stopped, woken}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        return woken in done and woken.result()
+
+    async def _process(self, job: Dict[str, Any], lane: Lane) -> None:
+        msg_id = job["msg_id"]
+        read_ct = int(job.get("read_ct") or 1)
+        queue = lane.queue
+        current_queue.set(queue)
+        try:
+            payload: Dict[str, Any] = json.loads(job["message"]) if isinstance(job["message"], str) else job["message"]
+        except ValueError as exc:
+            await self._dead_letter(msg_id, {"raw": job["message"]}, f"undecodable message: {exc}", read_ct, queue)
+            return
+
+        if read_ct > self.max_attempts:
+            # Earlier deliveries never reported back – the job likely kills the worker
+            await self._dead_letter(msg_id, payload, f"abandoned after {read_ct - 1} deliveries", read_ct, queue)
+            return
+
+        key = self.fair_share.key(payload)
+        if not self.fair_share.try_acquire(key):
+            await self._defer(msg_id, lane, key)
+            return
+        self.fair_share.forget(msg_id)
+
+        waited = _queue_wait_seconds(job)
+        if waited is not None:
+            registry.histogram("queue_wait_seconds", lane=lane.name).observe(waited)
+
+        started = time.monotonic()
+        heartbeat = asyncio.create_task(self._heartbeat(msg_id, queue))
+        try:
+            try:
+                with timed("worker_job", lane=lane.name):
+                    await self.handle_job(payload)
+            finally:
+                # Stop beating before the outcome is written (a late beat would
+                # undo the retry delay), and also when the job is cancelled
+                heartbeat.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await heartbeat
+        except PermanentJobError as exc:
+            await self._dead_letter(msg_id, payload, f"{type(exc).__name__}: {exc}", read_ct, queue)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(
+                "job_failed",
+                extra={"msg_id": msg_id, "attempt": read_ct, "max_attempts": self.max_attempts, "error": str(exc)},
+            )
+            if read_ct >= self.max_attempts:
+                await self._dead_letter(msg_id, payload, f"{type(exc).__name__}: {exc}", read_ct, queue)
+            else:
+                await self._retry_later(msg_id, read_ct, queue)
+        else:
+            await _ack_job(msg_id, queue)
+        finally:
+            self.fair_share.release(key, time.monotonic() - started)
+
+    def retry_delay(self, attempt: int) -> int:
+        """Visibility delay before redelivering a job that failed ``attempt`` times."""
+        return int(min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1)))
+
+    async def _retry_later(self, msg_id: int, read_ct: int, queue: str) -> None:
+        registry.counter("worker_job_retries_total").inc()
+        try:
+            await _set_vt(msg_id, self.retry_delay(read_ct), queue)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Message still reappears once the current visibility timeout lapses
+            logger.warning("job_retry_delay_failed", extra={"msg_id": msg_id, "queue": queue, "error": str(exc)})
+
+    async def _defer(self, msg_id: int, lane: Lane, key: str) -> None:
+        registry.counter("worker_jobs_deferred_total", lane=lane.name).inc()
+        delay = self.fair_share.defer_delay(key, msg_id, self.fair_share_delay, self.fair_share_max_delay)
+        try:
+            await _defer_job(msg_id, delay, lane.queue)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Falls back to redelivery once the visibility timeout lapses
+            logger.warning("job_defer_failed", extra={"msg_id": msg_id, "key": key, "error": str(exc)})
+
+    async def _dead_letter(
+        self, msg_id: int, payload: Dict[str, Any], error: str, read_ct: int, queue: str = QUEUE_NAME
+    ) -> None:
+        registry.counter("worker_jobs_dead_lettered_total").inc()
+        logger.error("job_dead_lettered", extra={"msg_id": msg_id, "attempts": read_ct, "error": error})
+        try:
+            await _dead_letter(msg_id, payload, error, read_ct, queue)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Left in the queue – the next delivery dead-letters it again
+            logger.warning("job_dead_letter_failed", extra={"msg_id": msg_id, "queue": queue, "error": str(exc)})
+
+    async def _heartbeat(self, msg_id: int, queue: str = QUEUE_NAME) -> None:
+        """Keep extending visibility while the job is still running."""
+        interval = max(1.0, self.visibility_timeout / 3)
         while True:
-            job = _dequeue_job()
-            if job is None:
-                time.sleep(self.sleep)
-                continue
-
-            msg_id = job["msg_id"]
-            payload: Dict[str, Any] = json.loads(job["message"])
+            await asyncio.sleep(interval)
             try:
-                self.handle_job(payload)
+                await _set_vt(msg_id, self.visibility_timeout, queue)
             except Exception as exc:  # pylint: disable=broad-except
-                print(f"Job {msg_id} failed: {exc}")
-                # Let message return to queue after vt.
-            else:
-                _ack_job(msg_id)
+                # A missed beat is retried next interval; vt leaves headroom
+                logger.warning("job_heartbeat_failed", extra={"msg_id": msg_id, "queue": queue, "error": str(exc)})
 
     # ------------------------------------------------------------------
-    # Override this method in subclasses
+    # Override these methods in subclasses
     # ------------------------------------------------------------------
-    def handle_job(self, payload: Dict[str, Any]) -> None:  # noqa: D401
+    async def handle_job(self, payload: Dict[str, Any]) -> None:  # noqa: D401
         """Process a single job payload. Override in subclass."""
         raise NotImplementedError
 
+    async def on_shutdown(self) -> None:
+        """Release long-lived resources once all jobs have drained."""
+
 
 # ---------------------------------------------------------------------------
 # Persistence helpers used by workflows
 # ---------------------------------------------------------------------------
 
 
-def create_workflow_run(audience_name: str, location: str | None = None) -> str:
-    """Insert a row into ``workflow_runs`` and return its ID."""
-    # Fetch audience id by name
-    aud_resp = (
-        supabase.table("audiences")
-        .select("id")
-        .eq("name", audience_name)
-        .single()
-        .execute()
-    )
-    aud_id = aud_resp.data["id"] if hasattr(aud_resp, "data") else aud_resp["id"]
-
-    run_resp = (
-        supabase.table("workflow_runs")
-        .insert({
-            "audience_id": aud_id,
-            "location": location,
-            "status": "running",
-        })
-        .execute()
-    )
-    run_id = run_resp.data[0]["id"] if hasattr(run_resp, "data") else run_resp[0]["id"]
-    return run_id
-
-
-def complete_workflow_run(run_id: str) -> None:
-    supabase.table("workflow_runs").update({"status": "completed"}).eq("id", run_id).execute()
-
-
-def fail_workflow_run(run_id: str) -> None:
-    supabase.table("workflow_runs").update({"status": "failed"}).eq("id", run_id).execute()
+async def create_workflow_run(
+    audience_name: str, location: str | None = None, *, audience_id: str | None = None
+) -> str:
+    """Insert a row into ``workflow_runs`` and return its ID.
 
+    Pass ``audience_id`` (e.g. from the audience registry) to skip the
+    ``audiences`` lookup by name.
+    """
+    pool = await get_db_pool()
+    with timed("db_write", table="workflow_runs"):
+        if audience_id is not None:
+            run_id = await pool.fetchval(
+                """
+                insert into workflow_runs (audience_id, location, status)
+                values ($1, $2, 'running')
+                returning id
+                """,
+                audience_id,
+                location,
+            )
+        else:
+            run_id = await pool.fetchval(
+                """
+                insert into workflow_runs (audience_id, location, status)
+                select id, $2, 'running' from audiences where name = $1
+                returning id
+                """,
+                audience_name,
+                location,
+            )
+    if run_id is None:
+        raise ValueError(f"Unknown audience: {audience_name}")
+    return str(run_id)
+
+
+async def _set_run_status(run_id: str, status: str, timestamp_column: str) -> None:
+    pool = await get_db_pool()
+    with timed("db_write", table="workflow_runs"):
+        await pool.execute(
+            f"update workflow_runs set status = $2, {timestamp_column} = now() where id = $1",
+            run_id,
+            status,
+        )
+
+
+async def start_workflow_run(run_id: str) -> None:
+    await _set_run_status(run_id, "running", "started_at")
+
+
+async def complete_workflow_run(run_id: str) -> None:
+    await _set_run_status(run_id, "completed", "finished_at")
+
+
+async def fail_workflow_run(run_id: str) -> None:
+    await _set_run_status(run_id, "failed", "finished_at")
+
+
+async def insert_prospects(run_id: str, urls: list[str]) -> Dict[str, str]:
+    """Insert the run's prospects in one statement; returns ``{url: prospect_id}``.
+
+    Upserts on ``(workflow_run_id, url)`` so a retried run reuses its rows.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    pool = await get_db_pool()
+    with timed("db_write", table="prospects"):
+        rows = await pool.fetch(
+            """
+            insert into prospects (workflow_run_id, url)
+            select $1, unnest($2::text[])
+            on conflict (workflow_run_id, url) do update set url = excluded.url
+            returning url, id
+            """,
+            run_id,
+            unique_urls,
+        )
+    return {row["url"]: str(row["id"]) for row in rows}
+
+
+async def insert_prospect_results(
+    prospect_ids: list[Optional[str]], analyses: list[Dict[str, Any]], contacts: list[Dict[str, Any]]
+) -> None:
+    """Bulk insert analyses and contacts (parallel lists) in one transaction.
+
+    ``analyses`` are bound as ``jsonb`` values (the pool's codec encodes them),
+    so pass dicts, not JSON strings. A failed flush writes nothing, so retrying
+    it cannot duplicate ``site_analyses`` rows. Rows without a prospect id are
+    skipped.
+    """
+    rows = [(pid, a, c) for pid, a, c in zip(prospect_ids, analyses, contacts, strict=False) if pid]
+    if not rows:
+        return
+    ids = [pid for pid, _, _ in rows]
+    pool = await get_db_pool()
+    async with pool.acquire() as conn, conn.transaction():
+        with timed("db_write", table="site_analyses"):
+            await conn.execute(
+                "insert into site_analyses (prospect_id, scores_json) select * from unnest($1::uuid[], $2::jsonb[])",
+                ids,
+                [analysis for _, analysis, _ in rows],
+            )
+        with timed("db_write", table="contacts"):
+            # crude: store full JSON into contacts as a single row of type "json"
+            await conn.execute(
+                "insert into contacts (prospect_id, type, value) select p, 'json', v from unnest($1::uuid[], $2::text[]) as t(p, v)",
+                ids,
+                [json.dumps(contact) for _, _, contact in rows],
+            )
 
-def insert_prospects(run_id: str, urls: list[str]):
-    records = [{"workflow_run_id": run_id, "url": u} for u in urls]
-    if records:
-        supabase.table("prospects").insert(records).execute()
 
+# ---------------------------------------------------------------------------
+# Fan-out / fan-in of a run into per-batch sub-jobs
+# ---------------------------------------------------------------------------
 
-def insert_site_analyses(prospect_urls: list[str], analyses_json: list[str]):
-    # expects parallel lists same length
-    records = []
-    for url, body in zip(prospect_urls, analyses_json, strict=False):
-        # Find prospect id by url
-        p_resp = supabase.table("prospects").select("id").eq("url", url).single().execute()
-        if not p_resp.data:
-            continue
-        records.append({"prospect_id": p_resp.data["id"], "scores_json": body})
-    if records:
-        supabase.table("site_analyses").insert(records).execute()
 
+async def fan_out_run(
+    run_id: str,
+    batches: list[list[str]],
+    source_query: str | None = None,
+    queue_name: str = QUEUE_NAME,
+    fields: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Record sub-jobs and enqueue one ``analyze`` message per batch (one transaction).
 
-def insert_contacts(prospect_urls: list[str], contacts_json: list[str]):
-    for url, body in zip(prospect_urls, contacts_json, strict=False):
-        p_resp = supabase.table("prospects").select("id").eq("url", url).single().execute()
-        if not p_resp.data:
-            continue
-        # crude: store full JSON into contacts as a single row type jsonb maybe; else skip
-        supabase.table("contacts").insert({"prospect_id": p_resp.data["id"], "type": "json", "value": body}).execute() 
\ No newline at end of file
+    ``fields`` are copied into every sub-job message (fair-share key fields).
+    """
+    pool = await get_db_pool()
+    with timed("db_write", table="workflow_sub_jobs"):
+        count = await pool.fetchval(
+            "select public.fan_out_run($1, $2::jsonb, $3, $4, $5::jsonb)",
+            run_id,
+            batches,
+            source_query,
+            queue_name,
+            fields or {},
+        )
+    return int(count or 0)
+
+
+async def settle_sub_job(run_id: str, batch_index: int, failed: bool) -> str:
+    """Mark a batch done; returns the run status (``running`` until all settle)."""
+    pool = await get_db_pool()
+    with timed("db_write", table="workflow_sub_jobs"):
+        status = await pool.fetchval("select public.settle_sub_job($1, $2, $3)", run_id, batch_index, failed)
+    return str(status)
+
+
+async def persist_prospect_batch(
+    run_id: str,
+    rows: list[Dict[str, Any]],
+    batch_index: int | None = None,
+    failed: bool = False,
+) -> Dict[str, Any]:
+    """Write prospects, analyses and contacts for ``rows`` in one transaction.
+
+    Each row is ``{"url", "source_query", "analysis", "contacts"}``. With
+    ``batch_index`` the sub-job is settled in the same call. Returns
+    ``{"status": <run status>, "prospect_ids": {url: id}}``.
+    """
+    pool = await get_db_pool()
+    with timed("db_write", table="prospect_batch"):
+        result = await pool.fetchval(
+            "select public.persist_prospect_batch($1, $2::jsonb, $3, $4)",
+            run_id,
+            rows,
+            batch_index,
+            failed,
+        )
+    return result or {}
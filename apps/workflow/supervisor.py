@@ -0,0 +1,326 @@
+"""Pre-fork supervisor running N ``worker.py`` processes on one host.
+
+Run with:
+
+    uv run python supervisor.py --workers 16 --max-rss-mb 2048
+
+Each child is a full ``ProspectWorker`` with its own event loop, browser pool
+and async consumer. The supervisor:
+
+* restarts children that crash (with a short backoff if they crash-loop);
+* recycles children whose process tree (worker + Chromium) exceeds
+  ``--max-rss-mb`` – the child drains its in-flight jobs first;
+* on SIGTERM/SIGINT sets a shared stop event so every child drains, then
+  exits once all children are gone; SIGHUP does a rolling restart, one child
+  at a time;
+* merges the children's metrics snapshots and serves them on
+  ``METRICS_PORT`` (children only write snapshot files);
+* with ``--browser-server-port`` runs one shared Chromium for the host
+  (``agentic_core.browser_server``), restarts it if it dies, points every
+  child at it via ``BROWSER_CDP_URL`` and stops it after the children drain.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from agentic_core.metrics import merge_snapshots, start_metrics_server
+
+ROLLING_RESTART_TIMEOUT = 600.0
+CRASH_BACKOFF_MAX = 30.0
+
+
+def _child_main(index: int, stop_event: Any, snapshot_dir: str) -> None:
+    # Forked with the supervisor's handlers: until JobConsumer installs its
+    # own, a SIGTERM for this child alone must not set the shared stop event
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # Rolling restarts are the supervisor's business
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    # Children write snapshots; only the supervisor binds the metrics port
+    os.environ.pop("METRICS_PORT", None)
+    os.environ["METRICS_SNAPSHOT_PATH"] = str(Path(snapshot_dir) / f"worker-{index}.json")
+    os.environ.setdefault("METRICS_SNAPSHOT_INTERVAL", "5")
+
+    import worker
+
+    worker.main(stop_event=stop_event)
+
+
+def _browser_server_main(port: int) -> None:
+    # Outlive the workers' drain: only the supervisor's SIGTERM stops it
+    # (default action until serve() installs its handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    import asyncio
+
+    from agentic_core.browser_server import serve
+
+    asyncio.run(serve(port, stop_signals=(signal.SIGTERM,)))
+
+
+def _children_of(pid: int) -> List[int]:
+    children: List[int] = []
+    task_dir = Path(f"/proc/{pid}/task")
+    try:
+        for task in task_dir.iterdir():
+            text = (task / "children").read_text().split()
+            children.extend(int(c) for c in text)
+    except OSError:
+        pass
+    return children
+
+
+def tree_rss_mb(pid: int) -> float:
+    """Resident memory of ``pid`` and all its descendants (Linux /proc)."""
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            for line in Path(f"/proc/{current}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+                    break
+        except OSError:
+            continue
+        stack.extend(_children_of(current))
+    return total_kb / 1024
+
+
+class Supervisor:
+    """Keeps ``workers`` child processes alive."""
+
+    def __init__(
+        self,
+        workers: int,
+        max_rss_mb: Optional[float] = None,
+        snapshot_dir: Optional[Path] = None,
+        browser_server_port: Optional[int] = None,
+    ):
+        self.workers = workers
+        self.browser_server_port = browser_server_port
+        self._browser_server: Optional[mp.process.BaseProcess] = None
+        self.max_rss_mb = max_rss_mb
+        self.snapshot_dir = snapshot_dir or Path(tempfile.mkdtemp(prefix="agentic-worker-metrics-"))
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self._ctx = mp.get_context("fork")
+        self._stop_event = self._ctx.Event()
+        self._children: Dict[int, mp.process.BaseProcess] = {}
+        self._recycling: set[int] = set()
+        self._crashes: Dict[int, int] = {}
+        self._respawn_at: Dict[int, float] = {}
+        self._rolling = False
+
+    # ------------------------------------------------------------------
+    # Process management
+    # ------------------------------------------------------------------
+
+    def _spawn(self, index: int) -> None:
+        proc = self._ctx.Process(
+            target=_child_main,
+            args=(index, self._stop_event, str(self.snapshot_dir)),
+            name=f"prospect-worker-{index}",
+        )
+        proc.start()
+        self._children[index] = proc
+        print(f"[SUPERVISOR] started worker {index} (pid={proc.pid})")
+
+    def _start_browser_server(self) -> None:
+        assert self.browser_server_port is not None
+        proc = self._ctx.Process(
+            target=_browser_server_main, args=(self.browser_server_port,), name="browser-server"
+        )
+        proc.start()
+        self._browser_server = proc
+        print(f"[SUPERVISOR] started browser server (pid={proc.pid}) on port {self.browser_server_port}")
+
+    def _check_browser_server(self) -> None:
+        proc = self._browser_server
+        if proc is None or proc.is_alive() or self._stop_event.is_set():
+            return
+        proc.join()
+        print(f"[SUPERVISOR] browser server exited with {proc.exitcode}; restarting")
+        self._start_browser_server()
+
+    def _stop_browser_server(self) -> None:
+        proc = self._browser_server
+        if proc is None:
+            return
+        if proc.is_alive():
+            os.kill(proc.pid, signal.SIGTERM)
+            proc.join(30)
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+        self._browser_server = None
+
+    def _check_children(self) -> None:
+        now = time.monotonic()
+        for index, due in list(self._respawn_at.items()):
+            if due <= now and not self._stop_event.is_set():
+                del self._respawn_at[index]
+                self._spawn(index)
+
+        for index, proc in list(self._children.items()):
+            if index in self._respawn_at:
+                continue
+            if proc.is_alive():
+                if self.max_rss_mb and index not in self._recycling:
+                    rss = tree_rss_mb(proc.pid)
+                    if rss > self.max_rss_mb:
+                        print(f"[SUPERVISOR] worker {index} uses {rss:.0f}MB – recycling")
+                        self._recycling.add(index)
+                        os.kill(proc.pid, signal.SIGTERM)  # drain, then respawn below
+                continue
+
+            proc.join()
+            if self._stop_event.is_set():
+                continue
+            if index in self._recycling:
+                self._recycling.discard(index)
+                self._crashes.pop(index, None)
+            elif proc.exitcode != 0:
+                crashes = self._crashes.get(index, 0) + 1
+                self._crashes[index] = crashes
+                delay = min(CRASH_BACKOFF_MAX, 2 ** (crashes - 1))
+                print(f"[SUPERVISOR] worker {index} exited with {proc.exitcode}; restarting in {delay}s")
+                self._respawn_at[index] = now + delay
+                continue
+            self._spawn(index)
+
+    def rolling_restart(self) -> None:
+        """Drain and replace children one at a time."""
+        if self._rolling:
+            return
+        self._rolling = True
+        try:
+            for index in sorted(self._children):
+                proc = self._children[index]
+                if not proc.is_alive():
+                    continue
+                self._recycling.add(index)
+                os.kill(proc.pid, signal.SIGTERM)
+                proc.join(ROLLING_RESTART_TIMEOUT)
+                if proc.is_alive():
+                    proc.kill()
+                    proc.join()
+                self._check_children()
+                if self._stop_event.is_set():
+                    return
+        finally:
+            self._rolling = False
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def merged_snapshot(self) -> Dict[str, Any]:
+        snapshots = []
+        for path in self.snapshot_dir.glob("worker-*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        merged = merge_snapshots(snapshots)
+        merged["workers"] = len(snapshots)
+        return merged
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def run(self) -> None:
+        hup_requested = False
+
+        def _on_stop(signum: int, frame: Any) -> None:
+            if self._stop_event.is_set():
+                # Second signal: stop waiting for drains
+                for proc in self._children.values():
+                    if proc.is_alive():
+                        os.kill(proc.pid, signal.SIGTERM)
+                return
+            print("[SUPERVISOR] stopping – draining workers…")
+            self._stop_event.set()
+
+        def _on_hup(signum: int, frame: Any) -> None:
+            nonlocal hup_requested
+            hup_requested = True
+
+        signal.signal(signal.SIGTERM, _on_stop)
+        signal.signal(signal.SIGINT, _on_stop)
+        signal.signal(signal.SIGHUP, _on_hup)
+
+        port = os.getenv("METRICS_PORT")
+        if port:
+            start_metrics_server(int(port), host=os.getenv("METRICS_HOST", "127.0.0.1"), snapshot_source=self.merged_snapshot)
+
+        if self.browser_server_port:
+            from agentic_core.browser_server import cdp_url
+
+            self._start_browser_server()
+            # Inherited by every forked child
+            os.environ["BROWSER_CDP_URL"] = cdp_url(self.browser_server_port)
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        while not self._stop_event.is_set():
+            if hup_requested:
+                hup_requested = False
+                self.rolling_restart()
+            self._check_browser_server()
+            self._check_children()
+            time.sleep(1.0)
+
+        for proc in self._children.values():
+            proc.join()
+        print("[SUPERVISOR] all workers drained")
+        self._stop_browser_server()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run N prospect workers")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKER_PROCESSES") or os.cpu_count() or 1))
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=float(os.getenv("WORKER_MAX_RSS_MB") or 0) or None,
+        help="Recycle a worker whose process tree exceeds this resident size",
+    )
+    parser.add_argument("--snapshot-dir", type=Path, default=None, help="Where children write metrics snapshots")
+    parser.add_argument(
+        "--browser-server-port",
+        type=int,
+        default=int(os.getenv("BROWSER_SERVER_PORT") or 0) or None,
+        help="Share one Chromium (CDP on this port) across all workers",
+    )
+    args = parser.parse_args()
+
+    # Pre-fork: load heavy modules once so children share the pages
+    import worker
+
+    worker.preload()
+
+    Supervisor(
+        args.workers,
+        max_rss_mb=args.max_rss_mb,
+        snapshot_dir=args.snapshot_dir,
+        browser_server_port=args.browser_server_port,
+    ).run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
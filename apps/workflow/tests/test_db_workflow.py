@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+import db_workflow
+
+
+@pytest.fixture
+def persisted(monkeypatch: pytest.MonkeyPatch) -> List[Dict[str, Any]]:
+    """Replace the browser tools and the RPC; collect what would be persisted."""
+    calls: List[Dict[str, Any]] = []
+
+    async def analyze_website(url: str) -> Any:
+        await asyncio.sleep(1 if "slow" in url else 0)
+        analysis = SimpleNamespace(model_dump=lambda mode: {"overall_score": 0.5}, technical_issues=[])
+        return SimpleNamespace(analysis=analysis)
+
+    async def fetch_contact_info(url: str) -> Any:
+        return SimpleNamespace(emails=["info@example.com"], phones=[], social_links=[])
+
+    async def persist_prospect_batch(run_id: str, rows: List[Dict[str, Any]], batch_index: int, failed: bool) -> Dict[str, Any]:
+        calls.append({"rows": rows, "failed": failed})
+        return {"status": "failed" if failed else "completed"}
+
+    monkeypatch.setattr(db_workflow, "analyze_website", analyze_website)
+    monkeypatch.setattr(db_workflow, "fetch_contact_info", fetch_contact_info)
+    monkeypatch.setattr(db_workflow, "persist_prospect_batch", persist_prospect_batch)
+    return calls
+
+
+async def test_step_timeout_drops_only_that_result(persisted: List[Dict[str, Any]]) -> None:
+    status = await db_workflow.analyze_batch_to_db(
+        run_id="run-1",
+        batch_index=0,
+        urls=["https://fast.example", "https://slow.example"],
+        step_timeouts={"analysis": 0.05},
+    )
+
+    [call] = persisted
+    fast, slow = call["rows"]
+    assert status == "completed" and not call["failed"]
+    assert fast["analysis"]["scores_json"] == {"overall_score": 0.5}
+    assert slow["analysis"] is None
+    assert slow["contacts"] == [{"type": "email", "value": "info@example.com"}]
+
+
+async def test_batch_after_the_run_deadline_settles_without_analysing(persisted: List[Dict[str, Any]]) -> None:
+    status = await db_workflow.analyze_batch_to_db(
+        run_id="run-1", batch_index=1, urls=["https://fast.example"], deadline=time.time() - 1
+    )
+
+    [call] = persisted
+    assert status == "failed" and call["failed"]
+    assert call["rows"] == [{"url": "https://fast.example", "source_query": None, "analysis": None, "contacts": []}]
@@ -0,0 +1,23 @@
+"""Cold-import budgets of the CLI and worker entry points (see ``benchmarks.import_budget``).
+
+``IMPORT_BUDGET_SCALE`` multiplies every budget on slow CI machines.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from benchmarks.import_budget import BUDGETS, measure
+
+SCALE = float(os.getenv("IMPORT_BUDGET_SCALE") or 1.0)
+
+
+@pytest.mark.parametrize("target", sorted(BUDGETS))
+def test_cold_import_within_budget(target: str) -> None:
+    seconds, loaded = measure(target, runs=3)
+
+    assert not loaded, f"{target} eagerly imports {', '.join(loaded)}"
+    budget = BUDGETS[target] * SCALE
+    assert seconds <= budget, f"{target} imports in {seconds * 1000:.0f} ms (budget {budget * 1000:.0f} ms)"
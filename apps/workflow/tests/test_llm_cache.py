@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, List
+
+import pytest
+from agents import Agent, ModelSettings, Runner
+from pydantic import BaseModel
+
+from agentic_core.llm_cache import LLMCacheMiss, cache_key, install_llm_cache
+
+
+class Verdict(BaseModel):
+    score: float
+
+
+class OtherVerdict(BaseModel):
+    label: str
+
+
+def _agent(**kwargs: Any) -> Agent:
+    return Agent(name="analysis", instructions="Score the site.", **kwargs)
+
+
+@pytest.fixture
+def model_calls() -> Iterator[List[str]]:
+    """Stub ``Runner.run`` as the model; restore it (and drop the cache wrapper) afterwards."""
+    calls: List[str] = []
+
+    async def run(agent: Any, prompt: str, *args: Any, **kwargs: Any) -> Any:
+        calls.append(prompt)
+        if agent.output_type is Verdict:
+            return SimpleNamespace(final_output=Verdict(score=len(calls)))
+        return SimpleNamespace(final_output=f"answer {len(calls)}")
+
+    saved = Runner.run
+    Runner.run = run  # type: ignore[assignment]
+    try:
+        yield calls
+    finally:
+        Runner.run = saved  # type: ignore[assignment]
+
+
+@pytest.fixture
+def install(tmp_path: Path) -> Callable[..., Any]:
+    return lambda mode, **kwargs: install_llm_cache(mode, cache_dir=tmp_path, **kwargs)
+
+
+def test_key_covers_model_settings_and_output_type() -> None:
+    base = cache_key(_agent(), "https://a.example")
+
+    assert cache_key(_agent(), "https://a.example") == base
+    assert cache_key(_agent(), "https://b.example") != base
+    assert cache_key(_agent(model_settings=ModelSettings(temperature=0.0)), "https://a.example") != base
+    assert cache_key(_agent(model_settings=ModelSettings(temperature=0.9)), "https://a.example") != cache_key(
+        _agent(model_settings=ModelSettings(temperature=0.0)), "https://a.example"
+    )
+    assert cache_key(_agent(output_type=Verdict), "https://a.example") != base
+    assert cache_key(_agent(output_type=Verdict), "https://a.example") != cache_key(
+        _agent(output_type=OtherVerdict), "https://a.example"
+    )
+
+
+async def test_record_then_replay_serves_the_recording(model_calls: List[str], install: Callable[..., Any]) -> None:
+    stub = Runner.run
+    install("record")
+    recorded = await Runner.run(_agent(output_type=Verdict), "site")
+
+    Runner.run = stub  # type: ignore[assignment]
+    install("replay")
+    replayed = await Runner.run(_agent(output_type=Verdict), "site")
+
+    assert model_calls == ["site"]
+    assert replayed.cached
+    assert replayed.final_output == recorded.final_output == Verdict(score=1)
+
+
+async def test_strict_replay_miss_raises(model_calls: List[str], install: Callable[..., Any]) -> None:
+    install("replay")
+
+    with pytest.raises(LLMCacheMiss):
+        await Runner.run(_agent(), "never recorded")
+    assert model_calls == []
+
+
+async def test_lenient_replay_falls_through_on_a_miss(model_calls: List[str], install: Callable[..., Any]) -> None:
+    install("replay", strict=False)
+
+    result = await Runner.run(_agent(), "never recorded")
+
+    assert result.final_output == "answer 1"
+    assert model_calls == ["never recorded"]
+
+
+async def test_cache_mode_records_misses_and_expires_after_ttl(model_calls: List[str], install: Callable[..., Any]) -> None:
+    stub = Runner.run
+    install("cache", ttl=3600)
+    first = await Runner.run(_agent(), "site")
+    second = await Runner.run(_agent(), "site")
+
+    assert first.final_output == second.final_output == "answer 1"
+    assert model_calls == ["site"]
+
+    Runner.run = stub  # type: ignore[assignment]
+    install("cache", ttl=-1)  # everything already expired
+    assert (await Runner.run(_agent(), "site")).final_output == "answer 2"
+
+
+async def test_second_install_is_refused(model_calls: List[str], install: Callable[..., Any], caplog: Any) -> None:
+    assert install("replay", strict=False) is not None
+    assert install("record") is None
+    assert "llm_cache_already_installed" in caplog.text
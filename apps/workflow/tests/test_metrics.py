@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from agentic_core.metrics import MetricsRegistry, merge_snapshots, render_prometheus
+
+
+def _snapshot(calls: int, latencies: list[float], table: str = "prospects") -> dict:
+    reg = MetricsRegistry()
+    reg.counter("db_calls_total", table=table).inc(calls)
+    reg.gauge("jobs_in_flight").set(2)
+    for value in latencies:
+        reg.histogram("db_seconds", table=table).observe(value)
+    return reg.snapshot()
+
+
+def _by_name(entries: list[dict], name: str, **labels: str) -> dict:
+    [entry] = [e for e in entries if e["name"] == name and e["labels"] == labels]
+    return entry
+
+
+def test_merge_sums_counters_gauges_and_histograms_per_label_set() -> None:
+    merged = merge_snapshots(
+        [
+            _snapshot(3, [0.01, 0.02]),
+            _snapshot(4, [0.5]),
+            _snapshot(1, [], table="contacts"),
+        ]
+    )
+
+    assert _by_name(merged["counters"], "db_calls_total", table="prospects")["value"] == 7
+    assert _by_name(merged["counters"], "db_calls_total", table="contacts")["value"] == 1
+    assert _by_name(merged["gauges"], "jobs_in_flight")["value"] == 6
+
+    hist = _by_name(merged["histograms"], "db_seconds", table="prospects")
+    assert hist["count"] == 3
+    assert abs(hist["sum"] - 0.53) < 1e-9
+    assert sum(hist["buckets"]) == 3
+    # Percentiles are recomputed from the merged buckets
+    assert hist["p50"] < 0.05 < 0.4 < hist["p99"] <= 0.5 * 1.25
+
+
+def test_merge_of_nothing_is_empty() -> None:
+    merged = merge_snapshots([])
+    assert merged["counters"] == merged["gauges"] == merged["histograms"] == []
+
+
+def test_prometheus_buckets_are_cumulative() -> None:
+    text = render_prometheus(merge_snapshots([_snapshot(1, [0.01, 0.02]), _snapshot(1, [0.5])]))
+
+    assert 'db_calls_total{table="prospects"} 2.0' in text
+    assert 'db_seconds_count{table="prospects"} 3' in text
+    assert 'db_seconds_bucket{le="+Inf",table="prospects"} 3' in text
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+import asyncpg
+import pytest
+
+from db_pool import NotifyListener
+from queue_wakeup import PostgresNotifyWakeup
+
+
+class _Connection:
+    """Just enough of an asyncpg connection to LISTEN and be terminated."""
+
+    def __init__(self) -> None:
+        self.listeners: Dict[str, Callable[..., None]] = {}
+        self.on_terminated: List[Callable[[Any], None]] = []
+        self.closed = False
+
+    async def add_listener(self, channel: str, callback: Callable[..., None]) -> None:
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel: str, callback: Callable[..., None]) -> None:
+        self.listeners.pop(channel, None)
+
+    def add_termination_listener(self, callback: Callable[[Any], None]) -> None:
+        self.on_terminated.append(callback)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def notify(self, channel: str, payload: str = "") -> None:
+        self.listeners[channel](self, 1, channel, payload)
+
+    def terminate(self) -> None:
+        self.closed = True
+        for callback in self.on_terminated:
+            callback(self)
+
+
+@pytest.fixture
+def connections(monkeypatch: pytest.MonkeyPatch) -> List[_Connection]:
+    opened: List[_Connection] = []
+
+    async def connect(dsn: str) -> _Connection:
+        opened.append(_Connection())
+        return opened[-1]
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    return opened
+
+
+async def test_channels_share_one_connection(connections: List[_Connection]) -> None:
+    listener = NotifyListener("postgresql://example")
+    wakeup = PostgresNotifyWakeup("worker_jobs", listener=listener)
+    changed: List[str] = []
+
+    await wakeup.start()
+    await listener.listen("audiences_changed", changed.append)
+    [conn] = connections
+    assert set(conn.listeners) == {"worker_jobs", "audiences_changed"}
+
+    conn.notify("audiences_changed", "local_business")
+    assert changed == ["local_business"]
+    assert not await wakeup.wait(0.01)
+
+    conn.notify("worker_jobs")
+    assert await wakeup.wait(1)
+
+
+async def test_reconnects_and_relistens_after_the_connection_drops(connections: List[_Connection]) -> None:
+    listener = NotifyListener("postgresql://example")
+    wakeup = PostgresNotifyWakeup("worker_jobs", listener=listener)
+    await wakeup.start()
+    await listener.listen("audiences_changed", lambda payload: None)
+
+    connections[0].terminate()
+    assert not listener.connected
+    assert not await wakeup.wait(0.01)  # reconnects before waiting
+
+    assert len(connections) == 2
+    assert set(connections[1].listeners) == {"worker_jobs", "audiences_changed"}
+    connections[1].notify("worker_jobs")
+    assert await wakeup.wait(1)
+
+
+async def test_last_handler_unlistens_the_channel(connections: List[_Connection]) -> None:
+    listener = NotifyListener("postgresql://example")
+    first: List[str] = []
+    second: List[str] = []
+    await listener.listen("audiences_changed", first.append)
+    await listener.listen("audiences_changed", second.append)
+    [conn] = connections
+
+    await listener.unlisten("audiences_changed", first.append)
+    conn.notify("audiences_changed", "a")
+    assert (first, second) == ([], ["a"])
+
+    await listener.unlisten("audiences_changed", second.append)
+    assert conn.listeners == {}
+    await listener.close()
+    assert conn.closed
+
+
+async def test_unreachable_database_degrades_to_timeouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def connect(dsn: str) -> Any:
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    wakeup = PostgresNotifyWakeup("worker_jobs", listener=NotifyListener("postgresql://example"))
+
+    await wakeup.start()
+    assert not await wakeup.wait(0.01)
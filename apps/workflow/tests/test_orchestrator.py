@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from agentic_core.orchestrator import (
+    BaseWorkflow,
+    StepTimeoutError,
+    WorkflowStepError,
+    step_budget,
+    within_budget,
+)
+
+
+class _Workflow(BaseWorkflow):
+    name = "test"
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.events: List[Dict[str, Any]] = []
+        super().__init__("run-1", trace=self.events.append, **kwargs)
+
+    async def run(self) -> Any:
+        return None
+
+    def states(self, step: str) -> List[str]:
+        return [e["state"] for e in self.events if e["step"] == step]
+
+
+async def _sleep(seconds: float, result: Any = "ok") -> Any:
+    await asyncio.sleep(seconds)
+    return result
+
+
+async def _inner_timeout() -> None:
+    raise asyncio.TimeoutError("browser navigation timed out")
+
+
+def test_step_budget_is_the_smaller_of_step_and_run_budget() -> None:
+    limits = {"search": 5.0, "default": 2.0}
+    assert step_budget("search", limits, None) == 5.0
+    assert step_budget("analysis", limits, None) == 2.0
+    assert step_budget("search", limits, 1.0) == 1.0
+    assert step_budget("search", None, 3.0) == 3.0
+    assert step_budget("search", None, None) is None
+
+
+async def test_step_completes_within_budget() -> None:
+    wf = _Workflow(step_timeouts={"default": 1.0})
+    assert await wf.step("search", _sleep(0.01)) == "ok"
+    assert wf.states("search") == ["running", "completed"]
+
+
+async def test_step_over_its_budget_times_out() -> None:
+    wf = _Workflow(step_timeouts={"search": 0.05})
+    with pytest.raises(StepTimeoutError):
+        await wf.step("search", _sleep(1))
+    assert wf.states("search") == ["running", "timed_out"]
+
+
+async def test_timeout_raised_inside_the_step_is_a_failure_not_an_overrun() -> None:
+    wf = _Workflow(step_timeouts={"default": 5.0})
+    with pytest.raises(WorkflowStepError) as info:
+        await wf.step("analysis", _inner_timeout())
+    assert not isinstance(info.value, StepTimeoutError)
+    assert wf.states("analysis") == ["running", "failed"]
+
+
+async def test_spent_run_budget_skips_the_step() -> None:
+    wf = _Workflow(run_timeout=0.05)
+    await asyncio.sleep(0.06)
+    coro = _sleep(0)
+    with pytest.raises(StepTimeoutError):
+        await wf.step("contacts", coro)
+    assert wf.deadline_expired
+    assert wf.states("contacts") == ["timed_out"]
+    assert coro.cr_frame is None  # closed, never started
+
+
+async def test_within_budget_only_maps_its_own_expiry() -> None:
+    with pytest.raises(StepTimeoutError):
+        await within_budget("search", _sleep(1), 0.02)
+    with pytest.raises(asyncio.TimeoutError) as info:
+        await within_budget("search", _inner_timeout(), 1.0)
+    assert not isinstance(info.value, StepTimeoutError)
+    assert await within_budget("search", _sleep(0), None) == "ok"
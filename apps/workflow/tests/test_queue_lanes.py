@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict
+
+import pytest
+
+from queue_lanes import FairShare, Lane, lane_headroom, parse_lanes, plan_reads
+
+
+def test_parse_lanes_maps_queues_and_sorts_by_weight() -> None:
+    lanes = parse_lanes("bulk:1:2, default:3, interactive:8")
+
+    assert [lane.name for lane in lanes] == ["interactive", "default", "bulk"]
+    assert [lane.queue for lane in lanes] == ["worker_jobs_interactive", "worker_jobs", "worker_jobs_bulk"]
+    assert lanes[2].max_in_flight == 2
+    with pytest.raises(ValueError):
+        parse_lanes(" , ")
+
+
+def test_plan_splits_free_slots_by_weight() -> None:
+    lanes = parse_lanes("interactive:8,default:3,bulk:1")
+
+    assert plan_reads(lanes, 4, {}) == {"interactive": 3, "default": 1, "bulk": 0}
+    assert sum(plan_reads(lanes, 12, {}).values()) == 12
+
+
+def test_carried_credit_keeps_the_ratio_one_slot_at_a_time() -> None:
+    lanes = parse_lanes("interactive:8,default:3,bulk:1")
+    credit: Dict[str, int] = {}
+    picks: Counter[str] = Counter()
+
+    for _ in range(120):
+        picks.update({name: n for name, n in plan_reads(lanes, 1, {}, credit).items() if n})
+
+    assert picks == {"interactive": 80, "default": 30, "bulk": 10}
+
+
+def test_lane_cap_hands_its_share_to_the_other_lanes() -> None:
+    lanes = [Lane("interactive", 8), Lane("bulk", 1, max_in_flight=2)]
+
+    assert plan_reads(lanes, 6, {"bulk": 1}) == {"interactive": 5, "bulk": 1}
+    assert plan_reads([lanes[1]], 3, {"bulk": 2}) == {"bulk": 0}
+    assert lane_headroom(lanes[1], {"bulk": 1}, 5) == 1
+    assert lane_headroom(lanes[0], {"interactive": 100}, 5) == 5
+
+
+def test_fair_share_keys_on_tenant_then_audience() -> None:
+    assert FairShare.key({"tenant_id": "t1", "audience_name": "a"}) == "tenant:t1"
+    assert FairShare.key({"audience_name": "a"}) == "audience:a"
+    assert FairShare.key({}) is None
+
+
+def test_fair_share_caps_each_key() -> None:
+    share = FairShare(limit=2)
+
+    assert share.try_acquire("tenant:a") and share.try_acquire("tenant:a")
+    assert not share.try_acquire("tenant:a")
+    assert share.try_acquire("tenant:b")
+    share.release("tenant:a", 1.0)
+    assert share.try_acquire("tenant:a")
+
+
+def test_fair_share_disabled_or_unkeyed_never_blocks() -> None:
+    assert all(FairShare(None).try_acquire("tenant:a") for _ in range(10))
+    assert all(FairShare(1).try_acquire(None) for _ in range(10))
+
+
+def test_deferred_messages_queue_up_behind_each_other() -> None:
+    share = FairShare(limit=1)
+    assert share.try_acquire("tenant:a")
+    share.release("tenant:a", 2.0)
+    assert share.try_acquire("tenant:a")
+
+    first = share.defer_delay("tenant:a", 1, base=0.5, maximum=30)
+    second = share.defer_delay("tenant:a", 2, base=0.5, maximum=30)
+
+    # One running job ahead of the first, plus the first ahead of the second
+    assert first == pytest.approx(2.0)
+    assert second == pytest.approx(4.0)
+    # Redelivered: keeps its ticket instead of going to the back
+    assert share.defer_delay("tenant:a", 1, base=0.5, maximum=30) == pytest.approx(2.0)
+    assert share.next_due() == pytest.approx(2.0, abs=0.1)
+
+    share.forget(1)
+    share.forget(2)
+    assert share.next_due() is None
+
+
+def test_defer_delay_is_capped() -> None:
+    share = FairShare(limit=1)
+    share.try_acquire("tenant:a")
+
+    assert share.defer_delay("tenant:a", 1, base=60.0, maximum=5.0) == 5.0
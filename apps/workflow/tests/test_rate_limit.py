@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, List
+
+import pytest
+from agents import Runner
+
+from agentic_core import rate_limit
+from agentic_core.rate_limit import AdaptiveLimiter, FileBudget, InProcessBudget, install_rate_limiter
+
+
+class RateLimitError(Exception):
+    status_code = 429
+    response = SimpleNamespace(headers={"retry-after": "0"})
+
+
+def _limiter(**kwargs: Any) -> AdaptiveLimiter:
+    kwargs.setdefault("cooldown", 0.0)
+    return AdaptiveLimiter(InProcessBudget(rpm=6000, tpm=10_000_000), **kwargs)
+
+
+@pytest.fixture
+def install() -> Iterator[Callable[[Any, AdaptiveLimiter], AdaptiveLimiter]]:
+    """Install the limiter around a ``Runner.run`` stub; restore both afterwards."""
+    saved = Runner.run
+
+    def _install(stub: Any, limiter: AdaptiveLimiter) -> AdaptiveLimiter:
+        Runner.run = stub  # type: ignore[assignment]
+        return install_rate_limiter(limiter)
+
+    try:
+        yield _install
+    finally:
+        Runner.run = saved  # type: ignore[assignment]
+        rate_limit._limiter = None
+
+
+async def test_nested_call_does_not_deadlock_at_limit_one(install: Any) -> None:
+    calls: List[str] = []
+
+    async def run(agent: Any, prompt: str, *args: Any, **kwargs: Any) -> Any:
+        calls.append(prompt)
+        if prompt == "outer":
+            # Like search_prospects_for_audience: a tool calling Runner.run again
+            inner = await Runner.run(agent, "inner")
+            return SimpleNamespace(final_output=f"outer({inner.final_output})")
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(final_output=prompt)
+
+    limiter = install(run, _limiter(initial_concurrency=1.0, latency_target=0.04))
+
+    result = await asyncio.wait_for(Runner.run(SimpleNamespace(instructions=""), "outer"), timeout=2)
+
+    assert result.final_output == "outer(inner)"
+    assert calls == ["outer", "inner"]
+    # The inner call's 50 ms are not the outer call's latency: no slowdown signal
+    assert limiter.limit == 2.0
+    assert limiter._in_flight == 0
+
+
+async def test_rate_limited_call_is_retried_and_halves_the_limit(install: Any) -> None:
+    attempts = 0
+
+    async def run(agent: Any, prompt: str, *args: Any, **kwargs: Any) -> Any:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RateLimitError("slow down")
+        return SimpleNamespace(final_output="ok")
+
+    limiter = install(run, _limiter(initial_concurrency=8.0))
+
+    result = await Runner.run(SimpleNamespace(instructions=""), "hi")
+
+    assert result.final_output == "ok" and attempts == 2
+    # Halved by the 429, then +1/limit for the successful retry
+    assert limiter.limit == pytest.approx(4.0 + 1 / 4.0)
+
+
+def test_aimd_grows_additively_and_backs_off() -> None:
+    limiter = _limiter(initial_concurrency=4.0, latency_target=1.0)
+
+    limiter.on_success(0.1)
+    assert limiter.limit == pytest.approx(4.25)
+    limiter.on_success(2.0)  # slower than target
+    assert limiter.limit == pytest.approx(4.25 * 0.9)
+
+
+async def test_429s_within_the_cooldown_count_once() -> None:
+    limiter = _limiter(initial_concurrency=16.0, cooldown=60.0)
+
+    await limiter.on_rate_limited(None)
+    await limiter.on_rate_limited(None)
+    assert limiter.limit == 8.0
+
+
+async def test_limit_never_drops_below_the_minimum() -> None:
+    limiter = _limiter(initial_concurrency=1.0)
+
+    await limiter.on_rate_limited(0.0)
+    assert limiter.limit == 1.0
+
+
+async def test_slot_caps_concurrency() -> None:
+    limiter = _limiter(initial_concurrency=2.0)
+    running = peak = 0
+
+    async def call() -> None:
+        nonlocal running, peak
+        async with limiter.slot(10):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.parametrize("make", [lambda tmp: InProcessBudget(60, 1000), lambda tmp: FileBudget(tmp / "b.json", 60, 1000)])
+def test_budget_reserves_refunds_and_pauses(make: Any, tmp_path: Path) -> None:
+    budget = make(tmp_path)
+
+    assert budget.reserve(1, 900) == 0
+    assert budget.reserve(1, 900) > 0  # tokens exhausted: seconds to wait
+    budget.adjust(800)  # the call used fewer tokens than estimated
+    assert budget.reserve(1, 900) == 0
+    budget.pause(30)
+    assert budget.reserve(1, 1) == pytest.approx(30, abs=1)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from agentic_core.write_behind import WriteBehindBuffer
+
+
+class _Sink:
+    """``flush`` callable recording batches; can be slowed down or made to fail."""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.batches: List[List[int]] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, rows: List[int]) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("db unavailable")
+            self.batches.append(list(rows))
+        finally:
+            self.active -= 1
+
+    @property
+    def rows(self) -> List[int]:
+        return [row for batch in self.batches for row in batch]
+
+
+async def test_full_batches_flush_without_waiting_for_the_delay() -> None:
+    sink = _Sink()
+    async with WriteBehindBuffer(sink, max_rows=3, max_delay=60) as buffer:
+        for row in range(6):
+            await buffer.add(row)
+        await asyncio.sleep(0.01)
+        assert sink.batches == [[0, 1, 2], [3, 4, 5]]
+
+
+async def test_partial_batch_flushes_after_max_delay() -> None:
+    sink = _Sink()
+    async with WriteBehindBuffer(sink, max_rows=10, max_delay=0.05) as buffer:
+        await buffer.add(1)
+        await asyncio.sleep(0.01)
+        assert sink.batches == []
+        await asyncio.sleep(0.1)
+        assert sink.batches == [[1]]
+
+
+async def test_leaving_the_block_flushes_the_rest() -> None:
+    sink = _Sink()
+    async with WriteBehindBuffer(sink, max_rows=10, max_delay=60) as buffer:
+        await buffer.add(1)
+        await buffer.add(2)
+    assert sink.batches == [[1, 2]]
+
+
+async def test_add_waits_while_max_pending_rows_are_outstanding() -> None:
+    sink = _Sink(delay=0.05)
+    async with WriteBehindBuffer(sink, max_rows=2, max_delay=0, max_pending=2) as buffer:
+        await buffer.add(1)
+        await buffer.add(2)
+        blocked = asyncio.ensure_future(buffer.add(3))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        await asyncio.wait_for(blocked, timeout=1)
+    assert sink.rows == [1, 2, 3]
+
+
+async def test_explicit_flush_never_overlaps_the_background_writer() -> None:
+    sink = _Sink(delay=0.02)
+    async with WriteBehindBuffer(sink, max_rows=2, max_delay=0, max_pending=100) as buffer:
+        for row in range(5):
+            await buffer.add(row)
+        await asyncio.gather(buffer.flush(), buffer.flush())
+        # Everything added before flush() is written once it returns
+        assert sorted(sink.rows) == [0, 1, 2, 3, 4]
+    assert sink.max_active == 1
+    assert sorted(sink.rows) == [0, 1, 2, 3, 4]
+
+
+async def test_failed_flush_keeps_its_rows_and_retries() -> None:
+    sink = _Sink(failures=1)
+    async with WriteBehindBuffer(sink, max_rows=2, max_delay=0, max_retries=3) as buffer:
+        await buffer.add(1)
+        await buffer.add(2)
+        await asyncio.sleep(0.3)  # first attempt fails, the retry backs off 0.2 s
+        assert sink.batches == [[1, 2]]
+
+
+async def test_buffer_fails_after_max_retries() -> None:
+    sink = _Sink(failures=100)
+    buffer: WriteBehindBuffer[int] = WriteBehindBuffer(sink, max_rows=1, max_delay=0, max_retries=2)
+    await buffer.add(1)
+    with pytest.raises(ConnectionError):
+        await buffer.flush()
+    with pytest.raises(ConnectionError):
+        await buffer.add(2)
+    with pytest.raises(ConnectionError):
+        await buffer.aclose()
+    assert sink.batches == []
@@ -4,24 +4,34 @@ Run locally with:
 
     uv run python worker.py
 
-The worker consumes messages from the `worker_jobs` pgmq queue in Supabase.
+The worker consumes messages from the priority lanes in ``WORKER_LANES``
+(``worker_jobs_interactive``, ``worker_jobs``, ``worker_jobs_bulk`` by default).
 A message is expected to be JSON of the form:
 
     {
         "run_id": "<uuid of workflow_runs row>",
-        "audience_name": "local_business",  # must exist in AUDIENCE_CONFIGS
+        "audience_name": "local_business",  # must exist in the audience registry
         "location": "San Francisco",
         "max_prospects": 5
     }
 
+A ``run`` job searches and fans out one ``analyze`` sub-job per batch of
+prospect URLs (``{"kind": "analyze", "run_id", "batch_index", "urls",
+"source_query"}``); the run completes when its last batch settles.
+
 The queue guarantees at-least-once delivery. The worker ACKs the message
-only after the workflow completes without raising an exception.
+only after the workflow completes without raising an exception. Failed jobs
+are retried with exponential delay; after ``WORKER_MAX_ATTEMPTS`` they move to
+the ``worker_jobs_dlq`` queue and their run is marked failed.
+
+Up to ``WORKER_CONCURRENCY`` jobs run concurrently on one long-lived event loop
+that keeps the browser pool warm between jobs. SIGTERM drains in-flight jobs.
 """
 from __future__ import annotations
 
 import asyncio
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -35,19 +45,41 @@ _here = Path(__file__).resolve().parent
 load_dotenv(_here / ".env", override=False)
 load_dotenv(_here.parent.parent / ".env", override=False)
 
+from agentic_core.browser_pool import close_browser_pool
+from agentic_core.llm_cache import install_llm_cache_from_env
+from agentic_core.logging import configure_logging, shutdown_logging
+from agentic_core.metrics import start_metrics_from_env
+from agentic_core.rate_limit import install_rate_limiter
+from agentic_core.spans import span, start_spans_from_env, write_spans
+from db_pool import close_db_pool
+from queue_lanes import lanes_from_env
 from supabase_io import JobConsumer
-from db_workflow import run_workflow_to_db
+from db_workflow import analyze_batch_to_db, run_workflow_to_db
+from workflows.website_prospector.config.audience_registry import close_audience_registry
 
 # Default overrides
 DEFAULT_AUDIENCE = os.getenv("DEFAULT_AUDIENCE", "local_business")
 DEFAULT_LOCATION = os.getenv("DEFAULT_LOCATION", "San Francisco")
 DEFAULT_MAX_PROSPECTS = int(os.getenv("MAX_PROSPECTS", "5"))
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+WORKER_VISIBILITY_TIMEOUT = int(os.getenv("WORKER_VISIBILITY_TIMEOUT", "60"))
+WORKER_MAX_ATTEMPTS = int(os.getenv("WORKER_MAX_ATTEMPTS", "5"))
+WORKER_RETRY_BASE_DELAY = float(os.getenv("WORKER_RETRY_BASE_DELAY", "5"))
+WORKER_FAIR_SHARE_LIMIT = int(os.getenv("WORKER_FAIR_SHARE_LIMIT") or 0) or None
+# Deadline budgets, as runner.py --run-timeout / --step-timeout (empty = none)
+WORKER_RUN_TIMEOUT = float(os.getenv("WORKER_RUN_TIMEOUT") or 0) or None
+WORKER_STEP_TIMEOUT = float(os.getenv("WORKER_STEP_TIMEOUT") or 0) or None
+WORKER_STEP_TIMEOUTS = {"default": WORKER_STEP_TIMEOUT} if WORKER_STEP_TIMEOUT else None
 
 
 class ProspectWorker(JobConsumer):
-    """Consumes jobs from pgmq and runs the workflow synchronously."""
+    """Consumes jobs from pgmq and runs the workflow on the shared event loop."""
+
+    async def handle_job(self, payload: Dict[str, Any]) -> None:  # noqa: D401
+        if payload.get("kind", "run") == "analyze":
+            await self._handle_analyze(payload)
+            return
 
-    def handle_job(self, payload: Dict[str, Any]) -> None:  # noqa: D401
         audience_name = payload.get("audience_name", DEFAULT_AUDIENCE)
         location = payload.get("location", DEFAULT_LOCATION)
         max_prospects = int(payload.get("max_prospects", DEFAULT_MAX_PROSPECTS))
@@ -56,19 +88,81 @@ class ProspectWorker(JobConsumer):
             f"[QUEUE] Received job – audience={audience_name} location={location} max={max_prospects}"
         )
 
-        # Run the async workflow in the event loop and block until done
-        asyncio.run(
-            run_workflow_to_db(
+        with span("run", cat="run", run_id=payload.get("run_id"), audience=audience_name):
+            enqueued = await run_workflow_to_db(
                 run_id=payload.get("run_id"),
                 audience_name=audience_name,
                 location=location,
                 max_prospects=max_prospects,
+                tenant_id=payload.get("tenant_id"),
+                run_timeout=WORKER_RUN_TIMEOUT,
+                step_timeouts=WORKER_STEP_TIMEOUTS,
             )
-        )
 
-        print("[QUEUE] Job completed successfully 🌟")
+        print(f"[QUEUE] Search done – fanned out {enqueued} batch job(s) 🌟")
+
+    async def _handle_analyze(self, payload: Dict[str, Any]) -> None:
+        run_id = payload["run_id"]
+        batch_index = int(payload["batch_index"])
+        urls = list(payload.get("urls") or [])
+        print(f"[QUEUE] Received batch {batch_index} of run {run_id} – {len(urls)} url(s)")
+
+        with span("batch", cat="run", run_id=run_id, batch_index=batch_index, urls=len(urls)):
+            status = await analyze_batch_to_db(
+                run_id=run_id,
+                batch_index=batch_index,
+                urls=urls,
+                source_query=payload.get("source_query"),
+                deadline=payload.get("deadline"),
+                step_timeouts=WORKER_STEP_TIMEOUTS,
+            )
+        print(f"[QUEUE] Batch {batch_index} settled – run is {status}")
+
+    async def on_shutdown(self) -> None:
+        await close_browser_pool()
+        await close_audience_registry()
+        await close_db_pool()
+        print("[QUEUE] Worker drained – bye 👋")
 
 
-if __name__ == "__main__":
+def preload() -> None:
+    """Import the lazily loaded heavy dependencies now.
+
+    The supervisor calls this before forking so every child shares the pages
+    and respawns skip the import cost.
+    """
+    import aiohttp  # noqa: F401
+    import asyncpg  # noqa: F401
+    import bs4  # noqa: F401
+    import playwright.async_api  # noqa: F401
+
+
+def main(stop_event: Optional[Any] = None) -> None:
+    """Run one worker process until SIGTERM (or ``stop_event`` is set)."""
     print("📡 Prospect worker starting – waiting for jobs…")
-    ProspectWorker().run_forever() 
\ No newline at end of file
+    configure_logging()
+    snapshot_writer = start_metrics_from_env()
+    start_spans_from_env()
+    install_rate_limiter()
+    install_llm_cache_from_env()
+    try:
+        asyncio.run(
+            ProspectWorker(
+                max_in_flight=WORKER_CONCURRENCY,
+                visibility_timeout=WORKER_VISIBILITY_TIMEOUT,
+                max_attempts=WORKER_MAX_ATTEMPTS,
+                retry_base_delay=WORKER_RETRY_BASE_DELAY,
+                lanes=lanes_from_env(),
+                fair_share_limit=WORKER_FAIR_SHARE_LIMIT,
+                stop_event=stop_event,
+            ).run_forever()
+        )
+    finally:
+        if snapshot_writer is not None:
+            snapshot_writer.stop()
+        write_spans()
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -1,18 +1,29 @@
-"""Registry and helpers for available agentic workflows."""
+"""Registry and helpers for available agentic workflows.
+
+Entries are ``"module:attribute"`` strings resolved on first use, so importing
+this package (e.g. from ``runner.py --help``) does not pull in any workflow's
+agents, browser or HTTP dependencies.
+"""
+
+from __future__ import annotations
 
 from importlib import import_module
-from typing import Dict, Type
+from typing import TYPE_CHECKING, Dict, Type
 
-from agentic_core.orchestrator import BaseWorkflow
+if TYPE_CHECKING:
+    from agentic_core.orchestrator import BaseWorkflow
 
 _WORKFLOW_REGISTRY: Dict[str, str] = {
-    "website_prospector": "apps.workflow.workflows.website_prospector",  # module path
+    "website_prospector": "workflows.website_prospector.pipeline:Workflow",
 }
 
 
+def available_workflows() -> list[str]:
+    return sorted(_WORKFLOW_REGISTRY)
+
+
 def get_workflow_class(name: str) -> Type[BaseWorkflow]:
     if name not in _WORKFLOW_REGISTRY:
         raise KeyError(f"Unknown workflow: {name}")
-    module_path = _WORKFLOW_REGISTRY[name]
-    mod = import_module(f"{module_path}.pipeline")
-    return getattr(mod, "Workflow") 
\ No newline at end of file
+    module_path, _, attr = _WORKFLOW_REGISTRY[name].partition(":")
+    return getattr(import_module(module_path), attr)
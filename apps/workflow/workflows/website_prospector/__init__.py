@@ -1,7 +1,22 @@
-"""Website Prospector workflow package (refactored)."""
+"""Website Prospector workflow package (refactored).
+
+The workflow class is resolved lazily so importing a submodule (types,
+config, a single tool) does not load the agents and the whole pipeline.
+"""
+
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    if name == "WebsiteProspectorWorkflow":
+        from workflows.website_prospector.pipeline import Workflow
+
+        return Workflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from workflows.website_prospector.pipeline import Workflow as WebsiteProspectorWorkflow  # noqa: F401
 
 def get_workflow(*args, **kwargs):  # type: ignore[override]
     """Factory used by the runner registry."""
-    return WebsiteProspectorWorkflow(*args, **kwargs) 
\ No newline at end of file
+    from workflows.website_prospector.pipeline import Workflow
+
+    return Workflow(*args, **kwargs)
@@ -0,0 +1,244 @@
+"""In-process audience registry backed by the ``audiences`` table.
+
+``AUDIENCE_CONFIGS`` ships the built-in defaults; the ``audiences.config``
+jsonb column (edited from the dashboard) overrides them field by field. The
+registry loads every row once into a per-process cache and compiles each
+audience up front:
+
+* ``queries`` – the ``search_patterns`` × ``keywords`` expansion, with only
+  ``{location}`` left to fill in per run;
+* ``id`` – the ``audiences`` primary key, so creating a run needs no name lookup.
+
+Lookups inside the TTL are pure dict reads:
+
+    audience = await get_audience("local_business")
+    if audience is None:
+        raise ValueError("Unknown audience")
+    queries = audience.queries("Austin")
+
+An update trigger sends ``NOTIFY audiences_changed`` and the registry reloads
+as soon as it arrives, so dashboard edits reach running workers without a
+restart. It listens on the process-wide ``db_pool`` notify connection, which
+the queue wake-ups share; the TTL is the safety net when that is down. Without
+``DATABASE_URL`` (or while the database is unreachable) the built-in configs
+are served.
+
+Env-vars: ``AUDIENCE_CACHE_TTL`` (seconds, default 300).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from agentic_core.metrics import registry, timed
+from workflows.website_prospector.config.audience_configs import AUDIENCE_CONFIGS
+from workflows.website_prospector.types import AudienceConfig, AudienceType
+
+logger = logging.getLogger(__name__)
+
+AUDIENCE_CACHE_TTL = float(os.getenv("AUDIENCE_CACHE_TTL", "300"))
+# Retry a failed load sooner than a full TTL
+RETRY_AFTER = 30.0
+CHANGE_CHANNEL = "audiences_changed"
+
+
+# ---------------------------------------------------------------------------
+# Compiled audiences
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CompiledAudience:
+    """One audience with its search queries precomputed."""
+
+    name: str
+    config: AudienceConfig
+    id: Optional[str]
+    query_templates: Tuple[str, ...]
+
+    def queries(self, location: str) -> List[str]:
+        """Search queries for ``location`` (pattern × keyword already expanded)."""
+        return [template.replace("{location}", location) for template in self.query_templates]
+
+
+def compile_audience(name: str, config: AudienceConfig, audience_id: Optional[str] = None) -> CompiledAudience:
+    templates: Dict[str, None] = {}
+    for pattern in config.search_patterns:
+        for keyword in config.keywords:
+            templates[pattern.replace("{keyword}", keyword)] = None
+    return CompiledAudience(name=name, config=config, id=audience_id, query_templates=tuple(templates))
+
+
+def merge_config(name: str, description: Optional[str], overrides: Mapping[str, Any]) -> AudienceConfig:
+    """Apply a row's ``config`` jsonb on top of the built-in defaults."""
+    base = AUDIENCE_CONFIGS.get(name)
+    if base is not None:
+        fields = base.model_dump()
+    else:
+        fields = {
+            "audience_type": name if name in AudienceType._value2member_map_ else AudienceType.LOCAL_BUSINESS,
+            "scoring_weights": {},
+            "improvement_focuses": [],
+            "budget_range": (0, 0),
+            "pitch_tone": "professional",
+        }
+    if description:
+        fields["description"] = description
+    fields.update({key: value for key, value in overrides.items() if key in AudienceConfig.model_fields})
+    return AudienceConfig(**fields)
+
+
+def _builtin() -> Dict[str, CompiledAudience]:
+    return {name: compile_audience(name, config) for name, config in AUDIENCE_CONFIGS.items()}
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+class AudienceRegistry:
+    """TTL cache of compiled audiences, reloaded on ``NOTIFY audiences_changed``."""
+
+    def __init__(self, ttl: float = AUDIENCE_CACHE_TTL, dsn: Optional[str] = None):
+        self.ttl = ttl
+        self.dsn = dsn if dsn is not None else os.getenv("DATABASE_URL")
+        self._audiences: Dict[str, CompiledAudience] = _builtin()
+        self._versions: Dict[str, Any] = {}
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+        self._listening = False
+        # Reloads started by NOTIFY; held so they are not garbage-collected mid-flight
+        self._pending: Set["asyncio.Task[None]"] = set()
+        self._reloads = registry.counter("audience_registry_reloads_total")
+        self._hits = registry.counter("audience_registry_hits_total")
+
+    # -------------------------------------------------------------- lookups
+    async def get(self, name: str) -> Optional[CompiledAudience]:
+        """Compiled audience ``name`` (``None`` if unknown), refreshed when stale."""
+        if time.monotonic() >= self._expires:
+            await self.refresh(force=False)
+        else:
+            self._hits.inc()
+        return self._audiences.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._audiences)
+
+    # -------------------------------------------------------------- loading
+    async def refresh(self, force: bool = True) -> None:
+        """Reload every audience; concurrent callers share one query."""
+        async with self._lock:
+            if not force and time.monotonic() < self._expires:
+                return
+            if not self.dsn:
+                self._expires = float("inf")
+                return
+            try:
+                rows = await self._load()
+            except Exception as exc:  # noqa: BLE001 – keep serving the cached configs
+                logger.warning("audience_registry_load_failed", extra={"error": str(exc)})
+                self._expires = time.monotonic() + min(self.ttl, RETRY_AFTER)
+                return
+            changed = self._apply(rows)
+            self._expires = time.monotonic() + self.ttl
+            self._reloads.inc()
+            await self._ensure_listener()
+
+        if changed:
+            logger.info("audience_registry_reloaded", extra={"changed": sorted(changed)})
+
+    async def _load(self) -> List[Any]:
+        from db_pool import get_db_pool
+
+        pool = await get_db_pool()
+        with timed("db_read", table="audiences"):
+            return await pool.fetch("select id, name, description, config, updated_at from audiences")
+
+    def _apply(self, rows: Iterable[Any]) -> FrozenSet[str]:
+        audiences = _builtin()
+        versions: Dict[str, Any] = {}
+        for row in rows:
+            name = row["name"]
+            try:
+                config = merge_config(name, row["description"], row["config"] or {})
+            except Exception as exc:  # noqa: BLE001 – skip a broken row, keep the rest
+                logger.warning("audience_config_invalid", extra={"audience": name, "error": str(exc)})
+                if name in self._audiences:
+                    audiences[name] = self._audiences[name]
+                    versions[name] = self._versions.get(name)
+                continue
+            audiences[name] = compile_audience(name, config, str(row["id"]))
+            versions[name] = (row["id"], row["updated_at"], row["description"], row["config"])
+
+        changed = frozenset(
+            name
+            for name in audiences.keys() | self._audiences.keys()
+            if name not in audiences or name not in self._audiences or versions.get(name) != self._versions.get(name)
+        )
+        self._audiences, self._versions = audiences, versions
+        return changed
+
+    # -------------------------------------------------------- notifications
+    async def _ensure_listener(self) -> None:
+        # A failed connect is logged by the listener; the TTL still picks up changes
+        from db_pool import get_notify_listener
+
+        listener = await get_notify_listener()
+        if not self._listening:
+            self._listening = True
+            await listener.listen(CHANGE_CHANNEL, self._on_notify)
+        elif not listener.connected:
+            await listener.connect()
+
+    def _on_notify(self, payload: str) -> None:
+        logger.info("audience_changed", extra={"audience": payload})
+        self._expires = 0.0
+        task = asyncio.get_running_loop().create_task(self.refresh(force=False))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def close(self) -> None:
+        for task in list(self._pending):
+            task.cancel()
+        if self._listening:
+            from db_pool import get_notify_listener
+
+            await (await get_notify_listener()).unlisten(CHANGE_CHANNEL, self._on_notify)
+            self._listening = False
+
+
+# ---------------------------------------------------------------------------
+# Process-wide registry
+# ---------------------------------------------------------------------------
+
+_registry: Optional[AudienceRegistry] = None
+_registry_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_audience_registry() -> AudienceRegistry:
+    """Registry bound to the running event loop (created lazily)."""
+    global _registry, _registry_loop
+
+    loop = asyncio.get_running_loop()
+    if _registry is None or _registry_loop is not loop:
+        # The lock and the listener subscription belong to one loop
+        _registry, _registry_loop = AudienceRegistry(), loop
+    return _registry
+
+
+async def get_audience(name: str) -> Optional[CompiledAudience]:
+    return await get_audience_registry().get(name)
+
+
+async def close_audience_registry() -> None:
+    global _registry, _registry_loop
+
+    if _registry is not None:
+        await _registry.close()
+    _registry, _registry_loop = None, None
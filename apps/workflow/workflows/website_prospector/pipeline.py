@@ -3,19 +3,58 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, List
+import json
+from typing import Any, Dict, List, Optional, Tuple
 from agents import Runner
+from pydantic import BaseModel
 from supabase_io import (
     create_workflow_run,
     insert_prospects,
-    insert_site_analyses,
-    insert_contacts,
+    insert_prospect_results,
     complete_workflow_run,
     fail_workflow_run,
 )
 
-from agentic_core.orchestrator import BaseWorkflow
+from agentic_core.metrics import timed
+from agentic_core.orchestrator import BaseWorkflow, StepTimeoutError
+from agentic_core.spans import span
+from agentic_core.write_behind import WriteBehindBuffer
 from workflows.website_prospector.agents import analysis_agent, contact_agent, search_agent
+from workflows.website_prospector.config.audience_registry import get_audience
+
+_TIMED_OUT: Dict[str, Any] = {"status": "timed_out"}
+
+
+async def _run_agent(agent: Any, prompt: str) -> Any:
+    """``Runner.run`` with LLM call metrics."""
+    with timed("llm_call", agent=agent.name):
+        return await Runner.run(agent, prompt, max_turns=3)
+
+
+def _as_json(output: Any) -> Dict[str, Any]:
+    """Agent output as a JSON object; text that is not one is kept under ``raw``."""
+    if isinstance(output, BaseModel):
+        return output.model_dump(mode="json")
+    if isinstance(output, dict):
+        return output
+    text = str(output).strip()
+    if text.startswith("```"):
+        # ```json fenced answer
+        text = text.strip("`").removeprefix("json").strip()
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        parsed = None
+    return parsed if isinstance(parsed, dict) else {"raw": str(output)}
+
+
+async def _write_results(rows: List[Tuple[Optional[str], Dict[str, Any], Dict[str, Any]]]) -> None:
+    """Flush ``(prospect_id, analysis, contacts)`` rows in one transaction."""
+    await insert_prospect_results(
+        [pid for pid, _, _ in rows],
+        [analysis for _, analysis, _ in rows],
+        [contact for _, _, contact in rows],
+    )
 
 
 class Workflow(BaseWorkflow):
@@ -40,7 +79,10 @@ class Workflow(BaseWorkflow):
     async def run(self) -> Any:  # noqa: D401
         """Execute prospect → analysis → contact extraction flow."""
         # Insert / mark workflow run in DB
-        db_run_id = create_workflow_run(self.audience_name, self.location)
+        audience = await get_audience(self.audience_name)
+        db_run_id = await create_workflow_run(
+            self.audience_name, self.location, audience_id=audience.id if audience else None
+        )
 
         try:
             # Step 1 – Search
@@ -50,7 +92,7 @@ class Workflow(BaseWorkflow):
             )
             prospects_result = await self.step(
                 "search",
-                Runner.run(search_agent, search_prompt, max_turns=3),
+                _run_agent(search_agent, search_prompt),
             )
 
             # Extract URL list from agent output
@@ -60,43 +102,60 @@ class Workflow(BaseWorkflow):
                 if line.strip().startswith("http")
             ][: self.max_prospects]
 
-            analyses: list[str] = []
-            for url in urls:
-                resp = await self.step(
-                    "analysis",
-                    Runner.run(
-                        analysis_agent,
-                        f"Please analyse the website at {url} and return a JSON object with key metrics.",
-                        max_turns=3,
-                    ),
-                )
-                analyses.append(str(resp.final_output))
-
-            contacts: list[str] = []
-            for url in urls:
-                resp_c = await self.step(
-                    "contacts",
-                    Runner.run(
-                        contact_agent,
-                        f"Extract contact info for {url} and respond in JSON format.",
-                        max_turns=3,
-                    ),
-                )
-                contacts.append(str(resp_c.final_output))
-
-            # Persist into DB
-            insert_prospects(db_run_id, urls)
-            insert_site_analyses(urls, analyses)
-            insert_contacts(urls, contacts)
-            complete_workflow_run(db_run_id)
+            # Prospects are written up front so the dashboard sees them at
+            # once; each prospect's analysis and contacts follow through the
+            # write-behind buffer as soon as both are done.
+            prospect_ids = await insert_prospects(db_run_id, urls)
+
+            # A timed-out step records a placeholder; once the run budget is
+            # spent we stop, and the buffer persists what was gathered so far.
+            analyses: List[Dict[str, Any]] = []
+            contacts: List[Dict[str, Any]] = []
+            async with WriteBehindBuffer(_write_results, name="prospect_results") as results:
+                for url in urls:
+                    with span("item", cat="item", url=url):
+                        try:
+                            resp = await self.step(
+                                "analysis",
+                                _run_agent(
+                                    analysis_agent,
+                                    f"Please analyse the website at {url} and return a JSON object with key metrics.",
+                                ),
+                            )
+                            analysis = _as_json(resp.final_output)
+                        except StepTimeoutError:
+                            if self.deadline_expired:
+                                break
+                            analysis = _TIMED_OUT
+
+                        try:
+                            resp_c = await self.step(
+                                "contacts",
+                                _run_agent(
+                                    contact_agent,
+                                    f"Extract contact info for {url} and respond in JSON format.",
+                                ),
+                            )
+                            contact = _as_json(resp_c.final_output)
+                        except StepTimeoutError:
+                            contact = _TIMED_OUT
+
+                        analyses.append(analysis)
+                        contacts.append(contact)
+                        await results.add((prospect_ids.get(url), analysis, contact))
+                        if self.deadline_expired:
+                            break
+
+            await complete_workflow_run(db_run_id)
 
             summary = {
                 "prospects": urls,
                 "analyses": analyses,
                 "contacts": contacts,
+                "partial": self.deadline_expired or _TIMED_OUT in analyses + contacts,
             }
             return summary
 
         except Exception as exc:
-            fail_workflow_run(db_run_id)
+            await fail_workflow_run(db_run_id)
             raise 
\ No newline at end of file
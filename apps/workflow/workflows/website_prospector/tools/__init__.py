@@ -1,7 +1,22 @@
-"""Tools for the website prospector."""
+"""Tools for the website prospector.
 
-from workflows.website_prospector.tools.analyze_site import analyze_prospect_website  # noqa: F401
-from workflows.website_prospector.tools.contact import extract_contact_info  # noqa: F401 
-from workflows.website_prospector.tools.search import search_prospects_for_audience  # noqa: F401
+Tools are imported on first attribute access, so importing one tool module
+does not load the others.
+"""
 
-__all__ = ["analyze_prospect_website", "extract_contact_info", "search_prospects_for_audience"]
\ No newline at end of file
+from importlib import import_module
+from typing import Any
+
+_TOOLS = {
+    "analyze_prospect_website": "workflows.website_prospector.tools.analyze_site",
+    "extract_contact_info": "workflows.website_prospector.tools.contact",
+    "search_prospects_for_audience": "workflows.website_prospector.tools.search",
+}
+
+__all__ = list(_TOOLS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _TOOLS:
+        return getattr(import_module(_TOOLS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
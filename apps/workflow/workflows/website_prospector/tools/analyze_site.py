@@ -4,6 +4,8 @@ from typing import List
 from agents import Agent, function_tool
 from pydantic import BaseModel
 
+from agentic_core.spans import span
+
 from workflows.website_prospector.types import (
     Prospect, SiteAnalysis 
 )
@@ -15,8 +17,7 @@ class AnalysisResult(BaseModel):
     analysis: SiteAnalysis
     improvement_suggestions: List[str]
 
-@function_tool
-async def analyze_prospect_website(prospect_url: str) -> AnalysisResult:
+async def analyze_website(prospect_url: str) -> AnalysisResult:
     """Analyze a prospect's website for improvement opportunities."""
     # Create a Prospect object for analysis
     prospect = Prospect(url=prospect_url, business_name="Unknown")
@@ -31,7 +32,8 @@ async def analyze_prospect_website(prospect_url: str) -> AnalysisResult:
     }
     
     analyzer = SiteAnalyzer()
-    analysis = await analyzer.analyze_site(prospect, scoring_weights)
+    with span("tool:analyze_website", cat="tool", url=prospect_url):
+        analysis = await analyzer.analyze_site(prospect, scoring_weights)
     
     if not analysis:
         raise ValueError(f"Failed to analyze website: {prospect_url}")
@@ -53,4 +55,7 @@ async def analyze_prospect_website(prospect_url: str) -> AnalysisResult:
         analysis=analysis,
         improvement_suggestions=suggestions
     )
- 
\ No newline at end of file
+
+
+# Agent-facing tool; ``analyze_website`` stays callable for deterministic pipelines
+analyze_prospect_website = function_tool(analyze_website, name_override="analyze_prospect_website")
@@ -1,13 +1,18 @@
 """Extract contact information from a prospect's website."""
 
 import re
-from playwright.async_api import async_playwright
 from typing import List, Optional
 from pathlib import Path
+from urllib.parse import urljoin
 
 from agents import Agent, Runner, function_tool
 from pydantic import BaseModel
 
+from agentic_core.browser_pool import get_browser_pool
+from agentic_core.hedging import hedge_delay, hedged
+from agentic_core.metrics import timed
+from agentic_core.spans import span
+
 from workflows.website_prospector.types import (
     Prospect, SiteAnalysis, AudienceConfig, WorkflowState
 )
@@ -23,52 +28,80 @@ class ContactInfo(BaseModel):
     social_links: List[str] = []
 
 
-@function_tool
-async def extract_contact_info(prospect_url: str) -> ContactInfo:
-    """Extract contact information from a prospect's website."""
+# Hedge delay used until enough page loads have been observed for a p95
+NAV_HEDGE_DEFAULT = 10.0
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b')
+SOCIAL_PATTERNS = ['facebook.com', 'twitter.com', 'linkedin.com', 'instagram.com']
+
+
+def parse_contact_info(content: str, base_url: str) -> ContactInfo:
+    """Extract contact details from page HTML."""
+    # Extract emails (deduplicated in page order, so the kept ones are stable)
+    emails = list(dict.fromkeys(EMAIL_PATTERN.findall(content)))
     
+    # Extract phone numbers (basic pattern)
+    phones = list(dict.fromkeys(f"({match[0]}) {match[1]}-{match[2]}" for match in PHONE_PATTERN.findall(content)))
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        try:
+    from bs4 import BeautifulSoup  # deferred – only needed once a page is fetched
+
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # Look for contact page
+    contact_page_url = None
+    contact_link = soup.select_one('a[href*="contact"]')
+    if contact_link and contact_link.get('href'):
+        contact_page_url = urljoin(base_url, contact_link['href'])
+    
+    # Look for social media links
+    social_links = []
+    for pattern in SOCIAL_PATTERNS:
+        for element in soup.select(f'a[href*="{pattern}"]'):
+            href = element.get('href')
+            if href and href not in social_links:
+                social_links.append(href)
+    
+    return ContactInfo(
+        emails=emails[:5],  # Limit to 5 emails
+        phones=phones[:3],  # Limit to 3 phones
+        contact_page_url=contact_page_url,
+        social_links=social_links[:5]  # Limit to 5 social links
+    )
+
+
+async def _fetch_rendered(prospect_url: str) -> str:
+    async with get_browser_pool().lease() as context:
+        page = await context.new_page()
+        with timed("browser_page_load", tool="contact"):
             await page.goto(prospect_url, wait_until='networkidle', timeout=30000)
-            content = await page.content()
-            
-            # Extract emails
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = list(set(re.findall(email_pattern, content)))
-            
-            # Extract phone numbers (basic pattern)
-            phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b'
-            phones = list(set([f"({match[0]}) {match[1]}-{match[2]}" for match in re.findall(phone_pattern, content)]))
-            
-            # Look for contact page
-            contact_links = await page.query_selector_all('a[href*="contact"]')
-            contact_page_url = None
-            if contact_links:
-                href = await contact_links[0].get_attribute('href')
-                if href:
-                    from urllib.parse import urljoin
-                    contact_page_url = urljoin(prospect_url, href)
-            
-            # Look for social media links
-            social_patterns = ['facebook.com', 'twitter.com', 'linkedin.com', 'instagram.com']
-            social_links = []
-            for pattern in social_patterns:
-                social_elements = await page.query_selector_all(f'a[href*="{pattern}"]')
-                for element in social_elements:
-                    href = await element.get_attribute('href')
-                    if href and href not in social_links:
-                        social_links.append(href)
-            
-            return ContactInfo(
-                emails=emails[:5],  # Limit to 5 emails
-                phones=phones[:3],  # Limit to 3 phones
-                contact_page_url=contact_page_url,
-                social_links=social_links[:5]  # Limit to 5 social links
-            )
-            
-        finally:
-            await browser.close()
+        return await page.content()
+
+
+async def _fetch_static(prospect_url: str) -> str:
+    """Plain HTTP fetch – the hedge for slow rendered loads."""
+    import aiohttp
+
+    timeout = aiohttp.ClientTimeout(total=30)
+    with timed("static_fetch", tool="contact"):
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(prospect_url) as resp:
+                resp.raise_for_status()
+                return await resp.text(errors="replace")
+
+
+async def fetch_contact_info(prospect_url: str) -> ContactInfo:
+    """Extract contact information from a prospect's website."""
+    with span("tool:fetch_contact_info", cat="tool", url=prospect_url):
+        content = await hedged(
+            lambda: _fetch_rendered(prospect_url),
+            lambda: _fetch_static(prospect_url),
+            delay=hedge_delay("browser_page_load", NAV_HEDGE_DEFAULT, tool="contact"),
+            name="contact_navigation",
+        )
+        with span("parse_contact_info", cat="evaluate"):
+            return parse_contact_info(content, prospect_url)
+
+
+# Agent-facing tool; ``fetch_contact_info`` stays callable for deterministic pipelines
+extract_contact_info = function_tool(fetch_contact_info, name_override="extract_contact_info")
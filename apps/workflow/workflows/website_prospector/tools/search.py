@@ -4,10 +4,13 @@ from typing import List
 from agents import Agent, Runner, function_tool, WebSearchTool
 from pydantic import BaseModel
 
+from agentic_core.metrics import timed
+from agentic_core.spans import span
+
 from workflows.website_prospector.types import (
     Prospect, SiteAnalysis, AudienceConfig, WorkflowState
 )
-from workflows.website_prospector.config.audience_configs import AUDIENCE_CONFIGS
+from workflows.website_prospector.config.audience_registry import get_audience
 
 class ProspectSearchResult(BaseModel):
     """Result from prospect search."""
@@ -15,19 +18,16 @@ class ProspectSearchResult(BaseModel):
     search_query: str
     audience_used: str
 
-@function_tool
-async def search_prospects_for_audience(audience_name: str, location: str = "San Francisco") -> ProspectSearchResult:
+async def search_prospects(audience_name: str, location: str = "San Francisco") -> ProspectSearchResult:
     """Search for prospects based on audience configuration using the built-in WebSearchTool."""
-    if audience_name not in AUDIENCE_CONFIGS:
+    audience = await get_audience(audience_name)
+    if audience is None:
         raise ValueError(f"Unknown audience: {audience_name}")
     
-    config = AUDIENCE_CONFIGS[audience_name]
+    config = audience.config
     
-    # Build a query list from patterns & keywords
-    queries: list[str] = []
-    for pattern in config.search_patterns:
-        for kw in config.keywords:
-            queries.append(pattern.format(keyword=kw, location=location))
+    # Patterns × keywords are expanded once per config load
+    queries = audience.queries(location)
 
     # Use an ad-hoc agent equipped with the hosted WebSearchTool
     search_agent = Agent(
@@ -43,27 +43,29 @@ async def search_prospects_for_audience(audience_name: str, location: str = "San
     prospects: list[Prospect] = []
     max_per_query = 5
 
-    for q in queries:
-        # Ask the agent for URLs
-        prompt = (
-            f"Search query: {q}\n"
-            f"Please provide up to {max_per_query} distinct business website URLs only."
-        )
-        try:
-            result = await Runner.run(search_agent, prompt, max_turns=3)
-            urls = [line.strip() for line in str(result.final_output).splitlines() if line.strip().startswith("http")]
-            for u in urls:
-                prospects.append(
-                    Prospect(
-                        url=u,
-                        business_name=u.split("//")[-1].split("/")[0],
-                        industry=audience_name,
-                        location=location,
+    with span("tool:search_prospects", cat="tool", audience=audience_name, queries=len(queries)):
+        for q in queries:
+            # Ask the agent for URLs
+            prompt = (
+                f"Search query: {q}\n"
+                f"Please provide up to {max_per_query} distinct business website URLs only."
+            )
+            try:
+                with timed("llm_call", agent=search_agent.name):
+                    result = await Runner.run(search_agent, prompt, max_turns=3)
+                urls = [line.strip() for line in str(result.final_output).splitlines() if line.strip().startswith("http")]
+                for u in urls:
+                    prospects.append(
+                        Prospect(
+                            url=u,
+                            business_name=u.split("//")[-1].split("/")[0],
+                            industry=audience_name,
+                            location=location,
+                        )
                     )
-                )
-        except Exception:
-            # Continue on any search error
-            continue
+            except Exception:
+                # Continue on any search error
+                continue
 
     # Deduplicate by URL
     unique = {}
@@ -78,3 +80,7 @@ async def search_prospects_for_audience(audience_name: str, location: str = "San
         search_query=f"{audience_name} in {location}",
         audience_used=audience_name
     )
+
+
+# Agent-facing tool; ``search_prospects`` stays callable for deterministic pipelines
+search_prospects_for_audience = function_tool(search_prospects, name_override="search_prospects_for_audience")
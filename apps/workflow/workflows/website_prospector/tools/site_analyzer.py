@@ -1,20 +1,32 @@
 """Website analysis tool using Playwright and various metrics."""
 
+from __future__ import annotations
+
 import asyncio
 import json
 import logging
 import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 from urllib.parse import urljoin, urlparse
-from playwright.async_api import async_playwright, Page, Browser
-from bs4 import BeautifulSoup
+
+from agentic_core.browser_pool import BrowserPool, get_browser_pool
+from agentic_core.hedging import hedge_delay, hedged
+from agentic_core.metrics import timed
+from agentic_core.spans import span
 
 from workflows.website_prospector.types import Prospect, SiteAnalysis
 
+if TYPE_CHECKING:  # heavy imports, resolved when a site is analysed
+    from bs4 import BeautifulSoup
+    from playwright.async_api import Page
+
 logger = logging.getLogger(__name__)
 
+# Hedge delay used until enough page loads have been observed for a p95
+NAV_HEDGE_DEFAULT = 10.0
+
 
 class SiteAnalyzer:
     """Analyzes websites for outdatedness and improvement opportunities."""
@@ -31,44 +43,50 @@ class SiteAnalyzer:
         """Perform comprehensive analysis of a website."""
         logger.info(f"Analyzing site: {prospect.url}")
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            
-            try:
-                analysis = await self._analyze_with_browser(browser, prospect, scoring_weights)
-                return analysis
-            except Exception as e:
-                logger.error(f"Failed to analyze {prospect.url}: {e}")
-                return None
-            finally:
-                await browser.close()
+        # Shared, long-lived browser – no Chromium launch per analysis
+        pool = get_browser_pool()
+        
+        try:
+            analysis = await self._analyze_with_browser(pool, prospect, scoring_weights)
+            return analysis
+        except Exception as e:
+            logger.error(f"Failed to analyze {prospect.url}: {e}")
+            return None
     
     async def _analyze_with_browser(
         self, 
-        browser: Browser, 
+        pool: BrowserPool, 
         prospect: Prospect, 
         scoring_weights: Dict[str, float]
     ) -> SiteAnalysis:
         """Analyze site using browser automation."""
-        page = await browser.new_page()
+        # Navigate to the site
+        page = await self._open_page(pool, str(prospect.url))
         
         try:
-            # Navigate to the site
-            await page.goto(str(prospect.url), wait_until='networkidle', timeout=30000)
             
             # Take screenshot
-            screenshot_path = await self._take_screenshot(page, prospect)
+            with span("screenshot", cat="evaluate"):
+                screenshot_path = await self._take_screenshot(page, prospect)
             
             # Get page content
-            content = await page.content()
-            html_soup = BeautifulSoup(content, 'html.parser')
+            with span("parse_html", cat="evaluate"):
+                content = await page.content()
+                from bs4 import BeautifulSoup
+
+                html_soup = BeautifulSoup(content, 'html.parser')
             
             # Perform various analyses
-            mobile_score = await self._analyze_mobile_responsiveness(page)
-            performance_score = await self._analyze_performance(page)
-            seo_score = self._analyze_seo(html_soup)
-            security_score = await self._analyze_security(page)
-            outdated_score = self._analyze_outdatedness(html_soup, content)
+            with span("evaluate:mobile", cat="evaluate"):
+                mobile_score = await self._analyze_mobile_responsiveness(page)
+            with span("evaluate:performance", cat="evaluate"):
+                performance_score = await self._analyze_performance(page)
+            with span("score:seo", cat="evaluate"):
+                seo_score = self._analyze_seo(html_soup)
+            with span("evaluate:security", cat="evaluate"):
+                security_score = await self._analyze_security(page)
+            with span("score:outdated", cat="evaluate"):
+                outdated_score = self._analyze_outdatedness(html_soup, content)
             
             # Calculate weighted overall score
             scores = {
@@ -83,7 +101,8 @@ class SiteAnalyzer:
             
             # Identify improvement areas
             improvement_areas = self._identify_improvement_areas(scores)
-            technical_issues = await self._identify_technical_issues(page, html_soup)
+            with span("evaluate:technical_issues", cat="evaluate"):
+                technical_issues = await self._identify_technical_issues(page, html_soup)
             
             return SiteAnalysis(
                 url=prospect.url,
@@ -99,7 +118,31 @@ class SiteAnalyzer:
             )
             
         finally:
-            await page.close()
+            await pool.release_context(page.context)
+    
+    async def _open_page(self, pool: BrowserPool, url: str) -> Page:
+        """Load ``url`` in a fresh context, hedging slow loads with a second context."""
+        async def attempt() -> Page:
+            context = await pool.acquire_context()
+            try:
+                page = await context.new_page()
+                with timed("browser_page_load", tool="site_analyzer"):
+                    await page.goto(url, wait_until='networkidle', timeout=30000)
+                return page
+            except BaseException:
+                await pool.release_context(context)
+                raise
+        
+        async def discard(page: Page) -> None:
+            await pool.release_context(page.context)
+        
+        return await hedged(
+            attempt,
+            attempt,
+            delay=hedge_delay("browser_page_load", NAV_HEDGE_DEFAULT, tool="site_analyzer"),
+            discard=discard,
+            name="site_analyzer_navigation",
+        )
     
     async def _take_screenshot(self, page: Page, prospect: Prospect) -> Optional[str]:
         """Take a screenshot of the website."""
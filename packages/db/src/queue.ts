@@ -1,11 +1,37 @@
-import { supabase } from "./client";
+import { eq } from "drizzle-orm";
+import { db, supabase } from "./client";
 import type { Database } from "./generated";
+import { audiences } from "./schema";
+
+// Priority lanes consumed by the Python worker (see apps/workflow/queue_lanes.py).
+// Dashboard requests default to the interactive lane so they are never stuck
+// behind a bulk backfill.
+export type JobLane = "interactive" | "default" | "bulk";
+
+const LANE_QUEUES: Record<JobLane, string> = {
+	interactive: "worker_jobs_interactive",
+	default: "worker_jobs",
+	bulk: "worker_jobs_bulk",
+};
 
 export async function queueProspectingJob(
 	audienceId: string,
 	location: string,
-	maxProspects: number
+	maxProspects: number,
+	lane: JobLane = "interactive"
 ) {
+	// The worker runs the audience by name and caps concurrent jobs per
+	// audience (fair share), so the payload carries the name, not just the id.
+	const [audience] = await db
+		.select({ name: audiences.name })
+		.from(audiences)
+		.where(eq(audiences.id, audienceId))
+		.limit(1);
+
+	if (!audience) {
+		throw new Error(`Unknown audience: ${audienceId}`);
+	}
+
 	// Insert a workflow_run entry with status 'queued'
 	const { data, error } = await supabase
 		.from("workflow_runs")
@@ -23,10 +49,12 @@ export async function queueProspectingJob(
 
 	// Enqueue a job via pgmq function (if available) – best-effort
 	await supabase.rpc("pgmq_enqueue", {
-		queue_name: "worker_jobs",
+		queue_name: LANE_QUEUES[lane],
 		payload: {
 			run_id: data.id,
-			max: maxProspects,
+			audience_name: audience.name,
+			location,
+			max_prospects: maxProspects,
 		},
 	});
 
@@ -0,0 +1,18 @@
+-- Wake idle workers as soon as a job is enqueued instead of relying on polling.
+-- Workers LISTEN on the "worker_jobs" channel (see apps/workflow/queue_wakeup.py).
+-- One NOTIFY per statement, so send_batch wakes workers once.
+create or replace function public.notify_worker_jobs()
+  returns trigger
+  language plpgsql
+as $$
+begin
+    perform pg_notify('worker_jobs', tg_table_name);
+    return null;
+end;
+$$;
+
+drop trigger if exists worker_jobs_notify on pgmq.q_worker_jobs;
+create trigger worker_jobs_notify
+    after insert on pgmq.q_worker_jobs
+    for each statement
+    execute function public.notify_worker_jobs();
@@ -0,0 +1,115 @@
+-- Fan-out / fan-in for workflow runs.
+--
+-- The search job of a run splits its prospects into batches and calls
+-- fan_out_run(), which records one workflow_sub_jobs row per batch and enqueues
+-- one "analyze" message per batch onto worker_jobs in the same transaction.
+-- p_fields (e.g. the fair-share tenant_id / audience_name) is copied into
+-- every sub-job message.
+-- Each worker that finishes a batch calls settle_sub_job(); the call that
+-- settles the last pending batch marks the run completed (or failed if every
+-- batch failed). Settling is idempotent, so redelivered messages are harmless.
+-- settle_sub_job is also called from the security-definer dead_letter_job
+-- (empty search_path), so it schema-qualifies every table.
+
+create table if not exists "workflow_sub_jobs" (
+	"run_id" uuid not null,
+	"batch_index" integer not null,
+	"url_count" integer not null,
+	"status" text default 'pending' not null,
+	"created_at" timestamp default now(),
+	"settled_at" timestamp,
+	primary key ("run_id", "batch_index")
+);
+
+DO $$ BEGIN
+ ALTER TABLE "workflow_sub_jobs" ADD CONSTRAINT "workflow_sub_jobs_run_id_workflow_runs_id_fk" FOREIGN KEY ("run_id") REFERENCES "workflow_runs"("id") ON DELETE cascade ON UPDATE no action;
+EXCEPTION
+ WHEN duplicate_object THEN null;
+END $$;
+
+create or replace function public.fan_out_run(
+    p_run_id uuid,
+    p_batches jsonb,
+    p_source_query text default null,
+    p_queue_name text default 'worker_jobs',
+    p_fields jsonb default '{}'::jsonb
+)
+  returns integer
+  language plpgsql
+as $$
+begin
+    perform 1 from workflow_runs where id = p_run_id for update;
+
+    -- A redelivered search job must not enqueue the batches twice
+    if exists (select 1 from workflow_sub_jobs where run_id = p_run_id) then
+        return 0;
+    end if;
+
+    insert into workflow_sub_jobs (run_id, batch_index, url_count)
+    select p_run_id, (t.ord - 1)::integer, jsonb_array_length(t.urls)
+    from jsonb_array_elements(p_batches) with ordinality as t(urls, ord);
+
+    perform pgmq.send_batch(
+        p_queue_name,
+        array(
+            select p_fields || jsonb_build_object(
+                'kind', 'analyze',
+                'run_id', p_run_id,
+                'batch_index', (t.ord - 1)::integer,
+                'urls', t.urls,
+                'source_query', p_source_query
+            )
+            from jsonb_array_elements(p_batches) with ordinality as t(urls, ord)
+        )
+    );
+
+    return jsonb_array_length(p_batches);
+end;
+$$;
+
+create or replace function public.settle_sub_job(
+    p_run_id uuid,
+    p_batch_index integer,
+    p_failed boolean
+)
+  returns text
+  language plpgsql
+  set search_path = ''
+as $$
+declare
+    v_pending integer;
+    v_failed integer;
+    v_total integer;
+    v_status text;
+begin
+    -- Serialise settlements of the same run
+    perform 1 from public.workflow_runs where id = p_run_id for update;
+
+    update public.workflow_sub_jobs
+       set status = case when p_failed then 'failed' else 'completed' end,
+           settled_at = now()
+     where run_id = p_run_id
+       and batch_index = p_batch_index
+       and status = 'pending';
+
+    select count(*) filter (where status = 'pending'),
+           count(*) filter (where status = 'failed'),
+           count(*)
+      into v_pending, v_failed, v_total
+      from public.workflow_sub_jobs
+     where run_id = p_run_id;
+
+    if v_pending > 0 then
+        return 'running';
+    end if;
+
+    v_status := case when v_failed = v_total then 'failed' else 'completed' end;
+    update public.workflow_runs
+       set status = v_status, finished_at = now()
+     where id = p_run_id and status = 'running';
+    return v_status;
+end;
+$$;
+
+grant execute on function public.fan_out_run(uuid, jsonb, text, text, jsonb) to service_role;
+grant execute on function public.settle_sub_job(uuid, integer, boolean) to service_role;
@@ -0,0 +1,55 @@
+-- Dead-letter queue for poison messages on worker_jobs.
+-- Workers call public.dead_letter_job once a message exceeds its max attempts
+-- (see JobConsumer in apps/workflow/supabase_io.py).
+select * from pgmq.create('worker_jobs_dlq');
+
+-- Atomically move a message to the DLQ with failure context and fail its run.
+-- "analyze" sub-jobs settle their batch as failed instead, so the run's
+-- fan-in still completes.
+create or replace function public.dead_letter_job(
+    p_msg_id bigint,
+    p_message jsonb,
+    p_error text,
+    p_read_ct integer,
+    p_queue_name text default 'worker_jobs'
+)
+  returns bigint
+  language plpgsql
+  security definer
+  set search_path = ''
+as $$
+declare
+    v_dlq_id bigint;
+    v_run_id uuid := nullif(p_message ->> 'run_id', '')::uuid;
+begin
+    select pgmq.send(
+        p_queue_name || '_dlq',
+        jsonb_build_object(
+            'message', p_message,
+            'error', p_error,
+            'source_queue', p_queue_name,
+            'source_msg_id', p_msg_id,
+            'read_ct', p_read_ct,
+            'dead_lettered_at', now()
+        )
+    ) into v_dlq_id;
+
+    perform pgmq.delete(p_queue_name, p_msg_id);
+
+    if v_run_id is not null then
+        if coalesce(p_message ->> 'kind', 'run') = 'analyze' then
+            perform public.settle_sub_job(v_run_id, (p_message ->> 'batch_index')::integer, true);
+        else
+            update public.workflow_runs
+               set status = 'failed',
+                   finished_at = now()
+             where id = v_run_id
+               and status not in ('completed', 'failed');
+        end if;
+    end if;
+
+    return v_dlq_id;
+end;
+$$;
+
+grant execute on function public.dead_letter_job(bigint, jsonb, text, integer, text) to service_role;
@@ -0,0 +1,53 @@
+-- Priority lanes for the prospect worker (see apps/workflow/queue_lanes.py):
+-- worker_jobs_interactive for dashboard runs, worker_jobs as the default lane
+-- and worker_jobs_bulk for backfills. Every lane has its own dead-letter queue.
+select * from pgmq.create('worker_jobs_interactive');
+select * from pgmq.create('worker_jobs_interactive_dlq');
+select * from pgmq.create('worker_jobs_bulk');
+select * from pgmq.create('worker_jobs_bulk_dlq');
+
+-- All lanes wake idle workers on the same channel.
+drop trigger if exists worker_jobs_notify on pgmq.q_worker_jobs_interactive;
+create trigger worker_jobs_notify
+    after insert on pgmq.q_worker_jobs_interactive
+    for each statement
+    execute function public.notify_worker_jobs();
+
+drop trigger if exists worker_jobs_notify on pgmq.q_worker_jobs_bulk;
+create trigger worker_jobs_notify
+    after insert on pgmq.q_worker_jobs_bulk
+    for each statement
+    execute function public.notify_worker_jobs();
+
+-- Fair-share deferral: hide an over-cap message for p_delay seconds (may be
+-- fractional), like pgmq.set_vt, and refund the read that delivered it. The message is not
+-- re-enqueued (no new row, enqueued_at kept), and deferrals never count
+-- towards the poison-message attempt limit.
+create or replace function public.defer_job(
+    p_queue_name text,
+    p_msg_id bigint,
+    p_delay double precision
+)
+  returns bigint
+  language plpgsql
+  security definer
+  set search_path = ''
+as $$
+declare
+    v_msg_id bigint;
+begin
+    execute format(
+        'update pgmq.%I
+            set vt = clock_timestamp() + make_interval(secs => $2),
+                read_ct = greatest(read_ct - 1, 0)
+          where msg_id = $1
+      returning msg_id',
+        'q_' || p_queue_name
+    )
+       into v_msg_id
+      using p_msg_id, p_delay;
+    return v_msg_id;
+end;
+$$;
+
+grant execute on function public.defer_job(text, bigint, double precision) to service_role;
@@ -0,0 +1,77 @@
+-- Persist a whole batch of prospects – prospect rows, site analyses and
+-- contacts – in one round trip and one transaction.
+--
+-- p_rows: [{"url", "source_query", "analysis": {"scores_json",
+--           "tech_issues_json", "analyzed_at"} | null,
+--           "contacts": [{"type", "value"}, ...]}, ...]
+--
+-- With p_batch_index the fanned-out sub-job is settled in the same
+-- transaction; a batch that already settled (redelivered message) writes
+-- nothing. Returns {"status": <run status>, "prospect_ids": {url: id}}.
+create or replace function public.persist_prospect_batch(
+    p_run_id uuid,
+    p_rows jsonb,
+    p_batch_index integer default null,
+    p_failed boolean default false
+)
+  returns jsonb
+  language plpgsql
+as $$
+declare
+    v_row jsonb;
+    v_prospect_id uuid;
+    v_ids jsonb := '{}'::jsonb;
+    v_status text;
+begin
+    if p_batch_index is not null then
+        -- Same lock settle_sub_job takes, so concurrent redeliveries serialise
+        perform 1 from workflow_runs where id = p_run_id for update;
+        perform 1
+           from workflow_sub_jobs
+          where run_id = p_run_id
+            and batch_index = p_batch_index
+            and status = 'pending';
+        if not found then
+            select status into v_status from workflow_runs where id = p_run_id;
+            return jsonb_build_object('status', v_status, 'prospect_ids', v_ids);
+        end if;
+    end if;
+
+    for v_row in select value from jsonb_array_elements(p_rows)
+    loop
+        -- Upsert on prospects_workflow_run_id_url_key (prospect_indexes
+        -- migration), so a URL repeated in the batch or already stored for
+        -- the run maps to its existing row instead of aborting the batch
+        insert into prospects (workflow_run_id, url, source_query)
+        values (p_run_id, v_row ->> 'url', v_row ->> 'source_query')
+        on conflict (workflow_run_id, url) do update set source_query = excluded.source_query
+        returning id into v_prospect_id;
+
+        v_ids := v_ids || jsonb_build_object(v_row ->> 'url', v_prospect_id);
+
+        if jsonb_typeof(v_row -> 'analysis') = 'object' then
+            insert into site_analyses (prospect_id, scores_json, tech_issues_json, analyzed_at)
+            values (
+                v_prospect_id,
+                v_row -> 'analysis' -> 'scores_json',
+                v_row -> 'analysis' -> 'tech_issues_json',
+                coalesce((v_row -> 'analysis' ->> 'analyzed_at')::timestamp, now())
+            );
+        end if;
+
+        insert into contacts (prospect_id, type, value)
+        select v_prospect_id, c ->> 'type', c ->> 'value'
+          from jsonb_array_elements(coalesce(v_row -> 'contacts', '[]'::jsonb)) as c;
+    end loop;
+
+    if p_batch_index is not null then
+        v_status := public.settle_sub_job(p_run_id, p_batch_index, p_failed);
+    else
+        select status into v_status from workflow_runs where id = p_run_id;
+    end if;
+
+    return jsonb_build_object('status', v_status, 'prospect_ids', v_ids);
+end;
+$$;
+
+grant execute on function public.persist_prospect_batch(uuid, jsonb, integer, boolean) to service_role;
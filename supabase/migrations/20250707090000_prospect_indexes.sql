@@ -0,0 +1,17 @@
+-- One prospect row per URL and run: insert_prospects upserts on this key and
+-- maps URLs to ids without per-URL lookups.
+-- Drop pre-existing duplicates first, keeping the oldest row (analyses and
+-- contacts of the dropped rows cascade).
+delete from prospects p
+ using prospects keep
+ where p.workflow_run_id is not distinct from keep.workflow_run_id
+   and p.url = keep.url
+   and (coalesce(p.created_at, 'epoch'), p.id) > (coalesce(keep.created_at, 'epoch'), keep.id);
+
+alter table prospects
+    add constraint prospects_workflow_run_id_url_key unique (workflow_run_id, url);
+
+-- Foreign keys used by per-prospect joins and cascade deletes
+create index if not exists site_analyses_prospect_id_idx on site_analyses (prospect_id);
+create index if not exists contacts_prospect_id_idx on contacts (prospect_id);
+create index if not exists workflow_runs_audience_id_idx on workflow_runs (audience_id);
@@ -0,0 +1,35 @@
+-- Hot-reload audience configs in running workers.
+-- Workers LISTEN on the "audiences_changed" channel (see
+-- apps/workflow/workflows/website_prospector/config/audience_registry.py)
+-- and reload their cached audiences when a row changes.
+create or replace function public.touch_audiences_updated_at()
+  returns trigger
+  language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists audiences_touch_updated_at on public.audiences;
+create trigger audiences_touch_updated_at
+    before update on public.audiences
+    for each row
+    execute function public.touch_audiences_updated_at();
+
+create or replace function public.notify_audiences_changed()
+  returns trigger
+  language plpgsql
+as $$
+begin
+    perform pg_notify('audiences_changed', coalesce(new.name, old.name));
+    return null;
+end;
+$$;
+
+drop trigger if exists audiences_notify on public.audiences;
+create trigger audiences_notify
+    after insert or update or delete on public.audiences
+    for each row
+    execute function public.notify_audiences_changed();